@@ -0,0 +1,129 @@
+"""
+Benchmark for src/scraper/parsing.py backends on Greenhouse/Lever board pages.
+
+    python benchmarks/bench_html_parsing.py [--runs 20] [--regen]
+
+The fixtures in benchmarks/fixtures are synthetic pages that follow the
+classic Greenhouse (div.opening) and Lever (div.posting) board markup, with
+a few hundred openings plus the usual page chrome (head, nav, scripts,
+footer). --regen rewrites them.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.scraper.generic_scraper import GenericScraper  # noqa: E402
+from src.scraper import parsing  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+OPENINGS = 400
+TEAMS = ["Engineering", "Data", "Design", "Product", "Sales", "Operations", "Security", "Support"]
+TITLES = ["Software Engineer", "Senior Backend Engineer", "Data Scientist", "Product Designer",
+          "Site Reliability Engineer", "Account Executive", "Security Engineer", "Support Specialist"]
+CITIES = ["San Francisco, CA", "New York, NY", "Remote - US", "London, UK", "Bangalore, India", "Berlin, Germany"]
+
+CHROME_HEAD = """<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Jobs at Example</title>
+<link rel="stylesheet" href="/assets/app.css">{styles}<script>window.__DATA__ = {{"board": "example", "flags": [{flags}]}};</script>
+</head><body><nav class="top">{nav}</nav>"""
+CHROME_FOOT = """<footer>{links}<p>Powered by an applicant tracking system</p></footer>
+<script src="/assets/vendor.js"></script><script>{script}</script></body></html>"""
+
+
+def _chrome():
+    styles = "".join(f"<style>.c{i}{{margin:{i}px;padding:{i % 7}px}}</style>" for i in range(40))
+    flags = ", ".join(f'"flag_{i}"' for i in range(200))
+    nav = "".join(f'<a href="/page/{i}">Section {i}</a>' for i in range(30))
+    links = "".join(f'<a href="/legal/{i}">Link {i}</a>' for i in range(40))
+    script = "var x = 0;" * 300
+    return CHROME_HEAD.format(styles=styles, flags=flags, nav=nav), CHROME_FOOT.format(links=links, script=script)
+
+
+def greenhouse_board() -> str:
+    head, foot = _chrome()
+    parts = [head, '<div id="main"><h1>Current openings at Example</h1>']
+    for t, team in enumerate(TEAMS):
+        parts.append(f'<section class="level-0"><h3 id="{t}">{team}</h3>')
+        for i in range(t, OPENINGS, len(TEAMS)):
+            parts.append(
+                f'<div class="opening" department_id="{t}" office_id="{i % 6}" data-office-{i % 6}="true">'
+                f'<a data-mapped="true" href="/example/jobs/{4000000 + i}">{TITLES[i % len(TITLES)]} {i}</a>'
+                f'<span class="location">{CITIES[i % len(CITIES)]}</span></div>'
+            )
+        parts.append("</section>")
+    parts.append("</div>")
+    parts.append(foot)
+    return "\n".join(parts)
+
+
+def lever_board() -> str:
+    head, foot = _chrome()
+    parts = [head, '<div class="content-wrapper posting-page"><div class="postings-wrapper">']
+    for t, team in enumerate(TEAMS):
+        parts.append(f'<div class="postings-group"><div class="large-category-header">{team}</div>')
+        for i in range(t, OPENINGS, len(TEAMS)):
+            uid = f"{i:08x}-aaaa-bbbb-cccc-{i:012x}"
+            parts.append(
+                f'<div class="posting" data-qa-posting-id="{uid}">'
+                f'<div class="posting-apply" data-qa="btn-apply"><a href="https://jobs.lever.co/example/{uid}/apply" class="posting-btn-submit template-btn-submit hex-color">Apply</a></div>'
+                f'<a class="posting-title" href="https://jobs.lever.co/example/{uid}"><h5 data-qa="posting-name">{TITLES[i % len(TITLES)]} {i}</h5>'
+                f'<div class="posting-categories"><span class="sort-by-location posting-category small-category-label location">{CITIES[i % len(CITIES)]}</span>'
+                f'<span class="sort-by-team posting-category small-category-label department">{team}</span>'
+                f'<span class="sort-by-commitment posting-category small-category-label commitment">Full-time</span></div></a></div>'
+            )
+        parts.append("</div>")
+    parts.append("</div></div>")
+    parts.append(foot)
+    return "\n".join(parts)
+
+
+def load_fixture(name: str, build, regen: bool) -> str:
+    path = os.path.join(FIXTURES, name)
+    if regen or not os.path.exists(path):
+        os.makedirs(FIXTURES, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(build())
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _rows(jobs):
+    return [(j.title, j.url, j.location) for j in jobs]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--regen", action="store_true")
+    args = ap.parse_args()
+
+    scraper = GenericScraper()
+    boards = {
+        "greenhouse": (load_fixture("greenhouse_board.html", greenhouse_board, args.regen), scraper._scrape_greenhouse),
+        "lever": (load_fixture("lever_board.html", lever_board, args.regen), scraper._scrape_lever),
+    }
+    backends = parsing.available_backends()
+    print(f"Backends: {', '.join(backends)}")
+
+    for board, (html, parse) in boards.items():
+        baseline = None
+        print(f"\n{board}: {len(html) / 1024:.0f} KB")
+        for backend in backends:
+            os.environ["HTML_PARSER"] = backend
+            rows = _rows(parse(html, OPENINGS))
+            if baseline is None:
+                baseline = rows
+            assert rows == baseline, f"{backend} output differs on {board}"
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                parse(html, OPENINGS)
+            ms = (time.perf_counter() - start) * 1000 / args.runs
+            print(f"  {backend:<12} {ms:8.2f} ms/page  ({len(rows)} jobs)")
+    os.environ.pop("HTML_PARSER", None)
+
+
+if __name__ == "__main__":
+    main()
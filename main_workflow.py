@@ -5,6 +5,7 @@ from src.database.models import Job, Profile, Application
 from src.database.db import get_db, init_db
 from sqlalchemy.orm import Session
 import datetime
+import os
 
 def run_workflow():
     print("Starting AutoApply Workflow...")
@@ -46,5 +47,61 @@ def run_workflow():
     
     print("Workflow Complete.")
 
+def run_scheduler(once: bool = False, tick_seconds: int = 60):
+    """
+    Headless mode: runs every user's due saved searches on a schedule,
+    using the same scrapers and matchers as the dashboard.
+    """
+    from src.tasks.scheduler import SearchScheduler
+    init_db()
+    scheduler = SearchScheduler()
+    if once:
+        print(f"Scheduler pass: {scheduler.run_due()}")
+    else:
+        scheduler.run_forever(tick_seconds)
+
+def run_crawl(watchlist: str = None):
+    """Crawls the ATS watchlist once; changed boards land in the shared catalog."""
+    from src.scraper.generic_scraper import GenericScraper, load_watchlist
+    urls = load_watchlist(watchlist)
+    if not urls:
+        print("Watchlist is empty (set ATS_WATCHLIST or create data/ats_watchlist.txt)")
+        return
+    report = GenericScraper().crawl(urls)
+    jobs = sum(len(j) for j in report["changed"].values())
+    print(f"Crawled {report['boards']} boards in {report['seconds']}s: "
+          f"{len(report['changed'])} changed ({jobs} postings), {len(report['unchanged'])} unchanged, "
+          f"{len(report['failed'])} failed")
+
+def run_parse(folder: str):
+    """Parses every PDF in a folder (resumes or JD attachments) across the extraction pool."""
+    from src.utils.resume_parser import parse_folder
+    count = 0
+    for path, _, parsed in parse_folder(folder):
+        count += 1
+        if parsed.get("error"):
+            print(f"{os.path.basename(path)}: {parsed['error']}")
+        else:
+            print(f"{os.path.basename(path)}: {parsed.get('pages', 0)} pages, "
+                  f"skills: {', '.join(parsed['skills'][:10]) or 'none'}")
+    print(f"Parsed {count} PDFs from {folder}")
+
 if __name__ == "__main__":
-    run_workflow()
+    import argparse
+    parser = argparse.ArgumentParser(description="AutoApply workflow runner")
+    parser.add_argument("--schedule", action="store_true", help="Run saved searches for all users on a schedule")
+    parser.add_argument("--once", action="store_true", help="With --schedule: run a single pass and exit")
+    parser.add_argument("--tick", type=int, default=60, help="Seconds between scheduler passes")
+    parser.add_argument("--crawl", nargs="?", const="", metavar="WATCHLIST",
+                        help="Crawl the Greenhouse/Lever board watchlist once and exit")
+    parser.add_argument("--parse-pdfs", metavar="FOLDER", help="Parse every PDF in a folder and exit")
+    args = parser.parse_args()
+
+    if args.parse_pdfs:
+        run_parse(args.parse_pdfs)
+    elif args.crawl is not None:
+        run_crawl(args.crawl or None)
+    elif args.schedule:
+        run_scheduler(once=args.once, tick_seconds=args.tick)
+    else:
+        run_workflow()
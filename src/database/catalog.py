@@ -0,0 +1,381 @@
+"""
+Shared job catalog (DATA_DIR/catalog.db).
+Postings are public and identical for every user, so scrapers write them
+here once, keyed by canonical URL (the URL the board gave is kept
+alongside and is what served jobs carry), and a fresh enough (source, query,
+location) result set is served from here without touching the network.
+User DBs keep their own rows for scores and application state, but drop
+the description when the catalog already has it.
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import create_engine, String, Text, DateTime, Integer, JSON, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from .models import Job
+from ..utils.dedup import canonicalize_url as canonical_url
+
+DATA_DIR = os.getenv("DATA_DIR", "./data")
+CATALOG_TTL_MINUTES = int(os.getenv("CATALOG_TTL_MINUTES", "30"))
+
+
+class CatalogBase(DeclarativeBase):
+    pass
+
+
+class CatalogJob(CatalogBase):
+    __tablename__ = 'catalog_jobs'
+
+    url: Mapped[str] = mapped_column(String(500), primary_key=True)  # canonical URL
+    title: Mapped[str] = mapped_column(String(200))
+    company: Mapped[str] = mapped_column(String(200))
+    location: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    date_posted: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    source: Mapped[str] = mapped_column(String(50), default='unknown')
+    first_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class CatalogJobLink(CatalogBase):
+    __tablename__ = 'catalog_job_links'
+
+    url: Mapped[str] = mapped_column(String(500), primary_key=True)  # canonical URL
+    link: Mapped[str] = mapped_column(String(500))  # URL as scraped, for the card and the application bot
+
+
+class CatalogQuery(CatalogBase):
+    __tablename__ = 'catalog_queries'
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    query: Mapped[str] = mapped_column(String(200), primary_key=True)     # lower-cased
+    location: Mapped[str] = mapped_column(String(200), primary_key=True)  # lower-cased
+    limit: Mapped[int] = mapped_column(Integer, default=10)
+    urls: Mapped[list] = mapped_column(JSON)  # canonical URLs in scraper order
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ScrapeCursor(CatalogBase):
+    __tablename__ = 'scrape_cursors'
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    query: Mapped[str] = mapped_column(String(200), primary_key=True)
+    location: Mapped[str] = mapped_column(String(200), primary_key=True)
+    seen_urls: Mapped[list] = mapped_column(JSON)  # most recent canonical URLs, newest first
+    last_date_posted: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    max_item_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # for sources with increasing ids (HN)
+    full_scrape_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class HttpCache(CatalogBase):
+    __tablename__ = 'http_cache'
+
+    url: Mapped[str] = mapped_column(String(500), primary_key=True)
+    etag: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    body: Mapped[str] = mapped_column(Text)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class BoardState(CatalogBase):
+    __tablename__ = 'board_states'
+
+    board_url: Mapped[str] = mapped_column(String(500), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64))  # digest of the last parsed API body
+    job_count: Mapped[int] = mapped_column(Integer, default=0)
+    checked_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+_ENGINE = None
+_SESSION = None
+_LOCK = threading.Lock()
+
+
+def get_catalog_session():
+    global _ENGINE, _SESSION
+    with _LOCK:
+        if _SESSION is None:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            _ENGINE = create_engine(
+                f"sqlite:///{os.path.join(DATA_DIR, 'catalog.db')}",
+                connect_args={"check_same_thread": False, "timeout": 30}
+            )
+            CatalogBase.metadata.create_all(bind=_ENGINE)
+            _SESSION = sessionmaker(bind=_ENGINE)
+        return _SESSION()
+
+
+def upsert_jobs(jobs: Iterable[Job]) -> int:
+    """Writes scraped jobs to the catalog. A missing description never overwrites a known one."""
+    now = datetime.utcnow()
+    rows, links = {}, {}
+    for job in jobs:
+        if not job.url:
+            continue
+        url = canonical_url(job.url)
+        links[url] = {"url": url, "link": job.url}
+        rows[url] = {
+            "url": url, "title": job.title, "company": job.company, "location": job.location,
+            "description": job.description or None, "date_posted": job.date_posted,
+            "source": job.source or "unknown", "first_seen": now, "last_seen": now
+        }
+    if not rows:
+        return 0
+
+    stmt = sqlite_insert(CatalogJob)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["url"],
+        set_={
+            "title": stmt.excluded.title,
+            "company": stmt.excluded.company,
+            "location": stmt.excluded.location,
+            "description": func.coalesce(stmt.excluded.description, CatalogJob.description),
+            "date_posted": func.coalesce(stmt.excluded.date_posted, CatalogJob.date_posted),
+            "source": stmt.excluded.source,
+            "last_seen": stmt.excluded.last_seen
+        }
+    )
+    link_stmt = sqlite_insert(CatalogJobLink)
+    link_stmt = link_stmt.on_conflict_do_update(index_elements=["url"], set_={"link": link_stmt.excluded.link})
+    session = get_catalog_session()
+    try:
+        session.execute(stmt, list(rows.values()))
+        session.execute(link_stmt, list(links.values()))
+        session.commit()
+        return len(rows)
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error catalog upsert_jobs: {e}")
+        return 0
+    finally:
+        session.close()
+
+
+def record_query(source: str, query: str, location: str, limit: int, jobs: List[Job]):
+    """Remembers which postings a (source, query, location) scrape returned."""
+    urls = [canonical_url(j.url) for j in jobs if j.url]
+    stmt = sqlite_insert(CatalogQuery).values(
+        source=source, query=(query or "").lower(), location=(location or "").lower(),
+        limit=limit, urls=urls, fetched_at=datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source", "query", "location"],
+        set_={"limit": stmt.excluded.limit, "urls": stmt.excluded.urls, "fetched_at": stmt.excluded.fetched_at}
+    )
+    session = get_catalog_session()
+    try:
+        session.execute(stmt)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error catalog record_query: {e}")
+    finally:
+        session.close()
+
+
+def get_fresh_results(source: str, query: str, location: str, limit: int,
+                      max_age_minutes: int = None) -> Optional[List[Job]]:
+    """
+    Returns the cached result set as new (unsaved) Job objects, or None if
+    there is none, it is older than max_age_minutes, or it was fetched with
+    a smaller limit than requested.
+    """
+    max_age = CATALOG_TTL_MINUTES if max_age_minutes is None else max_age_minutes
+    session = get_catalog_session()
+    try:
+        cached = session.get(CatalogQuery, (source, (query or "").lower(), (location or "").lower()))
+        if not cached or cached.fetched_at < datetime.utcnow() - timedelta(minutes=max_age):
+            return None
+        if cached.limit < limit and len(cached.urls) >= cached.limit:
+            return None
+        return _load_jobs(session, cached.urls[:limit])
+    finally:
+        session.close()
+
+
+def get_last_results(source: str, query: str, location: str) -> List[Job]:
+    """The last recorded result set for this key regardless of age (empty if none)."""
+    session = get_catalog_session()
+    try:
+        cached = session.get(CatalogQuery, (source, (query or "").lower(), (location or "").lower()))
+        return _load_jobs(session, cached.urls) if cached else []
+    finally:
+        session.close()
+
+
+def _load_jobs(session, urls: List[str]) -> List[Job]:
+    # Rows cached before links were kept fall back to the canonical URL
+    found = session.query(CatalogJob, CatalogJobLink.link).outerjoin(
+        CatalogJobLink, CatalogJobLink.url == CatalogJob.url
+    ).filter(CatalogJob.url.in_(urls)).all() if urls else []
+    rows = {r.url: (r, link) for r, link in found}
+    return [
+        Job(title=r.title, company=r.company, location=r.location, description=r.description,
+            url=link or r.url, date_posted=r.date_posted, source=r.source)
+        for r, link in (rows.get(u, (None, None)) for u in urls) if r is not None
+    ]
+
+
+def get_cursor(source: str, query: str, location: str) -> Optional[dict]:
+    """High-water mark of the last scrape for this key, as a plain dict."""
+    session = get_catalog_session()
+    try:
+        c = session.get(ScrapeCursor, (source, (query or "").lower(), (location or "").lower()))
+        if not c:
+            return None
+        return {
+            "seen_urls": list(c.seen_urls or []),
+            "last_date_posted": c.last_date_posted,
+            "max_item_id": c.max_item_id,
+            "full_scrape_at": c.full_scrape_at
+        }
+    finally:
+        session.close()
+
+
+def save_cursor(source: str, query: str, location: str, cursor: dict):
+    session = get_catalog_session()
+    try:
+        key = (source, (query or "").lower(), (location or "").lower())
+        c = session.get(ScrapeCursor, key)
+        if not c:
+            c = ScrapeCursor(source=key[0], query=key[1], location=key[2])
+            session.add(c)
+        c.seen_urls = cursor.get("seen_urls") or []
+        c.last_date_posted = cursor.get("last_date_posted")
+        c.max_item_id = cursor.get("max_item_id")
+        c.full_scrape_at = cursor.get("full_scrape_at") or datetime.utcnow()
+        c.updated_at = datetime.utcnow()
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error catalog save_cursor: {e}")
+    finally:
+        session.close()
+
+
+def get_http_cache(url: str) -> Optional[dict]:
+    """Last 200 response body for url with its ETag/Last-Modified validators."""
+    session = get_catalog_session()
+    try:
+        c = session.get(HttpCache, url)
+        if not c:
+            return None
+        return {"etag": c.etag, "last_modified": c.last_modified, "body": c.body, "fetched_at": c.fetched_at}
+    finally:
+        session.close()
+
+
+def save_http_cache(url: str, etag: Optional[str], last_modified: Optional[str], body: str):
+    stmt = sqlite_insert(HttpCache).values(
+        url=url, etag=etag, last_modified=last_modified, body=body, fetched_at=datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["url"],
+        set_={"etag": stmt.excluded.etag, "last_modified": stmt.excluded.last_modified,
+              "body": stmt.excluded.body, "fetched_at": stmt.excluded.fetched_at}
+    )
+    session = get_catalog_session()
+    try:
+        session.execute(stmt)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error catalog save_http_cache: {e}")
+    finally:
+        session.close()
+
+
+def get_board_fingerprints(board_urls: Iterable[str]) -> Dict[str, str]:
+    """board URL -> fingerprint of its last parsed state, for every known board in one pass."""
+    urls = list(board_urls)
+    session = get_catalog_session()
+    try:
+        out = {}
+        for i in range(0, len(urls), 500):
+            rows = session.query(BoardState.board_url, BoardState.fingerprint).filter(
+                BoardState.board_url.in_(urls[i:i + 500])
+            ).all()
+            out.update(dict(rows))
+        return out
+    finally:
+        session.close()
+
+
+def save_board_state(board_url: str, fingerprint: str, job_count: int):
+    now = datetime.utcnow()
+    stmt = sqlite_insert(BoardState).values(
+        board_url=board_url, fingerprint=fingerprint, job_count=job_count, checked_at=now, changed_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["board_url"],
+        set_={"fingerprint": stmt.excluded.fingerprint, "job_count": stmt.excluded.job_count,
+              "checked_at": stmt.excluded.checked_at, "changed_at": stmt.excluded.changed_at}
+    )
+    session = get_catalog_session()
+    try:
+        session.execute(stmt)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error catalog save_board_state: {e}")
+    finally:
+        session.close()
+
+
+def known_urls(urls: Iterable[str]) -> set:
+    """The subset of urls (as given) whose canonical form is in the catalog with a description."""
+    by_canonical = {canonical_url(u): u for u in urls if u}
+    if not by_canonical:
+        return set()
+    session = get_catalog_session()
+    try:
+        found = set()
+        keys = list(by_canonical)
+        for i in range(0, len(keys), 500):
+            rows = session.query(CatalogJob.url).filter(
+                CatalogJob.url.in_(keys[i:i + 500]), CatalogJob.description.isnot(None)
+            ).all()
+            found.update(by_canonical[r[0]] for r in rows)
+        return found
+    finally:
+        session.close()
+
+
+def get_descriptions(urls: Iterable[str]) -> Dict[str, str]:
+    """Maps each url (as given) to its catalog description, when known."""
+    by_canonical = {}
+    for u in urls:
+        if u:
+            by_canonical.setdefault(canonical_url(u), []).append(u)
+    if not by_canonical:
+        return {}
+    session = get_catalog_session()
+    try:
+        out = {}
+        keys = list(by_canonical)
+        for i in range(0, len(keys), 500):
+            rows = session.query(CatalogJob.url, CatalogJob.description).filter(
+                CatalogJob.url.in_(keys[i:i + 500])
+            ).all()
+            for url, description in rows:
+                for original in by_canonical[url]:
+                    out[original] = description
+        return out
+    finally:
+        session.close()
+
+
+def hydrate(jobs: List[Job]) -> List[Job]:
+    """Fills in descriptions that user DBs store only by reference."""
+    missing = [j for j in jobs if not j.description and j.url]
+    if missing:
+        descriptions = get_descriptions(j.url for j in missing)
+        for job in missing:
+            if descriptions.get(job.url):
+                job.description = descriptions[job.url]
+    return jobs
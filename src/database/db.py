@@ -1,13 +1,27 @@
-from sqlalchemy import create_engine
+from collections import Counter
+from sqlalchemy import create_engine, event, update, func, exists, case
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, scoped_session, joinedload
-from .models import Base, Job, Application, User
+from .models import Base, Job, Application, User, Profile, RescoreState, SavedSearch, JobKeywords, AnalyticsCount, TrendCount
+from . import catalog
+from ..utils.analytics import (
+    keyword_counts, job_aggregates, score_bin, summarize, TERMS_VERSION,
+    job_trends, summarize_trends, week_of, week_range, TREND_WEEKS, RISING_WINDOW, RISING_MIN_COUNT
+)
 from datetime import datetime, timedelta
 import os
+import threading
+import time
 
 # Use persistent volume for data (Fly.io mounts at /data)
 DATA_DIR = os.getenv("DATA_DIR", "./data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+SAVE_RETRIES = 3        # save_jobs attempts after "database is locked"
+SAVE_RETRY_DELAY = 1.0  # seconds, times the attempt number
+REBUILD_BATCH_SIZE = 200  # jobs re-vectorized per committed transaction in rebuild_analytics
+
 # Engine cache to avoid creating new engines on every call
 _ENGINE_CACHE = {}
 
@@ -17,6 +31,26 @@ def get_user_db_path(user_id: int) -> str:
     os.makedirs(user_dir, exist_ok=True)
     return f"sqlite:///{os.path.join(user_dir, 'jobs.db')}"
 
+# user_id -> commits to that user's DB in this process (see data_version)
+_DATA_VERSIONS = {}
+_DATA_VERSIONS_LOCK = threading.Lock()
+
+def _bump_data_version(user_id: int):
+    with _DATA_VERSIONS_LOCK:
+        _DATA_VERSIONS[user_id] = _DATA_VERSIONS.get(user_id, 0) + 1
+
+def data_version(user_id: int):
+    """
+    Token that changes whenever the user's job DB is written, for caching
+    reads: an in-process commit counter, plus the file's mtime so writes
+    from other processes (the scheduler) count too.
+    """
+    try:
+        mtime = os.stat(os.path.join(DATA_DIR, f"user_{user_id}", "jobs.db")).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return (_DATA_VERSIONS.get(user_id, 0), mtime)
+
 def get_user_engine(user_id: int):
     """Get or create cached engine for user's database."""
     if user_id not in _ENGINE_CACHE:
@@ -25,6 +59,7 @@ def get_user_engine(user_id: int):
             user_db_url, 
             connect_args={"check_same_thread": False}
         )
+        event.listen(_ENGINE_CACHE[user_id], "commit", lambda conn, user_id=user_id: _bump_data_version(user_id))
         # Ensure tables exist
         Base.metadata.create_all(bind=_ENGINE_CACHE[user_id])
     return _ENGINE_CACHE[user_id]
@@ -97,12 +132,32 @@ def get_user_by_id(user_id: int):
 def save_jobs(jobs_list, user_id: int):
     """
     Saves a list of jobs to the user's DB, ignoring duplicates based on URL.
+    Descriptions already in the shared catalog are stored by reference only.
+    A batch that hits "database is locked" (another writer, e.g. an analytics
+    rebuild, holding the DB past the busy timeout) is retried, not dropped.
     Returns: Number of new jobs added.
     """
+    jobs_list = list(jobs_list)
+    for attempt in range(SAVE_RETRIES + 1):
+        try:
+            return _save_jobs(jobs_list, user_id)
+        except OperationalError as e:
+            if "locked" in str(e) and attempt < SAVE_RETRIES:
+                print(f"DB busy in save_jobs, retrying ({attempt + 1}/{SAVE_RETRIES})")
+                time.sleep(SAVE_RETRY_DELAY * (attempt + 1))
+                continue
+            print(f"DB Error save_jobs: {e}")
+        except Exception as e:
+            print(f"DB Error save_jobs: {e}")
+        return 0
+
+def _save_jobs(jobs_list, user_id: int) -> int:
     UserSession = get_user_session(user_id)
     session = UserSession()
     count = 0
+    added = []  # (job, keyword terms)
     try:
+        in_catalog = catalog.known_urls(j.url for j in jobs_list)
         for job_data in jobs_list:
             if not job_data.url: 
                 continue
@@ -118,7 +173,7 @@ def save_jobs(jobs_list, user_id: int):
                 title=job_data.title,
                 company=job_data.company,
                 location=job_data.location,
-                description=job_data.description,
+                description=None if job_data.url in in_catalog else job_data.description,
                 url=job_data.url,
                 date_posted=job_data.date_posted,
                 source=job_data.source,
@@ -126,11 +181,22 @@ def save_jobs(jobs_list, user_id: int):
                 keywords_matched=job_data.keywords_matched
             )
             session.add(job)
+            added.append((job, keyword_counts(job_data.description)))
             count += 1
+
+        # Keyword vectors and analytics counters are maintained here, once per job
+        session.flush()
+        deltas, trends = Counter(), Counter()
+        for job, terms in added:
+            session.add(JobKeywords(job_id=job.id, user_id=user_id, terms=terms))
+            deltas.update(job_aggregates(job, terms))
+            trends.update(job_trends(job, terms))
+        _apply_analytics(session, user_id, deltas)
+        _apply_trends(session, user_id, trends)
         session.commit()
-    except Exception as e:
+    except Exception:
         session.rollback()
-        print(f"DB Error save_jobs: {e}")
+        raise
     finally:
         session.close()
     return count
@@ -165,7 +231,69 @@ def get_saved_jobs(user_id: int):
     session = UserSession()
     try:
         # Eager load applications to avoid DetachedInstanceError when accessing job.applications later
-        return session.query(Job).filter_by(user_id=user_id).options(joinedload(Job.applications)).order_by(Job.date_posted.desc()).all()
+        jobs = session.query(Job).filter_by(user_id=user_id).options(joinedload(Job.applications)).order_by(Job.date_posted.desc()).all()
+    finally:
+        session.close()
+    return catalog.hydrate(jobs)
+
+# History tab sort options -> ORDER BY; ties break on id so pages never overlap or skip
+HISTORY_SORTS = {
+    "date_desc": (Job.date_posted.desc(), Job.id.desc()),
+    "date_asc": (Job.date_posted.asc(), Job.id.asc()),
+    "score_desc": (func.coalesce(Job.match_score, 0).desc(), Job.id.desc()),
+    "score_asc": (func.coalesce(Job.match_score, 0).asc(), Job.id.asc()),
+}
+
+def _history_query(session, user_id: int, *columns, locations=None):
+    query = session.query(*columns).filter(Job.user_id == user_id)
+    if locations:
+        query = query.filter(Job.location.in_(locations))
+    return query
+
+def count_saved_jobs(user_id: int, locations=None) -> int:
+    """Number of saved jobs (optionally only those in the given locations), counted in SQL."""
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        return _history_query(session, user_id, func.count(Job.id), locations=locations).scalar() or 0
+    finally:
+        session.close()
+
+def get_job_locations(user_id: int):
+    """Distinct locations of the user's saved jobs, for the History filter."""
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        rows = _history_query(session, user_id, Job.location).filter(Job.location.isnot(None)).distinct().order_by(Job.location)
+        return [r[0] for r in rows if r[0]]
+    finally:
+        session.close()
+
+def get_saved_jobs_page(user_id: int, offset: int = 0, limit: int = 25, sort: str = "date_desc", locations=None):
+    """One page of saved jobs (with applications loaded), sorted and filtered in SQL."""
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        jobs = _history_query(session, user_id, Job, locations=locations).options(
+            joinedload(Job.applications)
+        ).order_by(*HISTORY_SORTS[sort]).offset(offset).limit(limit).all()
+    finally:
+        session.close()
+    return catalog.hydrate(jobs)
+
+def get_saved_job_rows(user_id: int, offset: int = 0, limit: int = 500, sort: str = "date_desc", locations=None):
+    """
+    Like get_saved_jobs_page, but plain (title, company, location, date_posted,
+    source, url, match_score, applied) tuples for the compact table view.
+    """
+    applied = exists().where(Application.job_id == Job.id)
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        return [tuple(r) for r in _history_query(
+            session, user_id, Job.title, Job.company, Job.location, Job.date_posted, Job.source, Job.url,
+            Job.match_score, case((applied, "Yes"), else_="No"), locations=locations
+        ).order_by(*HISTORY_SORTS[sort]).offset(offset).limit(limit)]
     finally:
         session.close()
 
@@ -179,6 +307,7 @@ def clean_old_jobs(user_id: int, days=30):
     count = 0
     try:
         cutoff = datetime.utcnow() - timedelta(days=days)
+        deltas, trends = Counter(), Counter()
         
         # Get old jobs for this user (now using correct DB)
         old_jobs = session.query(Job).filter(Job.user_id == user_id, Job.date_posted < cutoff).all()
@@ -187,9 +316,14 @@ def clean_old_jobs(user_id: int, days=30):
             # Check if this job has an application
             is_applied = session.query(Application).filter_by(job_id=job.id, user_id=user_id).first()
             if not is_applied:
+                aggregates, job_trend = _forget_job(session, job)
+                deltas.subtract(aggregates)
+                trends.subtract(job_trend)
                 session.delete(job)
                 count += 1
-                
+
+        _apply_analytics(session, user_id, deltas)
+        _apply_trends(session, user_id, trends)
         session.commit()
     except Exception as e:
         session.rollback()
@@ -205,7 +339,13 @@ def delete_job(job_id: int, user_id: int):
     try:
         job = session.query(Job).filter_by(id=job_id, user_id=user_id).first()
         if job:
+            deltas, trends = Counter(), Counter()
+            aggregates, job_trend = _forget_job(session, job)
+            deltas.subtract(aggregates)
+            trends.subtract(job_trend)
             session.delete(job)
+            _apply_analytics(session, user_id, deltas)
+            _apply_trends(session, user_id, trends)
             session.commit()
             return True
         return False
@@ -216,6 +356,417 @@ def delete_job(job_id: int, user_id: int):
     finally:
         session.close()
 
+# ===== PROFILE & RE-SCORING (USER-SCOPED) =====
+
+def save_profile(user_id: int, name: str, skills, resume_text=None, resume_path=None, phone=None, email=""):
+    """Creates or updates the user's single Profile row. A resume_text/resume_path of None keeps the stored one."""
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        profile = session.query(Profile).filter_by(user_id=user_id).first()
+        if not profile:
+            profile = Profile(user_id=user_id, name=name, email=email)
+            session.add(profile)
+        profile.name = name
+        profile.skills = skills
+        if resume_text is not None:
+            profile.resume_text = resume_text
+        if resume_path is not None:
+            profile.resume_path = resume_path
+        profile.phone = phone
+        if email:
+            profile.email = email
+        session.commit()
+        return True
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error save_profile: {e}")
+        return False
+    finally:
+        session.close()
+
+def get_profile(user_id: int):
+    """Returns the user's stored Profile, or None if never saved."""
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        return session.query(Profile).filter_by(user_id=user_id).first()
+    finally:
+        session.close()
+
+def get_rescore_hash(user_id: int):
+    """Returns the profile hash the stored match scores were computed with."""
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        state = session.get(RescoreState, user_id)
+        return state.profile_hash if state else None
+    finally:
+        session.close()
+
+def set_rescore_hash(user_id: int, profile_hash: str, jobs_rescored: int = 0):
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        state = session.get(RescoreState, user_id)
+        if not state:
+            state = RescoreState(user_id=user_id)
+            session.add(state)
+        state.profile_hash = profile_hash
+        state.jobs_rescored = jobs_rescored
+        state.rescored_at = datetime.utcnow()
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error set_rescore_hash: {e}")
+    finally:
+        session.close()
+
+def iter_job_batches(user_id: int, batch_size: int = 200):
+    """
+    Yields the user's jobs in id order, batch_size at a time.
+    Uses keyset pagination (id > last_id) so each batch is one indexed query
+    and memory stays bounded regardless of history size.
+    """
+    UserSession = get_user_session(user_id)
+    last_id = 0
+    while True:
+        session = UserSession()
+        try:
+            batch = session.query(Job).filter(
+                Job.user_id == user_id, Job.id > last_id
+            ).order_by(Job.id).limit(batch_size).all()
+        finally:
+            session.close()
+        if not batch:
+            return
+        last_id = batch[-1].id
+        yield catalog.hydrate(batch)
+
+def update_job_scores(user_id: int, rows):
+    """
+    Bulk-updates match data. rows: list of dicts with
+    'id', 'match_score' and 'keywords_matched'.
+    Runs as a single executemany UPDATE keyed by primary key.
+    """
+    if not rows:
+        return 0
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        old_scores = dict(session.query(Job.id, Job.match_score).filter(Job.id.in_([r['id'] for r in rows])).all())
+        session.execute(update(Job), rows)
+        deltas = Counter()
+        for r in rows:
+            _move_score_bin(deltas, old_scores.get(r['id']), r.get('match_score'))
+        _apply_analytics(session, user_id, deltas)
+        session.commit()
+        return len(rows)
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error update_job_scores: {e}")
+        return 0
+    finally:
+        session.close()
+
+def update_job_enrichment(user_id: int, jobs):
+    """
+    Stores re-scored match data for enriched jobs, matched by URL, and
+    returns how many saved rows were updated. The new description lives in
+    the shared catalog, so the row's own copy is cleared and get_saved_jobs
+    hydrates it from there.
+    """
+    rows = [j for j in jobs if j.url]
+    if not rows:
+        return 0
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        updated = 0
+        deltas, trends = Counter(), Counter()
+        for job in rows:
+            stored = session.query(Job.id, Job.match_score, Job.date_posted, Job.created_at).filter(
+                Job.user_id == user_id, Job.url == job.url
+            ).first()
+            if not stored:
+                continue
+            session.query(Job).filter(Job.id == stored.id).update({
+                "description": None,
+                "match_score": job.match_score,
+                "keywords_matched": job.keywords_matched
+            }, synchronize_session=False)
+            updated += 1
+            _move_score_bin(deltas, stored.match_score, job.match_score)
+            # The keyword vector follows the new description
+            kw = session.get(JobKeywords, stored.id)
+            terms = keyword_counts(job.description)
+            old_terms = kw.terms if kw else {}
+            deltas.subtract(Counter({("keyword", w): n for w, n in old_terms.items()}))
+            deltas.update({("keyword", w): n for w, n in terms.items()})
+            week = week_of(stored.date_posted or stored.created_at)
+            trends.subtract(Counter({(week, "keyword", w): 1 for w in old_terms}))
+            trends.update({(week, "keyword", w): 1 for w in terms})
+            if kw:
+                kw.terms = terms
+            else:
+                session.add(JobKeywords(job_id=stored.id, user_id=user_id, terms=terms))
+        _apply_analytics(session, user_id, deltas)
+        _apply_trends(session, user_id, trends)
+        session.commit()
+        return updated
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error update_job_enrichment: {e}")
+        return 0
+    finally:
+        session.close()
+
+def get_existing_urls(user_id: int, urls):
+    """Returns the subset of urls already stored for this user."""
+    urls = [u for u in urls if u]
+    if not urls:
+        return set()
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        rows = session.query(Job.url).filter(Job.user_id == user_id, Job.url.in_(urls)).all()
+        return {r[0] for r in rows}
+    finally:
+        session.close()
+
+# ===== ANALYTICS AGGREGATES (USER-SCOPED) =====
+
+def _forget_job(session, job):
+    """Drops the job's keyword vector; returns its contribution to the counters and to the weekly rollups."""
+    kw = session.get(JobKeywords, job.id)
+    terms = kw.terms if kw else {}
+    if kw:
+        session.delete(kw)
+    return job_aggregates(job, terms), job_trends(job, terms)
+
+def _move_score_bin(deltas: Counter, old_score, new_score):
+    old_bin, new_bin = score_bin(old_score), score_bin(new_score)
+    if old_bin != new_bin:
+        if old_bin:
+            deltas[("score_bin", old_bin)] -= 1
+        if new_bin:
+            deltas[("score_bin", new_bin)] += 1
+
+def _apply_counts(session, model, user_id: int, rows):
+    """Adds each row's count to the model's counter rows in one upsert; drops rows that reach zero."""
+    if not rows:
+        return
+    stmt = sqlite_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[c.name for c in model.__table__.primary_key.columns],
+        set_={"count": model.count + stmt.excluded.count}
+    )
+    session.execute(stmt, rows)
+    if any(r["count"] < 0 for r in rows):
+        session.query(model).filter(model.user_id == user_id, model.count <= 0).delete(synchronize_session=False)
+
+def _apply_analytics(session, user_id: int, deltas: Counter):
+    """Adds (kind, key) -> delta to the user's counters."""
+    _apply_counts(session, AnalyticsCount, user_id, [
+        {"user_id": user_id, "kind": kind, "key": key[:200], "count": n}
+        for (kind, key), n in deltas.items() if n
+    ])
+
+def _apply_trends(session, user_id: int, deltas: Counter):
+    """Adds (week, kind, key) -> delta to the user's weekly rollups."""
+    _apply_counts(session, TrendCount, user_id, [
+        {"user_id": user_id, "week": week, "kind": kind, "key": key[:200], "count": n}
+        for (week, kind, key), n in deltas.items() if n
+    ])
+
+def rebuild_analytics(user_id: int):
+    """
+    Recomputes keyword vectors, counters and weekly rollups from scratch. Runs once for
+    histories saved before the counters existed (or before the current
+    TERMS_VERSION); afterwards they are kept up to date on insert, delete
+    and re-score.
+    Vectors (the tokenizing) are rebuilt in committed batches; the counters
+    are then recomputed from the stored vectors and swapped in with one
+    short transaction, so concurrent writers only ever wait for one batch.
+    """
+    UserSession = get_user_session(user_id)
+    try:
+        last_id = 0
+        while True:
+            session = UserSession()
+            try:
+                ids = [i for (i,) in session.query(Job.id).filter(
+                    Job.user_id == user_id, Job.id > last_id
+                ).order_by(Job.id).limit(REBUILD_BATCH_SIZE)]
+                if not ids:
+                    break
+                last_id = ids[-1]
+                # Deleting first takes the write lock, so jobs deleted meanwhile aren't re-vectorized
+                session.query(JobKeywords).filter(JobKeywords.job_id.in_(ids)).delete(synchronize_session=False)
+                batch = catalog.hydrate(session.query(Job).filter(Job.id.in_(ids)).all())
+                session.add_all(JobKeywords(job_id=job.id, user_id=user_id, terms=keyword_counts(job.description))
+                                for job in batch)
+                session.commit()
+            finally:
+                session.close()
+
+        session = UserSession()
+        try:
+            session.query(AnalyticsCount).filter(AnalyticsCount.user_id == user_id).delete(synchronize_session=False)
+            session.query(TrendCount).filter(TrendCount.user_id == user_id).delete(synchronize_session=False)
+            deltas = Counter({("meta", "built"): TERMS_VERSION})
+            trends = Counter()
+            rows = session.query(Job, JobKeywords.terms).outerjoin(
+                JobKeywords, JobKeywords.job_id == Job.id
+            ).filter(Job.user_id == user_id).yield_per(1000)
+            for job, terms in rows:
+                deltas.update(job_aggregates(job, terms))
+                trends.update(job_trends(job, terms))
+            _apply_analytics(session, user_id, deltas)
+            _apply_trends(session, user_id, trends)
+            session.commit()
+        finally:
+            session.close()
+    except Exception as e:
+        print(f"DB Error rebuild_analytics: {e}")
+
+def _ensure_analytics(user_id: int):
+    """Builds the counters on first use, or when they predate the current TERMS_VERSION."""
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        built = session.get(AnalyticsCount, (user_id, "meta", "built"))
+    finally:
+        session.close()
+    if not built or built.count < TERMS_VERSION:
+        rebuild_analytics(user_id)
+
+def get_analytics(user_id: int, top_keywords: int = 50) -> dict:
+    """
+    Analytics tab data from the precomputed counters: top keywords and
+    companies, source counts and the score histogram (see summarize()).
+    """
+    _ensure_analytics(user_id)
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        def rows(kind, limit=None):
+            q = session.query(AnalyticsCount.key, AnalyticsCount.count).filter(
+                AnalyticsCount.user_id == user_id, AnalyticsCount.kind == kind
+            ).order_by(AnalyticsCount.count.desc())
+            return q.limit(limit).all() if limit else q.all()
+
+        counts = Counter()
+        for kind, limit in (("keyword", top_keywords), ("company", 10), ("source", None), ("score_bin", None), ("meta", None)):
+            counts.update({(kind, key): n for key, n in rows(kind, limit)})
+        return summarize(counts, top_keywords)
+    finally:
+        session.close()
+
+RISING_CANDIDATES = 200  # most frequent recent keywords considered for "rising"
+
+def get_trends(user_id: int, weeks: int = TREND_WEEKS, terms=None, top: int = 5) -> dict:
+    """
+    Weekly trend series from the rollups (see summarize_trends()): job volume,
+    top sources, locations and keywords (or the given terms), and rising
+    keywords. Only the window's buckets for the charted keys are read, so the
+    cost grows with the number of weeks, not with the number of saved jobs.
+    """
+    _ensure_analytics(user_id)
+    window = week_range(weeks)
+    recent_start = window[-min(RISING_WINDOW, len(window))]
+    UserSession = get_user_session(user_id)
+    session = UserSession()
+    try:
+        in_window = (TrendCount.user_id == user_id, TrendCount.week >= window[0], TrendCount.week <= window[-1])
+        total = func.sum(TrendCount.count)
+
+        # Charted keywords: the requested terms or the window's leaders, plus rising candidates
+        keywords = set(terms or [])
+        if not terms:
+            keywords.update(k for (k,) in session.query(TrendCount.key).filter(
+                *in_window, TrendCount.kind == "keyword"
+            ).group_by(TrendCount.key).order_by(total.desc(), TrendCount.key).limit(top))
+        keywords.update(k for (k,) in session.query(TrendCount.key).filter(
+            *in_window, TrendCount.kind == "keyword", TrendCount.week >= recent_start
+        ).group_by(TrendCount.key).having(total >= RISING_MIN_COUNT).order_by(total.desc()).limit(RISING_CANDIDATES))
+
+        rows = session.query(TrendCount.week, TrendCount.kind, TrendCount.key, TrendCount.count).filter(
+            *in_window, TrendCount.kind.in_(["jobs", "source", "location"])
+        ).all()
+        if keywords:
+            rows += session.query(TrendCount.week, TrendCount.kind, TrendCount.key, TrendCount.count).filter(
+                *in_window, TrendCount.kind == "keyword", TrendCount.key.in_(keywords)
+            ).all()
+        counts = Counter({(week, kind, key): n for week, kind, key, n in rows})
+        return summarize_trends(counts, window, top=top, terms=terms)
+    finally:
+        session.close()
+
+# ===== SAVED SEARCHES (MAIN DB) =====
+
+def create_saved_search(user_id: int, name: str, query: str, location: str, sources, limit: int = 10,
+                        interval_minutes: int = 360, use_smart_search=False, use_semantic=False, notify=False):
+    session = SessionLocal()
+    try:
+        search = SavedSearch(
+            user_id=user_id, name=name, query=query, location=location, sources=list(sources),
+            limit=limit, interval_minutes=interval_minutes, use_smart_search=use_smart_search,
+            use_semantic=use_semantic, notify=notify, next_run_at=datetime.utcnow()
+        )
+        session.add(search)
+        session.commit()
+        return search.id
+    finally:
+        session.close()
+
+def get_saved_searches(user_id: int):
+    session = SessionLocal()
+    try:
+        return session.query(SavedSearch).filter_by(user_id=user_id).order_by(SavedSearch.id).all()
+    finally:
+        session.close()
+
+def delete_saved_search(search_id: int, user_id: int):
+    session = SessionLocal()
+    try:
+        deleted = session.query(SavedSearch).filter_by(id=search_id, user_id=user_id).delete()
+        session.commit()
+        return deleted > 0
+    finally:
+        session.close()
+
+def get_due_saved_searches(now=None, limit: int = 5000):
+    """Enabled saved searches whose next_run_at has passed, oldest first."""
+    now = now or datetime.utcnow()
+    session = SessionLocal()
+    try:
+        return session.query(SavedSearch).filter(
+            SavedSearch.enabled == True, SavedSearch.next_run_at <= now
+        ).order_by(SavedSearch.next_run_at).limit(limit).all()
+    finally:
+        session.close()
+
+def mark_saved_searches_run(searches, now=None):
+    """Bulk-updates last_run_at / next_run_at after a scheduler pass."""
+    now = now or datetime.utcnow()
+    rows = [{
+        "id": s.id,
+        "last_run_at": now,
+        "next_run_at": now + timedelta(minutes=s.interval_minutes or 360)
+    } for s in searches]
+    if not rows:
+        return
+    session = SessionLocal()
+    try:
+        session.execute(update(SavedSearch), rows)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"DB Error mark_saved_searches_run: {e}")
+    finally:
+        session.close()
+
 def reset_db():
     """
     Drops all tables and recreates them. DANGEROUS.
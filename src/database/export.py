@@ -0,0 +1,150 @@
+"""
+Job history export.
+Rows are read straight from the user's SQLite DB as plain tuples, chunk by
+chunk, and appended to the output file as they arrive, so no ORM objects
+or whole-history DataFrame are built and memory stays flat however many
+jobs are exported. Parquet needs pyarrow; CSV and JSONL are always available.
+"""
+import csv
+import json
+import os
+import tempfile
+import time
+from typing import Iterable, Iterator, List, Optional
+from sqlalchemy import select, exists, case
+from .models import Job, Application
+from .db import DATA_DIR, get_user_engine
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+CHUNK_SIZE = 1000
+# Guest exports share one temp folder; files older than this are removed by later exports
+GUEST_EXPORT_DIR = os.path.join(tempfile.gettempdir(), "jobpulse_exports")
+GUEST_EXPORT_TTL = 3600
+COLUMNS = ["Title", "Company", "Location", "Date Posted", "Source", "URL", "Match Score", "Applied"]
+
+# format -> (mime type, file extension)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def available_formats() -> List[str]:
+    return [f for f in FORMATS if f != "parquet" or HAS_PYARROW]
+
+
+def iter_job_rows(user_id: int, chunk_size: int = CHUNK_SIZE) -> Iterator[List[tuple]]:
+    """Yields the user's jobs as lists of COLUMNS-ordered tuples, chunk_size at a time, in id order."""
+    applied = exists().where(Application.job_id == Job.id)
+    stmt = select(
+        Job.title, Job.company, Job.location, Job.date_posted, Job.source, Job.url, Job.match_score,
+        case((applied, "Yes"), else_="No")
+    ).where(Job.user_id == user_id).order_by(Job.id)
+    with get_user_engine(user_id).connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+        for chunk in result.partitions():
+            yield [tuple(row) for row in chunk]
+
+
+def session_job_rows(jobs, chunk_size: int = CHUNK_SIZE) -> Iterator[List[tuple]]:
+    """The same rows from in-memory Job objects (guest sessions have no DB)."""
+    rows = [
+        (j.title, j.company, j.location, j.date_posted, j.source, j.url, j.match_score,
+         "Yes" if getattr(j, "applications", None) else "No")
+        for j in jobs
+    ]
+    for i in range(0, len(rows), chunk_size):
+        yield rows[i:i + chunk_size]
+
+
+def _write_csv(chunks: Iterable[List[tuple]], path: str) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def _write_jsonl(chunks: Iterable[List[tuple]], path: str) -> int:
+    encode = json.JSONEncoder(default=str).encode  # one encoder, not one per json.dumps call
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.writelines(encode(dict(zip(COLUMNS, row))) + "\n" for row in chunk)
+            count += len(chunk)
+    return count
+
+
+def _write_parquet(chunks: Iterable[List[tuple]], path: str) -> int:
+    schema = pa.schema([
+        ("Title", pa.string()), ("Company", pa.string()), ("Location", pa.string()),
+        ("Date Posted", pa.timestamp("us")), ("Source", pa.string()), ("URL", pa.string()),
+        ("Match Score", pa.float64()), ("Applied", pa.string()),
+    ])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            # One row group per chunk
+            columns = list(zip(*chunk))
+            writer.write_table(pa.table(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema
+            ))
+            count += len(chunk)
+    return count
+
+
+def _guest_export_path(ext: str) -> str:
+    """A fresh file in GUEST_EXPORT_DIR, pruning exports older than GUEST_EXPORT_TTL."""
+    os.makedirs(GUEST_EXPORT_DIR, exist_ok=True)
+    cutoff = time.time() - GUEST_EXPORT_TTL
+    for entry in os.scandir(GUEST_EXPORT_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass  # removed by a concurrent export
+    fd, path = tempfile.mkstemp(prefix="job_history_", suffix=f".{ext}", dir=GUEST_EXPORT_DIR)
+    os.close(fd)
+    return path
+
+
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def export_jobs(user_id: Optional[int], fmt: str = "csv", jobs=None, path: Optional[str] = None) -> tuple:
+    """
+    Writes the job history to a file and returns (path, rows written).
+    Streams from the user's DB, or from `jobs` when given (guest sessions).
+    The default path is DATA_DIR/user_<id>/exports/job_history.<ext>,
+    overwritten by the next export; guest exports go to GUEST_EXPORT_DIR
+    and are removed after GUEST_EXPORT_TTL seconds.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if path is None:
+        if user_id is None:
+            path = _guest_export_path(FORMATS[fmt][1])
+        else:
+            export_dir = os.path.join(DATA_DIR, f"user_{user_id}", "exports")
+            os.makedirs(export_dir, exist_ok=True)
+            path = os.path.join(export_dir, f"job_history.{FORMATS[fmt][1]}")
+    chunks = session_job_rows(jobs) if jobs is not None else iter_job_rows(user_id)
+    # Write next to the target and swap in, so a failed export never leaves a truncated file
+    tmp_path = path + ".part"
+    try:
+        count = WRITERS[fmt](chunks, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path, count
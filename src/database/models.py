@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Float, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Text, Date, DateTime, ForeignKey, Float, JSON, Boolean, Index
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 class Base(DeclarativeBase):
@@ -43,6 +43,33 @@ class Job(Base):
     user: Mapped["User"] = relationship(back_populates="jobs")
     applications: Mapped[List["Application"]] = relationship(back_populates="job")
 
+class JobKeywords(Base):
+    __tablename__ = 'job_keywords'
+
+    job_id: Mapped[int] = mapped_column(Integer, primary_key=True)  # jobs.id
+    user_id: Mapped[int] = mapped_column(Integer, index=True)
+    terms: Mapped[dict] = mapped_column(JSON)  # keyword -> count in the description, computed at save time
+
+class AnalyticsCount(Base):
+    __tablename__ = 'analytics_counts'
+    __table_args__ = (Index('ix_analytics_counts_rank', 'user_id', 'kind', 'count'),)
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)  # keyword, company, source, score_bin, meta
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+
+class TrendCount(Base):
+    __tablename__ = 'trend_counts'
+    # Primary key serves range scans per kind; this one serves series of chosen keys
+    __table_args__ = (Index('ix_trend_counts_key', 'user_id', 'kind', 'key', 'week'),)
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)  # jobs, keyword, source, location
+    week: Mapped[date] = mapped_column(Date, primary_key=True)  # Monday of the posting week
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+
 class Application(Base):
     __tablename__ = 'applications'
 
@@ -70,3 +97,54 @@ class Profile(Base):
     preferences: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # locations, job types, etc.
     
     user: Mapped["User"] = relationship(back_populates="profiles")
+
+class RescoreState(Base):
+    __tablename__ = 'rescore_state'
+
+    user_id: Mapped[int] = mapped_column(primary_key=True)
+    profile_hash: Mapped[str] = mapped_column(String(64))  # sha256 of skills + resume text + matcher
+    jobs_rescored: Mapped[int] = mapped_column(Integer, default=0)
+    rescored_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class Task(Base):
+    __tablename__ = 'tasks'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, index=True)
+    kind: Mapped[str] = mapped_column(String(50))  # search, apply, cleanup
+    status: Mapped[str] = mapped_column(String(20), default='queued', index=True)  # queued, running, done, failed, interrupted
+    progress: Mapped[float] = mapped_column(Float, default=0.0)  # 0.0 to 1.0
+    message: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    payload: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+class TaskLease(Base):
+    """Which runner process owns an active task, and when that process last checked in."""
+    __tablename__ = 'task_leases'
+
+    task_id: Mapped[int] = mapped_column(Integer, primary_key=True)  # tasks.id
+    runner_id: Mapped[str] = mapped_column(String(100), index=True)  # host:pid:nonce of the owning TaskRunner
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+class SavedSearch(Base):
+    __tablename__ = 'saved_searches'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, index=True)
+    name: Mapped[str] = mapped_column(String(100))
+    query: Mapped[str] = mapped_column(String(200))
+    location: Mapped[str] = mapped_column(String(200), default='Remote')
+    sources: Mapped[dict] = mapped_column(JSON)  # list of source keys, e.g. ['instahyre', 'arbeitnow']
+    limit: Mapped[int] = mapped_column(Integer, default=10)
+    use_smart_search: Mapped[bool] = mapped_column(Boolean, default=False)
+    use_semantic: Mapped[bool] = mapped_column(Boolean, default=False)
+    notify: Mapped[bool] = mapped_column(Boolean, default=False)  # email high matches via EmailService
+    interval_minutes: Mapped[int] = mapped_column(Integer, default=360)
+    enabled: Mapped[bool] = mapped_column(Boolean, default=True)
+    last_run_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
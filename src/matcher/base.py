@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
 from ..database.models import Job, Profile
 
 class BaseMatcher(ABC):
@@ -12,3 +12,11 @@ class BaseMatcher(ABC):
             - details (dict): Metadata about the match (e.g., matched keywords)
         """
         pass
+
+    def match_batch(self, jobs: List[Job], profile: Profile) -> List[Tuple[float, Dict]]:
+        """
+        Scores many jobs against one profile.
+        Default implementation calls match() per job; matchers that can
+        batch work (e.g. embedding models) override this.
+        """
+        return [self.match(job, profile) for job in jobs]
@@ -0,0 +1,35 @@
+"""
+Process-wide matcher instances.
+Loading the semantic model is expensive, so every caller (dashboard,
+background tasks, re-scoring) shares one instance per matcher kind.
+"""
+import importlib
+import threading
+from .base import BaseMatcher
+
+# matcher kind -> "module:Class"; imported on first use (semantic pulls in torch)
+MATCHERS = {
+    "keyword": "simple_matcher:KeywordMatcher",
+    "semantic": "semantic_matcher:SemanticMatcher",
+}
+
+_MATCHERS = {}
+_LOCK = threading.Lock()
+
+
+def _kind(use_semantic: bool) -> str:
+    return "semantic" if use_semantic else "keyword"
+
+
+def get_matcher(use_semantic: bool) -> BaseMatcher:
+    key = _kind(use_semantic)
+    with _LOCK:
+        if key not in _MATCHERS:
+            module, name = MATCHERS[key].split(":")
+            _MATCHERS[key] = getattr(importlib.import_module(f".{module}", __package__), name)()
+        return _MATCHERS[key]
+
+
+def matcher_name(use_semantic: bool) -> str:
+    """Class name of the matcher get_matcher() would return, without loading it."""
+    return MATCHERS[_kind(use_semantic)].split(":")[1]
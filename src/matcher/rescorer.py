@@ -0,0 +1,112 @@
+"""
+Incremental re-scoring of stored jobs when a user's profile changes.
+Stored match_score values are tied to the profile (and matcher) they were
+computed with; this module detects when that changes and refreshes them
+in the background, batch by batch.
+"""
+import hashlib
+import json
+import threading
+from typing import Dict, Optional
+from .base import BaseMatcher
+from ..database.models import Profile
+from ..database.db import get_rescore_hash, set_rescore_hash, iter_job_batches, update_job_scores
+from ..utils.logger import setup_logger
+
+logger = setup_logger("Rescorer")
+
+# user_id -> progress dict for the currently running (or last) re-score
+_PROGRESS: Dict[int, dict] = {}
+_PROGRESS_LOCK = threading.Lock()
+
+
+def profile_fingerprint(profile: Profile, matcher_name: str) -> str:
+    """Hash of everything a match score depends on besides the job itself."""
+    payload = json.dumps({
+        "skills": sorted(s.strip().lower() for s in (profile.skills or [])),
+        "resume": profile.resume_text or "",
+        "matcher": matcher_name
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_profile_stale(user_id: int, profile: Profile, matcher_name: str) -> bool:
+    """
+    True if stored scores were computed for a different profile or matcher.
+    Takes the matcher's class name so callers can check without loading a model.
+    """
+    if not profile.skills and not profile.resume_text:
+        # Nothing to score against yet; keep whatever is stored
+        return False
+    return get_rescore_hash(user_id) != profile_fingerprint(profile, matcher_name)
+
+
+class Rescorer:
+    """Recomputes match_score / keywords_matched for one user's stored jobs."""
+
+    BATCH_SIZE = 200
+
+    def __init__(self, user_id: int, matcher: BaseMatcher):
+        self.user_id = user_id
+        self.matcher = matcher
+
+    def is_stale(self, profile: Profile) -> bool:
+        return is_profile_stale(self.user_id, profile, type(self.matcher).__name__)
+
+    def rescore(self, profile: Profile) -> int:
+        """Re-scores every stored job in batches. Returns number of jobs updated."""
+        profile_hash = profile_fingerprint(profile, type(self.matcher).__name__)
+        total = 0
+        _set_progress(self.user_id, running=True, done=0)
+
+        try:
+            for batch in iter_job_batches(self.user_id, self.BATCH_SIZE):
+                results = self.matcher.match_batch(batch, profile)
+                rows = [{
+                    "id": job.id,
+                    "match_score": score,
+                    "keywords_matched": details.get("matched_keywords")
+                } for job, (score, details) in zip(batch, results)]
+                total += update_job_scores(self.user_id, rows)
+                _set_progress(self.user_id, running=True, done=total)
+
+            set_rescore_hash(self.user_id, profile_hash, total)
+            logger.info(f"Re-scored {total} jobs for user {self.user_id}")
+        except Exception as e:
+            logger.error(f"Re-score failed for user {self.user_id}: {e}")
+            _set_progress(self.user_id, running=False, done=total, error=str(e))
+            return total
+
+        _set_progress(self.user_id, running=False, done=total)
+        return total
+
+
+def start_background_rescore(user_id: int, profile: Profile, matcher: BaseMatcher) -> bool:
+    """
+    Starts a daemon thread re-scoring the user's jobs.
+    Returns False if a re-score is already running for this user.
+    """
+    with _PROGRESS_LOCK:
+        if _PROGRESS.get(user_id, {}).get("running"):
+            return False
+        _PROGRESS[user_id] = {"running": True, "done": 0, "error": None}
+
+    # Detached copy: the thread must not touch the caller's ORM instance
+    snapshot = Profile(skills=list(profile.skills or []), resume_text=profile.resume_text)
+    thread = threading.Thread(
+        target=Rescorer(user_id, matcher).rescore, args=(snapshot,),
+        name=f"rescore-{user_id}", daemon=True
+    )
+    thread.start()
+    return True
+
+
+def get_rescore_progress(user_id: int) -> Optional[dict]:
+    with _PROGRESS_LOCK:
+        progress = _PROGRESS.get(user_id)
+        return dict(progress) if progress else None
+
+
+def _set_progress(user_id: int, running: bool, done: int, error: str = None):
+    with _PROGRESS_LOCK:
+        _PROGRESS[user_id] = {"running": running, "done": done, "error": error}
@@ -1,5 +1,9 @@
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
+from collections import OrderedDict
+import hashlib
+import threading
 from sentence_transformers import SentenceTransformer, util
+import torch
 from .base import BaseMatcher
 from ..database.models import Job, Profile
 
@@ -7,46 +11,170 @@ import os
 import certifi
 
 class SemanticMatcher(BaseMatcher):
-    def __init__(self):
+    MODEL_NAME = 'all-MiniLM-L6-v2'
+    # Tokens shared between neighbouring chunks so a requirement split
+    # across a chunk boundary is still seen whole by one of them.
+    CHUNK_OVERLAP = 32
+    # Upper bound on (batch rows x padded length) per encode call.
+    MAX_TOKENS_PER_BATCH = 8192
+    POOLING_MODES = ("max", "mean")
+    # Job chunk embeddings kept in memory (LRU) so re-scoring after a
+    # profile change only has to embed the new profile.
+    JOB_CACHE_SIZE = 5000
+
+    def __init__(self, pooling: str = "max"):
         super().__init__()
+        if pooling not in self.POOLING_MODES:
+            raise ValueError(f"pooling must be one of {self.POOLING_MODES}, got '{pooling}'")
+        self.pooling = pooling
         self.model = None
+        self._job_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         # SSL Certificate path is handled globally in dashboard.py
         # but we print it here for confirmation
         cert_path = os.environ.get('REQUESTS_CA_BUNDLE', certifi.where())
         print(f"Loading Semantic Model with certs at: {cert_path}")
-        
+
         # Load a efficient, small model suitable for local CPU
-        print(f"Loading Semantic Model (all-MiniLM-L6-v2) with certs at: {cert_path}")
+        print(f"Loading Semantic Model ({self.MODEL_NAME}) with certs at: {cert_path}")
         try:
             # multiple fallback options for model loading could go here
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.model = SentenceTransformer(self.MODEL_NAME)
         except Exception as e:
             print(f"FAILED TO LOAD AI MODEL: {e}")
             # We will handle self.model being None in the match method
             pass
 
     def match(self, job: Job, profile: Profile) -> Tuple[float, Dict]:
+        return self.match_batch([job], profile)[0]
+
+    def match_batch(self, jobs: List[Job], profile: Profile) -> List[Tuple[float, Dict]]:
         if not self.model:
-            return 0.0, {"error": "AI Model not loaded (SSL/Network issue)"}
+            return [(0.0, {"error": "AI Model not loaded (SSL/Network issue)"}) for _ in jobs]
+        if not jobs:
+            return []
 
-        # Prepare texts
         # For profile, we use resume text if available, else concatenated skills
         profile_text = profile.resume_text or " ".join(profile.skills or [])
-        
-        # For job, title is matching weight x2, description x1
-        job_text = f"{job.title}. {job.description or ''}"
-        
-        # Compute embeddings
-        # In production, cache profile embedding!
-        embeddings1 = self.model.encode(profile_text, convert_to_tensor=True)
-        embeddings2 = self.model.encode(job_text, convert_to_tensor=True)
-        
-        # Cosine similarity
-        cosine_scores = util.cos_sim(embeddings1, embeddings2)
-        score_float = float(cosine_scores[0][0]) * 100.0
-        
-        # Heuristic boost for title exact match
-        if any(s.lower() in job.title.lower() for s in (profile.skills or [])):
-            score_float += 10.0
-            
-        return min(round(score_float, 2), 100.0), {"type": "semantic", "raw_score": score_float}
+        profile_embedding = self._encode_profile(profile_text)
+
+        # For job, title is matching weight x2, description x1.
+        # Long descriptions are split into model-sized chunks instead of
+        # being silently truncated at max_seq_length.
+        job_embeddings = self._encode_jobs([f"{job.title}. {job.description or ''}" for job in jobs])
+        chunk_scores = util.cos_sim(profile_embedding, torch.cat(job_embeddings))[0].tolist()
+
+        per_job, offset = [], 0
+        for emb in job_embeddings:
+            per_job.append(chunk_scores[offset:offset + len(emb)])
+            offset += len(emb)
+
+        results = []
+        for job, scores in zip(jobs, per_job):
+            pooled = max(scores) if self.pooling == "max" else sum(scores) / len(scores)
+            score_float = pooled * 100.0
+
+            # Heuristic boost for title exact match
+            if any(s.lower() in job.title.lower() for s in (profile.skills or [])):
+                score_float += 10.0
+
+            results.append((min(round(score_float, 2), 100.0), {
+                "type": "semantic",
+                "raw_score": score_float,
+                "chunks": len(scores),
+                "pooling": self.pooling
+            }))
+        return results
+
+    def _encode_profile(self, text: str):
+        """Embeds the whole profile as the normalized mean of its chunk embeddings."""
+        embeddings = self._encode_bucketed(self._chunk(text))
+        pooled = torch.nn.functional.normalize(embeddings, dim=1).mean(dim=0, keepdim=True)
+        return torch.nn.functional.normalize(pooled, dim=1)
+
+    def _encode_jobs(self, texts: List[str]) -> List:
+        """
+        Returns one (n_chunks x dim) tensor per text, embedding only the
+        texts that are not already in the job cache.
+        """
+        keys = [hashlib.sha1(t.encode("utf-8")).hexdigest() for t in texts]
+        found = {}
+        with self._cache_lock:
+            for key in keys:
+                if key in self._job_cache:
+                    self._job_cache.move_to_end(key)
+                    found[key] = self._job_cache[key]
+
+        chunks, spans = [], {}
+        for key, text in zip(keys, texts):
+            if key in found or key in spans:
+                continue
+            start = len(chunks)
+            chunks.extend(self._chunk(text))
+            spans[key] = (start, len(chunks))
+
+        if chunks:
+            encoded = self._encode_bucketed(chunks)
+            with self._cache_lock:
+                for key, (start, end) in spans.items():
+                    found[key] = encoded[start:end]
+                    self._job_cache[key] = found[key]
+                while len(self._job_cache) > self.JOB_CACHE_SIZE:
+                    self._job_cache.popitem(last=False)
+
+        return [found[key] for key in keys]
+
+    def _chunk(self, text: str) -> List[Tuple[str, int]]:
+        """
+        Splits text into overlapping windows that fit the model's sequence length.
+        Returns a list of (chunk_text, token_count) tuples.
+        """
+        tokenizer = self.model.tokenizer
+        # Leave room for the [CLS]/[SEP] tokens the model adds itself
+        window = max(self.model.max_seq_length - 2, 1)
+        stride = window - min(self.CHUNK_OVERLAP, window // 4)
+
+        encoded = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = encoded["offset_mapping"]
+        if len(offsets) <= window:
+            return [(text, max(len(offsets), 1))]
+
+        chunks = []
+        for start in range(0, len(offsets), stride):
+            span = offsets[start:start + window]
+            # Slice the original string so no decode round-trip mangles it
+            chunks.append((text[span[0][0]:span[-1][1]], len(span)))
+            if start + window >= len(offsets):
+                break
+        return chunks
+
+    def _encode_bucketed(self, chunks: List[Tuple[str, int]]):
+        """
+        Encodes chunks in length-sorted buckets so each batch is only padded
+        to the longest chunk in that bucket, not the longest in the corpus.
+        Returns a tensor with rows in the original chunk order.
+        """
+        order = sorted(range(len(chunks)), key=lambda i: chunks[i][1])
+        rows = [None] * len(chunks)
+
+        bucket = []
+        for i in order:
+            # Sorted ascending, so the candidate is the bucket's longest member
+            if bucket and (len(bucket) + 1) * chunks[i][1] > self.MAX_TOKENS_PER_BATCH:
+                self._encode_bucket(chunks, bucket, rows)
+                bucket = []
+            bucket.append(i)
+        if bucket:
+            self._encode_bucket(chunks, bucket, rows)
+
+        return torch.stack(rows)
+
+    def _encode_bucket(self, chunks, bucket, rows):
+        embeddings = self.model.encode(
+            [chunks[i][0] for i in bucket],
+            batch_size=len(bucket),
+            convert_to_tensor=True,
+            show_progress_bar=False
+        )
+        for i, emb in zip(bucket, embeddings):
+            rows[i] = emb
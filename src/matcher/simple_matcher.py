@@ -1,13 +1,19 @@
 from typing import Tuple, Dict, Set
 from .base import BaseMatcher
 from ..database.models import Job, Profile
+from ..utils.skills import get_taxonomy
+
+def _mentions(skill: str, found_skills, text: str) -> bool:
+    canonical = get_taxonomy().canonical(skill)
+    return canonical in found_skills if canonical else skill.lower() in text
 
 class KeywordMatcher(BaseMatcher):
     def match(self, job: Job, profile: Profile) -> Tuple[float, Dict]:
         if not profile.skills or not isinstance(profile.skills, list):
             return 0.0, {"error": "No skills in profile"}
 
-        text_to_search = (job.title + " " + (job.description or "")).lower()
+        job_text = job.title + " " + (job.description or "")
+        text_to_search = job_text.lower()
         
         matched_skills = []
         total_skills = len(profile.skills)
@@ -15,15 +21,20 @@ class KeywordMatcher(BaseMatcher):
         if total_skills == 0:
             return 0.0, {}
 
+        # Skills in the taxonomy match by canonical name or alias ("k8s" for Kubernetes)
+        # on word boundaries (ambiguous ones like "Go" need their case and context, so the
+        # original text is scanned); anything else falls back to a substring check
+        job_skills = get_taxonomy().count(job_text)
         for skill in profile.skills:
-            if skill.lower() in text_to_search:
+            if _mentions(skill, job_skills, text_to_search):
                 matched_skills.append(skill)
         
         # Simple score: percentage of profile skills found in job
         score = (len(matched_skills) / total_skills) * 100.0
         
         # Boost score if title matches a skill (heuristic)
-        title_skills = [s for s in matched_skills if s.lower() in job.title.lower()]
+        title_found = get_taxonomy().count(job.title)
+        title_skills = [s for s in matched_skills if _mentions(s, title_found, job.title.lower())]
         if title_skills:
             score = min(100.0, score * 1.2)
 
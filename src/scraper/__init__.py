@@ -1,5 +1,42 @@
-from .base import BaseScraper
-from .hn_scraper import HNScraper
-from .linkedin_scraper import LinkedInScraper
-from .naukri_scraper import NaukriScraper
-from .instahyre_scraper import InstahyreScraper
+"""
+Scraper registry. Implementations are imported on first use, not when the
+package is, since several of them pull in Selenium; importing src.scraper
+or a light submodule (parsing, governor) stays cheap.
+"""
+import importlib
+
+# source key -> (display name, "module:Class")
+SCRAPERS = {
+    "mock": ("Mock Data", "mock_scraper:MockScraper"),
+    "instahyre": ("Instahyre", "instahyre_scraper:InstahyreScraper"),
+    "arbeitnow": ("Arbeitnow", "arbeitnow_scraper:ArbeitnowScraper"),
+    "naukri": ("Naukri", "naukri_scraper:NaukriScraper"),
+    "linkedin": ("LinkedIn", "linkedin_scraper:LinkedInScraper"),
+    "hn": ("Hacker News", "hn_scraper:HNScraper"),
+    "ats": ("Company Boards", "generic_scraper:WatchlistScraper"),
+}
+
+# Names `from src.scraper import X` still resolves, loaded lazily
+_EXPORTS = {
+    "BaseScraper": "base:BaseScraper",
+    "HNScraper": "hn_scraper:HNScraper",
+    "LinkedInScraper": "linkedin_scraper:LinkedInScraper",
+    "NaukriScraper": "naukri_scraper:NaukriScraper",
+    "InstahyreScraper": "instahyre_scraper:InstahyreScraper",
+}
+
+
+def load_scraper(path: str):
+    """Imports and returns the class at "module:Class" (module relative to this package)."""
+    module, name = path.split(":")
+    return getattr(importlib.import_module(f".{module}", __name__), name)
+
+
+def get_scraper_class(source: str):
+    return load_scraper(SCRAPERS[source][1])
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return load_scraper(_EXPORTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
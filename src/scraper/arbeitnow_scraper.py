@@ -1,7 +1,8 @@
-import requests
-from typing import List, Optional
+from itertools import islice
+from typing import Iterator, List, Optional
 from datetime import datetime
 from .base import BaseScraper
+from .governor import HostBackingOff
 from ..database.models import Job
 from ..utils.logger import setup_logger
 
@@ -22,61 +23,71 @@ class ArbeitnowScraper(BaseScraper):
         Note: The API doesn't support server-side filtering by query/location well, 
         so we fetch the latest batch and filter client-side.
         """
+        return list(islice(self.iter_jobs(query, location), limit))
+
+    def iter_jobs(self, query: str = "", location: str = "", page_size: int = None) -> Iterator[Job]:
+        """Follows the API's page links, filtering each page client-side."""
         self.logger.info(f"Fetching from Arbeitnow API...")
-        jobs = []
+        found = 0
+        url = self.API_URL
         try:
-            response = requests.get(self.API_URL, timeout=10)
-            if response.status_code == 200:
+            for _ in range(self.MAX_PAGES):
+                response = self.fetch(url, timeout=10)
+                if response.status_code != 200:
+                    self.logger.error(f"Arbeitnow API failed: {response.status_code}")
+                    break
                 data = response.json()
                 raw_jobs = data.get("data", [])
                 self.logger.info(f"Arbeitnow returned {len(raw_jobs)} raw jobs. Filtering for '{query}'...")
-                
+
                 for item in raw_jobs:
-                    try:
-                        title = item.get("title", "")
-                        company = item.get("company_name", "")
-                        desc = item.get("description", "") # HTML content
-                        tags = item.get("tags", [])
-                        is_remote = item.get("remote", False)
-                        location_api = item.get("location", "Unknown")
-                        url = item.get("url", "")
-                        
-                        # Basic Client-Side Filter
-                        # If query is provided, check title/tags
-                        text_corpus = (title + " " + " ".join(tags)).lower()
-                        if query and query.lower() not in text_corpus:
-                            continue
-                            
-                        # If location is provided (and not just "Remote"), try to filter
-                        # Arbeitnow is mostly remote, so we'll be lenient with location
-                        if location and location.lower() not in location_api.lower() and not is_remote:
-                             # If user asked for specific city and job is NOT remote and NOT in that city
-                             pass 
+                    job = self._parse_item(item, query, location)
+                    if job:
+                        found += 1
+                        yield job
 
-                        job = Job(
-                            title=title,
-                            company=company,
-                            location=f"{location_api} {'(Remote)' if is_remote else ''}",
-                            description=f"Tags: {', '.join(tags)}", # Keep description short for card view
-                            url=url,
-                            source="arbeitnow",
-                            date_posted=datetime.utcnow() # API doesn't provide easy date, assume fresh
-                        )
-                        jobs.append(job)
-                        
-                        if len(jobs) >= limit:
-                            break
-                    except Exception as e:
-                        continue
-                        
-                self.logger.info(f"Arbeitnow found {len(jobs)} matches.")
-            else:
-                self.logger.error(f"Arbeitnow API failed: {response.status_code}")
-                
+                url = (data.get("links") or {}).get("next")
+                if not raw_jobs or not url:
+                    break
+            self.logger.info(f"Arbeitnow found {found} matches.")
+        except HostBackingOff:
+            raise
         except Exception as e:
             self.logger.error(f"Arbeitnow Connection Error: {e}")
-            
-        return jobs
+
+    def _parse_item(self, item: dict, query: str, location: str) -> Optional[Job]:
+        try:
+            title = item.get("title", "")
+            company = item.get("company_name", "")
+            desc = item.get("description", "") # HTML content
+            tags = item.get("tags", [])
+            is_remote = item.get("remote", False)
+            location_api = item.get("location", "Unknown")
+            url = item.get("url", "")
+
+            # Basic Client-Side Filter
+            # If query is provided, check title/tags
+            text_corpus = (title + " " + " ".join(tags)).lower()
+            if query and query.lower() not in text_corpus:
+                return None
+
+            # If location is provided (and not just "Remote"), try to filter
+            # Arbeitnow is mostly remote, so we'll be lenient with location
+            if location and location.lower() not in location_api.lower() and not is_remote:
+                 # If user asked for specific city and job is NOT remote and NOT in that city
+                 pass 
+
+            return Job(
+                title=title,
+                company=company,
+                location=f"{location_api} {'(Remote)' if is_remote else ''}",
+                description=f"Tags: {', '.join(tags)}", # Keep description short for card view
+                url=url,
+                source="arbeitnow",
+                date_posted=datetime.utcnow() # API doesn't provide easy date, assume fresh
+            )
+        except Exception as e:
+            return None
 
     def parse_job_page(self, url: str) -> Optional[Job]:
         pass
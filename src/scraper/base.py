@@ -1,8 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import requests
+from .governor import get_governor
+from ..database import catalog
 from ..database.models import Job
+from ..utils.dedup import canonicalize_url as canonical_url
 
 class BaseScraper(ABC):
+    REQUEST_TIMEOUT = 15
+    CURSOR_SEEN_LIMIT = 500  # URLs remembered per (source, query, location)
+    FULL_REFRESH_HOURS = 24  # incremental runs fall back to a full scrape this often
+    PAGE_SIZE = 25  # default page size for sources without their own paging
+    MAX_PAGES = 20  # hard stop for paginated sources
+    BATCH_SIZE = 25  # jobs handed to on_batch callbacks at a time
+    SEEN_STREAK_STOP = 5  # consecutive already-seen postings that end an incremental scrape
+    max_wait = None  # seconds a request may wait on the governor; None waits out any backoff
+
     def __init__(self, base_url: str):
         self.base_url = base_url
         self.session = None  # Setup requests session here
@@ -21,3 +35,149 @@ class BaseScraper(ABC):
         Parse a single job page for more details if needed.
         """
         pass
+
+    def iter_jobs(self, query: str, location: str, page_size: int = None) -> Iterator[Job]:
+        """
+        Lazily yields postings, fetching one page (or scroll step) at a time,
+        so callers can stop whenever they have enough and memory stays at one
+        page. The default is a single scrape() of page_size jobs; paginated
+        sources override this and implement scrape() as islice(iter_jobs(), limit).
+        """
+        yield from self.scrape(query=query, location=location, limit=page_size or self.PAGE_SIZE)
+
+    def cached_scrape(self, query: str, location: str, limit: int = 10, max_age_minutes: int = None,
+                      incremental: bool = True, on_batch: Callable[[List[Job]], bool] = None) -> List[Job]:
+        """
+        scrape() through the shared catalog: a fresh enough result set for
+        this (scraper, query, location) is served without network access,
+        otherwise the scrape result is written to the catalog for everyone.
+        With incremental=True and a recent cursor, only postings newer than
+        the cursor are fetched and merged in front of the last result set.
+        on_batch(jobs) is called as each batch becomes available; returning
+        True stops fetching further pages.
+        """
+        def emit(batch):
+            return bool(on_batch(batch)) if on_batch and batch else False
+
+        source = type(self).__name__
+        cached = catalog.get_fresh_results(source, query, location, limit, max_age_minutes)
+        if cached is not None:
+            emit(cached)
+            return cached
+
+        cursor = catalog.get_cursor(source, query, location) if incremental else None
+        full_refresh_due = datetime.utcnow() - timedelta(hours=self.FULL_REFRESH_HOURS)
+        if cursor and cursor["full_scrape_at"] > full_refresh_due:
+            new_jobs, cursor = self.scrape_new(query, location, limit, cursor, emit)
+            new_urls = {canonical_url(j.url) for j in new_jobs}
+            previous = [j for j in catalog.get_last_results(source, query, location)
+                        if canonical_url(j.url) not in new_urls]
+            previous = previous[:max(limit - len(new_jobs), 0)]
+            emit(previous)
+            jobs = new_jobs + previous
+        else:
+            new_jobs, cursor = self.scrape_new(query, location, limit, {}, emit)
+            cursor["full_scrape_at"] = datetime.utcnow()
+            jobs = new_jobs
+
+        catalog.upsert_jobs(new_jobs)
+        catalog.record_query(source, query, location, limit, jobs)
+        catalog.save_cursor(source, query, location, cursor)
+        return jobs
+
+    def scrape_new(self, query: str, location: str, limit: int, cursor: dict,
+                   on_batch: Callable[[List[Job]], bool] = None) -> Tuple[List[Job], dict]:
+        """
+        Incremental scrape: returns postings the cursor hasn't seen and the
+        advanced cursor. Pages through iter_jobs() and stops once it runs into
+        SEEN_STREAK_STOP already-seen postings in a row.
+        """
+        seen = set(cursor.get("seen_urls") or [])
+
+        def unseen():
+            streak = 0
+            for job in self.iter_jobs(query, location, page_size=limit):
+                if canonical_url(job.url) in seen:
+                    streak += 1
+                    if seen and streak >= self.SEEN_STREAK_STOP:
+                        return
+                    continue
+                streak = 0
+                yield job
+
+        jobs = self.collect(unseen(), limit, on_batch)
+        return jobs, self.advance_cursor(cursor, jobs)
+
+    def collect(self, jobs: Iterable[Job], limit: int, on_batch: Callable[[List[Job]], bool] = None) -> List[Job]:
+        """Drains up to limit jobs, handing them to on_batch every BATCH_SIZE."""
+        collected, batch = [], []
+        for job in jobs:
+            collected.append(job)
+            batch.append(job)
+            if len(collected) >= limit:
+                break
+            if len(batch) >= self.BATCH_SIZE:
+                stop = on_batch(batch) if on_batch else False
+                batch = []
+                if stop:
+                    return collected
+        if batch and on_batch:
+            on_batch(batch)
+        return collected
+
+    def advance_cursor(self, cursor: dict, new_jobs: List[Job]) -> dict:
+        """Records new_jobs as seen (newest first, capped) and moves last_date_posted forward."""
+        cursor = dict(cursor or {})
+        urls = [canonical_url(j.url) for j in new_jobs if j.url]
+        fresh = set(urls)
+        cursor["seen_urls"] = (urls + [u for u in cursor.get("seen_urls") or [] if u not in fresh])[:self.CURSOR_SEEN_LIMIT]
+        dates = [j.date_posted for j in new_jobs if j.date_posted]
+        if cursor.get("last_date_posted"):
+            dates.append(cursor["last_date_posted"])
+        cursor["last_date_posted"] = max(dates) if dates else None
+        return cursor
+
+    def fetch(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET through the outbound governor (per-host rate, concurrency and
+        backoff). All HTTP scrapers should use this instead of requests.get.
+        Raises HostBackingOff if the host can't be reached within max_wait.
+        """
+        kwargs.setdefault("timeout", self.REQUEST_TIMEOUT)
+        governor = get_governor()
+        with governor.slot(url, self.max_wait):
+            resp = (self.session or requests).get(url, **kwargs)
+        body = resp.text if "html" in resp.headers.get("Content-Type", "") else ""
+        governor.report(url, resp.status_code, body, resp.headers.get("Retry-After"))
+        return resp
+
+    def fetch_cached(self, url: str, **kwargs) -> Optional[Tuple[str, bool]]:
+        """
+        Conditional GET against the catalog's HTTP cache: sends the stored
+        ETag/Last-Modified and returns (body, changed), where a 304 yields
+        the cached body with changed=False. None if the request failed.
+        """
+        cached = catalog.get_http_cache(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+        resp = self.fetch(url, headers=headers, **kwargs)
+        if resp.status_code == 304 and cached:
+            return cached["body"], False
+        if resp.status_code != 200:
+            return None
+        catalog.save_http_cache(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), resp.text)
+        return resp.text, True
+
+    def navigate(self, driver, url: str):
+        """driver.get through the outbound governor, for Selenium scrapers."""
+        governor = get_governor()
+        with governor.slot(url, self.max_wait):
+            driver.get(url)
+        try:
+            body = driver.page_source
+        except Exception:
+            body = ""
+        governor.report(url, None, body)
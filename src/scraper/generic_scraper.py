@@ -1,20 +1,90 @@
-from typing import List, Optional
-import requests
+from typing import Callable, List, Optional, Tuple
+import hashlib
+import html as html_lib
+import json
+import os
 import re
-from datetime import datetime
-from bs4 import BeautifulSoup
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qs
 from .base import BaseScraper
+from .parsing import select_regions, parse_html
+from ..database import catalog
 from ..database.models import Job
+from ..utils.dedup import canonicalize_url as canonical_url
 from ..utils.logger import setup_logger
 
+GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards/{token}"
+LEVER_API = "https://{host}/v0/postings/{token}?mode=json"
+LEVER_POSTING = "https://{host}/v0/postings/{token}/{posting_id}"
+GREENHOUSE_JOB_ID = re.compile(r"/jobs/(\d+)|[?&]gh_jid=(\d+)")
+BOARD_TOKEN = re.compile(r"^[\w.-]+$")
+BOARD_SOURCE = "ats_board"  # catalog query key for a board's last parsed postings
+CRAWL_WORKERS = 32
+
+
+def board_of(url: str) -> Optional[Tuple[str, str]]:
+    """
+    ("greenhouse" | "lever", board token) for an ATS board or job URL, e.g.
+    boards.greenhouse.io/airbnb, job-boards.greenhouse.io/airbnb/jobs/123,
+    boards.greenhouse.io/embed/job_board?for=airbnb, jobs.lever.co/netflix.
+    """
+    parts = urlsplit(url or "")
+    host = (parts.hostname or "").lower()
+    segments = [s for s in parts.path.split("/") if s]
+    if host.endswith("greenhouse.io"):
+        token = parse_qs(parts.query).get("for", [None])[0] if segments[:1] == ["embed"] else (segments or [None])[0]
+        platform = "greenhouse"
+    elif host.endswith("lever.co"):
+        token = (segments or [None])[0]
+        platform = "lever"
+    else:
+        return None
+    return (platform, token) if token and BOARD_TOKEN.match(token) else None
+
+
+def load_watchlist(path: str = None) -> List[str]:
+    """
+    Board URLs to crawl, one per line (blank lines and # comments ignored),
+    from ATS_WATCHLIST or DATA_DIR/ats_watchlist.txt.
+    """
+    path = path or os.getenv("ATS_WATCHLIST") or os.path.join(os.getenv("DATA_DIR", "./data"), "ats_watchlist.txt")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+
+def _company_from_token(token: str) -> str:
+    return token.replace("-", " ").replace("_", " ").title()
+
+
+def _html_text(markup: str) -> str:
+    return parse_html(markup).text() if markup else ""
+
+
+def _utc(value: str) -> Optional[datetime]:
+    try:
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
 class GenericScraper(BaseScraper):
     """
     A generic scraper that targets common ATS platforms like Greenhouse and Lever.
     User provides a COMPANY url like "https://boards.greenhouse.io/airbnb".
+    Boards are read from the platforms' public JSON APIs (conditional GETs,
+    so an unchanged board costs a 304); the HTML page is the fallback.
     """
     def __init__(self):
         super().__init__("generic")
         self.logger = setup_logger("GenericScraper")
+        self._companies = {}  # greenhouse board token -> company name
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
@@ -22,87 +92,261 @@ class GenericScraper(BaseScraper):
     def scrape(self, query: str = "", location: str = "", limit: int = 10) -> List[Job]:
         # query is treated as the URL in this scraper mode for simplicity
         # User enters "https://boards.greenhouse.io/..." in the query box
-        
+
         target_url = query
         if not target_url.startswith("http"):
             # Not a URL, return empty
             return []
 
+        board = board_of(target_url)
+        if board:
+            result = self._api_jobs(*board)
+            if result is not None:
+                return result[0][:limit]
+
+        return self._scrape_html(target_url, limit)
+
+    def scrape_new(self, query: str, location: str, limit: int, cursor: dict,
+                   on_batch: Callable[[List[Job]], bool] = None) -> Tuple[List[Job], dict]:
+        """
+        Board APIs return the whole board in one response, so the increment
+        is computed locally: postings not seen before, or updated since the
+        cursor's last_date_posted (which tracks Greenhouse's updated_at).
+        A 304 on a known board means nothing changed.
+        """
+        board = board_of(query) if query.startswith("http") else None
+        result = self._api_jobs(*board) if board else None
+        if result is None:
+            return super().scrape_new(query, location, limit, cursor, on_batch)
+
+        jobs, changed = result
+        if cursor and not changed:
+            return [], cursor
+        seen = set(cursor.get("seen_urls") or [])
+        since = cursor.get("last_date_posted")
+        fresh = [
+            j for j in jobs
+            if canonical_url(j.url) not in seen or (since and j.date_posted and j.date_posted > since)
+        ]
+        fresh = self.collect(fresh, limit, on_batch)
+        return fresh, self.advance_cursor(cursor, fresh)
+
+    def _api_jobs(self, platform: str, token: str) -> Optional[Tuple[List[Job], bool]]:
+        """(jobs newest first, changed) from the board's JSON API, or None to fall back to HTML."""
+        try:
+            fetched = self._fetch_board(platform, token)
+            if fetched is None:
+                return None
+            return self._parse_board(platform, token, fetched[0]), fetched[1]
+        except Exception as e:
+            self.logger.warning(f"{platform} API failed for {token}, falling back to HTML: {e}")
+            return None
+
+    def _fetch_board(self, platform: str, token: str) -> Optional[Tuple[str, bool]]:
+        """Conditional GET of the board's JSON: (body, changed), or None if unavailable."""
+        if platform == "greenhouse":
+            return self.fetch_cached(GREENHOUSE_API.format(token=token) + "/jobs?content=true", headers=self.headers)
+        # EU-hosted boards (jobs.eu.lever.co) are served from api.eu.lever.co
+        for host in ("api.lever.co", "api.eu.lever.co"):
+            result = self.fetch_cached(LEVER_API.format(host=host, token=token), headers=self.headers)
+            if result is not None:
+                return result
+        return None
+
+    def _parse_board(self, platform: str, token: str, body: str) -> List[Job]:
+        if platform == "greenhouse":
+            return self._parse_greenhouse(token, body)
+        return self._parse_lever(token, body)
+
+    def _parse_greenhouse(self, token: str, body: str) -> List[Job]:
+        postings = json.loads(body).get("jobs", [])
+
+        company = None
+        jobs = []
+        for p in postings:
+            if not p.get("absolute_url"):
+                continue
+            if not p.get("company_name") and company is None:
+                company = self._greenhouse_company(token)
+            jobs.append(self._greenhouse_job(p, company))
+        jobs.sort(key=lambda j: j.date_posted, reverse=True)
+        return jobs
+
+    def _greenhouse_job(self, p: dict, company: str) -> Job:
+        return Job(
+            title=(p.get("title") or "").strip(),
+            company=p.get("company_name") or company,
+            location=((p.get("location") or {}).get("name") or "Unknown").strip(),
+            description=_html_text(html_lib.unescape(p.get("content") or "")),
+            url=p["absolute_url"],
+            source="greenhouse",
+            date_posted=_utc(p.get("updated_at")) or datetime.utcnow()
+        )
+
+    def _greenhouse_company(self, token: str) -> str:
+        if token not in self._companies:
+            name = None
+            try:
+                result = self.fetch_cached(GREENHOUSE_API.format(token=token), headers=self.headers)
+                if result:
+                    name = json.loads(result[0]).get("name")
+            except Exception:
+                pass
+            self._companies[token] = name or _company_from_token(token)
+        return self._companies[token]
+
+    def _parse_lever(self, token: str, body: str) -> List[Job]:
+        postings = json.loads(body)
+        if not isinstance(postings, list):
+            raise ValueError("unexpected Lever response")
+
+        company = _company_from_token(token)  # Lever's API doesn't expose the company name
+        jobs = [self._lever_job(p, company) for p in postings if p.get("hostedUrl")]
+        jobs.sort(key=lambda j: j.date_posted, reverse=True)
+        return jobs
+
+    def _lever_job(self, p: dict, company: str) -> Job:
+        categories = p.get("categories") or {}
+        sections = [p.get("descriptionPlain") or ""]
+        sections += [f"{l.get('text', '')}\n{_html_text(l.get('content'))}" for l in p.get("lists") or []]
+        sections.append(p.get("additionalPlain") or "")
+        created = p.get("createdAt")
+        return Job(
+            title=(p.get("text") or "").strip(),
+            company=company,
+            location=categories.get("location") or ", ".join(categories.get("allLocations") or []) or "Unknown",
+            description="\n\n".join(s.strip() for s in sections if s and s.strip()),
+            url=p["hostedUrl"],
+            source="lever",
+            date_posted=datetime.utcfromtimestamp(created / 1000) if created else datetime.utcnow()
+        )
+
+    def crawl(self, board_urls: List[str], max_workers: int = CRAWL_WORKERS) -> dict:
+        """
+        Bulk crawl of many boards. Boards are fetched concurrently (per-host
+        politeness comes from the outbound governor) with conditional
+        requests; a board whose response is a 304 or hashes to its stored
+        fingerprint is skipped without parsing. Changed boards are parsed,
+        written to the catalog and returned under "changed".
+        """
+        start = time.perf_counter()
+        urls = list(dict.fromkeys(u.strip() for u in board_urls if u and u.strip()))
+        fingerprints = catalog.get_board_fingerprints(urls)
+        report = {"boards": len(urls), "changed": {}, "unchanged": [], "failed": []}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls) or 1)), thread_name_prefix="crawl") as pool:
+            for url, status, jobs in pool.map(lambda u: self._crawl_board(u, fingerprints.get(u)), urls):
+                if status == "changed":
+                    report["changed"][url] = jobs
+                else:
+                    report[status].append(url)
+        report["seconds"] = round(time.perf_counter() - start, 2)
+        self.logger.info(
+            f"Crawled {len(urls)} boards in {report['seconds']}s: {len(report['changed'])} changed, "
+            f"{len(report['unchanged'])} unchanged, {len(report['failed'])} failed"
+        )
+        return report
+
+    def _crawl_board(self, url: str, fingerprint: Optional[str]) -> Tuple[str, str, List[Job]]:
+        board = board_of(url)
+        if not board:
+            return url, "failed", []
+        try:
+            fetched = self._fetch_board(*board)
+            if fetched is None:
+                return url, "failed", []
+            body, changed = fetched
+            if fingerprint and not changed:
+                return url, "unchanged", []
+            digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+            if digest == fingerprint:
+                return url, "unchanged", []
+            jobs = self._parse_board(board[0], board[1], body)
+            catalog.upsert_jobs(jobs)
+            catalog.record_query(BOARD_SOURCE, url, "", len(jobs), jobs)
+            catalog.save_board_state(url, digest, len(jobs))
+            return url, "changed", jobs
+        except Exception as e:
+            self.logger.warning(f"Crawl failed for {url}: {e}")
+            return url, "failed", []
+
+    def _scrape_html(self, target_url: str, limit: int) -> List[Job]:
         self.logger.info(f"Generic scraping URL: {target_url}")
-        
+
         try:
-            resp = requests.get(target_url, headers=self.headers)
+            resp = self.fetch(target_url, headers=self.headers)
             if resp.status_code != 200:
                 self.logger.error(f"Failed to fetch {target_url}: {resp.status_code}")
                 return []
-                
-            soup = BeautifulSoup(resp.text, 'html.parser')
+
             jobs = []
+            board = board_of(target_url)
+            company = _company_from_token(board[1]) if board else None
 
             # Detect platform
             if "greenhouse.io" in target_url:
-                jobs = self._scrape_greenhouse(soup, limit)
+                jobs = self._scrape_greenhouse(resp.text, limit, company or "Company (Greenhouse)")
             elif "lever.co" in target_url:
-                jobs = self._scrape_lever(soup, limit)
+                jobs = self._scrape_lever(resp.text, limit, company or "Company (Lever)")
             else:
                 self.logger.warning("Unknown platform. Trying heuristics.")
                 # Heuristic fallback could go here
                 pass
-                
+
             return jobs
 
         except Exception as e:
             self.logger.error(f"Generic scrape error: {e}")
             return []
 
-    def _scrape_greenhouse(self, soup, limit):
+    def _scrape_greenhouse(self, html, limit, company="Company (Greenhouse)"):
         jobs = []
         # Greenhouse usually has <div class="opening"> <a href="...">Title</a> <span class="location">...</span> </div>
-        openings = soup.find_all('div', class_='opening')
-        
+        openings = select_regions(html, "div.opening")
+
         for op in openings[:limit]:
             try:
-                link = op.find('a')
+                link = op.select_one('a')
                 if not link: continue
-                
-                title = link.text.strip()
-                url = "https://boards.greenhouse.io" + link['href'] if link['href'].startswith('/') else link['href']
-                
-                loc_span = op.find('span', class_='location')
-                location = loc_span.text.strip() if loc_span else "Unknown"
-                
+
+                title = link.text()
+                href = link.attr('href', '')
+                url = "https://boards.greenhouse.io" + href if href.startswith('/') else href
+
+                loc_span = op.select_one('span.location')
+                location = loc_span.text() if loc_span else "Unknown"
+
                 jobs.append(Job(
                     title=title,
-                    company="Company (Greenhouse)", # Hard to find company name easily without more parsing
+                    company=company,
                     location=location,
                     url=url,
                     source="greenhouse",
                     date_posted=datetime.utcnow()
                 ))
-            except: 
+            except:
                 continue
         return jobs
 
-    def _scrape_lever(self, soup, limit):
+    def _scrape_lever(self, html, limit, company="Company (Lever)"):
         jobs = []
         # Lever usually has <a class="posting-title"> <h5>Title</h5> </a>
-        postings = soup.find_all('div', class_='posting')
-        
+        postings = select_regions(html, "div.posting")
+
         for post in postings[:limit]:
             try:
-                link = post.find('a', class_='posting-title')
+                link = post.select_one('a.posting-title')
                 if not link: continue
-                
-                title = link.find('h5').text.strip()
-                url = link['href']
-                
+
+                title = link.select_one('h5').text()
+                url = link.attr('href')
+
                 # Location is confusing in Lever sometimes, often in a span
-                labels = post.find('div', class_='posting-categories')
-                location = labels.text.strip() if labels else "Unknown"
-                
+                labels = post.select_one('div.posting-categories')
+                location = labels.text() if labels else "Unknown"
+
                 jobs.append(Job(
                     title=title,
-                    company="Company (Lever)",
+                    company=company,
                     location=location,
                     url=url,
                     source="lever",
@@ -113,4 +357,88 @@ class GenericScraper(BaseScraper):
         return jobs
 
     def parse_job_page(self, url: str) -> Optional[Job]:
-        pass
+        """Full posting for a Greenhouse or Lever job URL, from the per-job API endpoint."""
+        board = board_of(url)
+        if not board:
+            return None
+        platform, token = board
+        try:
+            if platform == "greenhouse":
+                match = GREENHOUSE_JOB_ID.search(url)
+                if not match:
+                    return None
+                resp = self.fetch(f"{GREENHOUSE_API.format(token=token)}/jobs/{match.group(1) or match.group(2)}",
+                                  headers=self.headers)
+                if resp.status_code != 200:
+                    return None
+                posting = resp.json()
+                company = posting.get("company_name") or self._greenhouse_company(token)
+                job = self._greenhouse_job(posting, company)
+            else:
+                segments = [s for s in urlsplit(url).path.split("/") if s]
+                if len(segments) < 2:
+                    return None
+                host = "api.eu.lever.co" if ".eu." in (urlsplit(url).hostname or "") else "api.lever.co"
+                resp = self.fetch(LEVER_POSTING.format(host=host, token=token, posting_id=segments[1]),
+                                  headers=self.headers)
+                if resp.status_code != 200:
+                    return None
+                job = self._lever_job(resp.json(), _company_from_token(token))
+            job.url = url
+            return job
+        except Exception as e:
+            self.logger.warning(f"Detail fetch failed for {url}: {e}")
+            return None
+
+
+class WatchlistScraper(GenericScraper):
+    """
+    Searches every board on the ATS watchlist (see load_watchlist). The
+    watchlist is re-crawled at most every CRAWL_REUSE_SECONDS per process,
+    so several queries in one search share a crawl; postings of unchanged
+    boards come from the catalog, so only changed boards are parsed. A
+    board that fails to crawl is served from its last catalog snapshot.
+    """
+    CRAWL_REUSE_SECONDS = 300
+    _last_crawl = None  # (monotonic time, board urls, jobs)
+    _crawl_lock = threading.Lock()
+
+    def __init__(self, board_urls: List[str] = None):
+        super().__init__()
+        self.board_urls = board_urls
+
+    def scrape(self, query: str = "", location: str = "", limit: int = 10) -> List[Job]:
+        urls = self.board_urls if self.board_urls is not None else load_watchlist()
+        if not urls:
+            return []
+        jobs = self._watchlist_jobs(tuple(urls))
+
+        query, location = (query or "").lower(), (location or "").lower()
+        matches = [
+            j for j in jobs
+            if (query in j.title.lower() or query in (j.description or "").lower())
+            and (not location or location in (j.location or "").lower())
+        ]
+        matches.sort(key=lambda j: j.date_posted or datetime.min, reverse=True)
+        return [_copy(j) for j in matches[:limit]]
+
+    def _watchlist_jobs(self, urls: tuple) -> List[Job]:
+        cls = WatchlistScraper
+        with cls._crawl_lock:
+            last = cls._last_crawl
+            if last and last[1] == urls and time.monotonic() - last[0] < self.CRAWL_REUSE_SECONDS:
+                return last[2]
+            report = self.crawl(list(urls))
+            jobs = [j for board_jobs in report["changed"].values() for j in board_jobs]
+            # Failed boards (timeouts, 5xx) fall back to their last good snapshot too
+            for url in report["unchanged"] + report["failed"]:
+                jobs.extend(catalog.get_last_results(BOARD_SOURCE, url, ""))
+            cls._last_crawl = (time.monotonic(), urls, jobs)
+            return jobs
+
+
+def _copy(job: Job) -> Job:
+    return Job(
+        title=job.title, company=job.company, location=job.location, description=job.description,
+        url=job.url, date_posted=job.date_posted, source=job.source
+    )
@@ -0,0 +1,222 @@
+"""
+Process-wide outbound request governor for scrapers.
+Every scraper request goes through a per-host slot: a token bucket caps the
+request rate and burst, a concurrency cap limits requests in flight, and
+429/403 responses or captcha pages put the host into exponential backoff so
+concurrent users don't get us blocked. Interactive callers pass a max_wait
+and get HostBackingOff instead of blocking through a long backoff.
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from ..utils.token_bucket import TokenBucket
+from ..utils.logger import setup_logger
+
+logger = setup_logger("OutboundGovernor")
+
+
+@dataclass
+class HostPolicy:
+    rate: float            # requests per second
+    burst: int             # bucket capacity
+    max_concurrency: int   # requests in flight
+
+
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    "www.linkedin.com": HostPolicy(rate=0.2, burst=1, max_concurrency=1),
+    "www.naukri.com": HostPolicy(rate=0.2, burst=1, max_concurrency=1),
+    "www.instahyre.com": HostPolicy(rate=1.0, burst=3, max_concurrency=2),
+    "arbeitnow.com": HostPolicy(rate=1.0, burst=2, max_concurrency=2),
+    "hacker-news.firebaseio.com": HostPolicy(rate=20.0, burst=20, max_concurrency=8),
+    # Public ATS board APIs; watchlist crawls send mostly conditional requests
+    "boards-api.greenhouse.io": HostPolicy(rate=25.0, burst=50, max_concurrency=16),
+    "api.lever.co": HostPolicy(rate=25.0, burst=50, max_concurrency=16),
+    "api.eu.lever.co": HostPolicy(rate=25.0, burst=50, max_concurrency=16),
+}
+DEFAULT_POLICY = HostPolicy(rate=2.0, burst=4, max_concurrency=4)
+
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 15 * 60
+BLOCK_STATUSES = (403, 429)
+# Titles of interstitial challenge pages (matched against <title> only, since
+# ordinary pages embed reCAPTCHA/hCaptcha widgets and say "captcha" in scripts)
+CHALLENGE_TITLES = (
+    "just a moment", "attention required", "access denied", "are you a robot", "robot check",
+    "security verification", "security check", "verify you are human", "human verification",
+)
+# Markup only challenge pages carry: Cloudflare, PerimeterX and DataDome
+# challenge forms, LinkedIn's checkpoint, Google's unusual-traffic page
+CHALLENGE_MARKERS = (
+    'id="challenge-form"', "cf_chl_opt", 'id="px-captcha"', "geo.captcha-delivery.com",
+    "/checkpoint/challenge", "our systems have detected unusual traffic",
+)
+TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
+
+
+class HostBackingOff(RuntimeError):
+    """A host can't take a request within the caller's max_wait."""
+
+    def __init__(self, host: str, retry_in: float, backing_off: bool):
+        self.host = host
+        self.retry_in = retry_in
+        reason = "is backing off" if backing_off else "is busy"
+        super().__init__(f"{host} {reason}, retry in {retry_in:.0f}s")
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or url).lower()
+
+
+def looks_blocked(status: Optional[int] = None, body: str = "") -> bool:
+    """True for rate-limit/forbidden responses and captcha or bot-check interstitials."""
+    if status in BLOCK_STATUSES:
+        return True
+    head = (body or "")[:20000].lower()
+    title = TITLE.search(head)
+    if title and any(marker in title.group(1) for marker in CHALLENGE_TITLES):
+        return True
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class _HostState:
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.bucket = TokenBucket(policy.burst, policy.rate, now=time.monotonic())
+        self.cond = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.backoff_until = 0.0
+        self.backoff_seconds = 0.0
+        self.requests = 0
+        self.blocked = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class OutboundGovernor:
+    def __init__(self, policies: Dict[str, HostPolicy] = None, default: HostPolicy = None):
+        self.policies = dict(HOST_POLICIES if policies is None else policies)
+        self.default = default or DEFAULT_POLICY
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float = None, burst: int = None, max_concurrency: int = None):
+        """Overrides a host's policy at runtime."""
+        state = self._state(host)
+        with state.cond:
+            policy = state.policy
+            state.policy = HostPolicy(
+                rate=rate if rate is not None else policy.rate,
+                burst=burst if burst is not None else policy.burst,
+                max_concurrency=max_concurrency if max_concurrency is not None else policy.max_concurrency
+            )
+            state.bucket.rate = state.policy.rate
+            state.bucket.capacity = state.policy.burst
+            state.cond.notify_all()
+
+    @contextmanager
+    def slot(self, url: str, max_wait: Optional[float] = None):
+        """
+        Blocks until the host allows another request, then holds a concurrency
+        slot. With max_wait, raises HostBackingOff rather than wait longer than
+        that (at once when the host's backoff alone outlasts it).
+        """
+        host = host_of(url)
+        state = self._state(host)
+        start = time.monotonic()
+        deadline = None if max_wait is None else start + max_wait
+        with state.cond:
+            state.waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = max(state.backoff_until - now, state.bucket.wait_time(now))
+                    busy = state.in_flight >= state.policy.max_concurrency
+                    if not busy and wait <= 0:
+                        break
+                    if deadline is not None and now + max(wait, 0) >= deadline:
+                        raise HostBackingOff(host, max(wait, 1.0), state.backoff_until > now)
+                    if busy:
+                        # woken when a request finishes
+                        state.cond.wait(timeout=None if deadline is None else deadline - now)
+                    else:
+                        state.cond.wait(timeout=wait)
+            finally:
+                state.waiting -= 1
+            state.bucket.take(time.monotonic())
+            state.in_flight += 1
+            waited = time.monotonic() - start
+            state.requests += 1
+            state.total_wait += waited
+            state.max_wait = max(state.max_wait, waited)
+        try:
+            yield
+        finally:
+            with state.cond:
+                state.in_flight -= 1
+                state.cond.notify_all()
+
+    def report(self, url: str, status: Optional[int] = None, body: str = "", retry_after: Optional[str] = None) -> bool:
+        """
+        Feeds a response back. Blocks double the host's backoff (honouring
+        Retry-After); clean responses let it decay. Returns True if blocked.
+        """
+        host = host_of(url)
+        state = self._state(host)
+        blocked = looks_blocked(status, body)
+        with state.cond:
+            if blocked:
+                state.blocked += 1
+                state.backoff_seconds = min(BACKOFF_MAX_SECONDS, max(BACKOFF_BASE_SECONDS, state.backoff_seconds * 2))
+                delay = state.backoff_seconds
+                if retry_after and str(retry_after).isdigit():
+                    delay = max(delay, min(int(retry_after), BACKOFF_MAX_SECONDS))
+                state.backoff_until = max(state.backoff_until, time.monotonic() + delay)
+                logger.warning(f"{host} looks blocked (status={status}); backing off {delay:.0f}s")
+            elif state.backoff_seconds:
+                state.backoff_seconds = state.backoff_seconds / 2 if state.backoff_seconds > BACKOFF_BASE_SECONDS else 0.0
+            state.cond.notify_all()
+        return blocked
+
+    def metrics(self) -> Dict[str, dict]:
+        """Per-host queue depth, in-flight count, wait times and block counts."""
+        now = time.monotonic()
+        with self._lock:
+            states = dict(self._hosts)
+        out = {}
+        for host, s in states.items():
+            with s.cond:
+                out[host] = {
+                    "queue_depth": s.waiting,
+                    "in_flight": s.in_flight,
+                    "requests": s.requests,
+                    "blocked": s.blocked,
+                    "avg_wait": round(s.total_wait / s.requests, 3) if s.requests else 0.0,
+                    "max_wait": round(s.max_wait, 3),
+                    "backoff_remaining": round(max(0.0, s.backoff_until - now), 1)
+                }
+        return out
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(self.policies.get(host, self.default))
+                self._hosts[host] = state
+            return state
+
+
+_GOVERNOR = None
+_GOVERNOR_LOCK = threading.Lock()
+
+
+def get_governor() -> OutboundGovernor:
+    global _GOVERNOR
+    with _GOVERNOR_LOCK:
+        if _GOVERNOR is None:
+            _GOVERNOR = OutboundGovernor()
+        return _GOVERNOR
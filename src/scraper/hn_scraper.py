@@ -1,7 +1,8 @@
-import requests
 from datetime import datetime
-from typing import List, Optional
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple
 from .base import BaseScraper
+from .governor import HostBackingOff
 from ..database.models import Job
 
 class HNScraper(BaseScraper):
@@ -15,34 +16,82 @@ class HNScraper(BaseScraper):
         super().__init__(self.BASE_API_URL)
 
     def scrape(self, query: str = "", location: str = "", limit: int = 10) -> List[Job]:
-        # Get job stories IDs
+        return list(islice(self.iter_jobs(query, location), limit))
+
+    def iter_jobs(self, query: str = "", location: str = "", page_size: int = None) -> Iterator[Job]:
+        # Get job stories IDs; items are fetched one at a time as the caller consumes them
+        try:
+            job_ids = self._job_ids()
+        except HostBackingOff:
+            raise
+        except Exception as e:
+            print(f"Error scraping HN: {e}")
+            return
+        yield from self._hydrate(job_ids, query, location)
+
+    def scrape_new(self, query: str, location: str, limit: int, cursor: dict,
+                   on_batch: Callable[[List[Job]], bool] = None) -> Tuple[List[Job], dict]:
+        """
+        HN item ids only grow, so only ids above the cursor's max id are
+        hydrated. A full scrape (no max id yet) reads newest first and moves
+        the cursor to the newest id; an incremental one reads oldest first
+        and advances only as far as the ids actually read, so postings left
+        over when collect() stops at limit or on_batch asks to stop are
+        picked up by the next run. An item that fails to fetch holds the
+        cursor below it so it is retried.
+        """
         try:
-            resp = requests.get(f"{self.BASE_API_URL}/jobstories.json")
-            resp.raise_for_status()
-            job_ids = resp.json()[:limit]  # Respect limit
-            
-            jobs = []
-            for jid in job_ids:
-                job_data = self._fetch_item(jid)
-                if job_data:
-                    job = self.parse_job_page(job_data)
-                    if job:
-                        # Basic filtering if query/location provided (client-side since API is limited)
-                        if query.lower() in job.title.lower() or query.lower() in (job.description or "").lower():
-                            if not location or (job.location and location.lower() in job.location.lower()):
-                                jobs.append(job)
-                            elif not location:
-                                jobs.append(job)
-            return jobs
+            ids = self._job_ids()
+        except HostBackingOff:
+            raise
         except Exception as e:
             print(f"Error scraping HN: {e}")
-            return []
+            return [], cursor
+        max_id = cursor.get("max_item_id") or 0
+        progress = {"read": max_id, "failed": []}
+        if max_id:
+            fresh = sorted(jid for jid in ids if jid > max_id)
+        else:
+            fresh = sorted(ids, reverse=True)
+        jobs = self.collect(self._hydrate(fresh, query, location, progress), limit, on_batch)
+        cursor = self.advance_cursor(cursor, jobs)
+        if progress["failed"]:
+            cursor["max_item_id"] = min(progress["failed"]) - 1
+        else:
+            cursor["max_item_id"] = progress["read"] if max_id else max(fresh, default=0)
+        return jobs, cursor
+
+    def _job_ids(self) -> List[int]:
+        resp = self.fetch(f"{self.BASE_API_URL}/jobstories.json")
+        resp.raise_for_status()
+        return resp.json()
+
+    def _hydrate(self, job_ids: List[int], query: str, location: str, progress: dict = None) -> Iterator[Job]:
+        """
+        Fetches and filters items in order. progress, when given, records
+        the last id read ("read") and the ids that failed to fetch ("failed").
+        """
+        for jid in job_ids:
+            job_data = self._fetch_item(jid)
+            if progress is not None:
+                progress["read"] = jid
+                if job_data is None:
+                    progress["failed"].append(jid)
+            if job_data:
+                job = self.parse_job_page(job_data)
+                if job:
+                    # Basic filtering if query/location provided (client-side since API is limited)
+                    if query.lower() in job.title.lower() or query.lower() in (job.description or "").lower():
+                        if not location or (job.location and location.lower() in job.location.lower()):
+                            yield job
 
     def _fetch_item(self, item_id: int) -> Optional[dict]:
         try:
-            resp = requests.get(f"{self.BASE_API_URL}/item/{item_id}.json")
+            resp = self.fetch(f"{self.BASE_API_URL}/item/{item_id}.json")
             if resp.status_code == 200:
                 return resp.json()
+        except HostBackingOff:
+            raise
         except:
             pass
         return None
@@ -51,7 +100,7 @@ class HNScraper(BaseScraper):
         """
         Parses the JSON data from HN API into a Job object.
         """
-        if notData := data:
+        if not data:
             return None
         
         # HN jobs often have title like "Company | Role | Location" or similar
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from itertools import islice
+from typing import Iterator, List, Optional
 from datetime import datetime
-import requests
 from .base import BaseScraper
+from .governor import HostBackingOff
 from ..database.models import Job
 from ..utils.logger import setup_logger
 
@@ -11,99 +12,110 @@ class InstahyreScraper(BaseScraper):
     """
     BASE_URL = "https://www.instahyre.com"
     API_URL = "https://www.instahyre.com/api/v1/job_search"
+    MAX_PAGE_SIZE = 50
 
     def __init__(self):
         super().__init__(self.BASE_URL)
         self.logger = setup_logger("InstahyreScraper")
 
     def scrape(self, query: str = "python", location: str = "Bangalore", limit: int = 10) -> List[Job]:
-        params = {
-            "skills": query,
-            "location": location,
-            "count": limit + 5 # Fetch a bit more to filter
-        }
-        
+        return list(islice(self.iter_jobs(query, location, page_size=limit + 5), limit))  # Fetch a bit more to filter
+
+    def iter_jobs(self, query: str = "python", location: str = "Bangalore", page_size: int = None) -> Iterator[Job]:
+        """Pages through the job_search API by offset, one page in memory at a time."""
+        count = min(page_size or self.PAGE_SIZE, self.MAX_PAGE_SIZE)
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Referer": "https://www.instahyre.com/jobs/"
         }
 
         self.logger.info(f"Scraping Instahyre API for query='{query}' in '{location}'...")
-        jobs = []
+        found = 0
+        offset = 0
         try:
-            response = requests.get(self.API_URL, params=params, headers=headers)
-            if response.status_code == 200:
+            for page in range(self.MAX_PAGES):
+                params = {
+                    "skills": query,
+                    "location": location,
+                    "count": count,
+                    "limit": count,
+                    "offset": offset
+                }
+                response = self.fetch(self.API_URL, params=params, headers=headers)
+                if response.status_code != 200:
+                    self.logger.error(f"Instahyre API failed with {response.status_code}")
+                    break
                 data = response.json()
-                # DEBUG: Print raw response summary
-                print(f"DEBUG: Instahyre API Response Keys: {list(data.keys())}")
-                if 'objects' in data:
-                    print(f"DEBUG: Instahyre 'objects' count: {len(data['objects'])}")
-                
-                if 'objects' in data:
-                    for obj in data['objects']:
-                        try:
-                            # DEBUG: Explicit type check
-                            print(f"DEBUG: Processing obj of type {type(obj)}")
-                            if not isinstance(obj, dict):
-                                print(f"DEBUG: Skipping invalid object type: {type(obj)}")
-                                continue
-                                
-                            title = obj.get('title', 'Unknown Role')
-                            # Company Name Logic
-                            company = obj.get('company_name')
-                            if not company and isinstance(obj.get('company'), dict):
-                                company = obj['company'].get('name')
-                            
-                            # Fallback if still unknown
-                            if not company:
-                                # Sometimes it's in a different structure
-                                company = "Confidential (Instahyre)" 
-
-
-                            # Location Logic (Fixing H,y,d,e,r,a,b,a,d issue)
-                            locs = obj.get('locations', [])
-                            parsed_locs = []
-                            
-                            if isinstance(locs, list):
-                                for l in locs:
-                                    if isinstance(l, dict):
-                                        parsed_locs.append(l.get('city', ''))
-                                    elif isinstance(l, str):
-                                        parsed_locs.append(l)
-                            elif isinstance(locs, str):
-                                parsed_locs.append(locs)
-                                
-                            location_text = ", ".join(filter(None, parsed_locs)) if parsed_locs else location
-
-                            # URL Logic
-                            slug = obj.get('job_slug', '')
-                            url = f"{self.BASE_URL}/job-{obj.get('id')}-{slug}" if obj.get('id') else self.BASE_URL
-
-                            description = f"Skills: {', '.join(obj.get('skills', []))}"
-                            
-                            job = Job(
-                                title=title,
-                                company=company,
-                                location=location_text,
-                                description=description,
-                                url=url,
-                                source="instahyre",
-                                date_posted=datetime.utcnow()
-                            )
-                            jobs.append(job)
-                            if len(jobs) >= limit:
-                                break
-                        except Exception as e:
-                            self.logger.error(f"Error parsing Instahyre job: {e}")
-                            continue
-                self.logger.info(f"Instahyre found {len(jobs)} jobs.")
-            else:
-                self.logger.error(f"Instahyre API failed with {resp.status_code}")
+                objects = data.get('objects') or []
+                self.logger.debug(f"Instahyre API page {page + 1}: {len(objects)} objects")
+                for obj in objects:
+                    job = self._parse_object(obj, location)
+                    if job:
+                        found += 1
+                        yield job
+                offset += len(objects)
+                meta = data.get('meta') or {}
+                if not objects or (not meta.get('next') and len(objects) < count):
+                    break
+            self.logger.info(f"Instahyre found {found} jobs.")
+        except HostBackingOff:
+            raise
         except Exception as e:
             self.logger.error(f"Instahyre scrape connection error: {e}")
             print(f"CRITICAL INSTAHYRE ERROR: {e}") # This will show in the terminal
-            
-        return jobs
+
+    def _parse_object(self, obj, location: str) -> Optional[Job]:
+        try:
+            # DEBUG: Explicit type check
+            if not isinstance(obj, dict):
+                print(f"DEBUG: Skipping invalid object type: {type(obj)}")
+                return None
+
+            title = obj.get('title', 'Unknown Role')
+            # Company Name Logic
+            company = obj.get('company_name')
+            if not company and isinstance(obj.get('company'), dict):
+                company = obj['company'].get('name')
+
+            # Fallback if still unknown
+            if not company:
+                # Sometimes it's in a different structure
+                company = "Confidential (Instahyre)"
+
+
+            # Location Logic (Fixing H,y,d,e,r,a,b,a,d issue)
+            locs = obj.get('locations', [])
+            parsed_locs = []
+
+            if isinstance(locs, list):
+                for l in locs:
+                    if isinstance(l, dict):
+                        parsed_locs.append(l.get('city', ''))
+                    elif isinstance(l, str):
+                        parsed_locs.append(l)
+            elif isinstance(locs, str):
+                parsed_locs.append(locs)
+
+            location_text = ", ".join(filter(None, parsed_locs)) if parsed_locs else location
+
+            # URL Logic
+            slug = obj.get('job_slug', '')
+            url = f"{self.BASE_URL}/job-{obj.get('id')}-{slug}" if obj.get('id') else self.BASE_URL
+
+            description = f"Skills: {', '.join(obj.get('skills', []))}"
+
+            return Job(
+                title=title,
+                company=company,
+                location=location_text,
+                description=description,
+                url=url,
+                source="instahyre",
+                date_posted=datetime.utcnow()
+            )
+        except Exception as e:
+            self.logger.error(f"Error parsing Instahyre job: {e}")
+            return None
 
     def parse_job_page(self, url: str) -> Optional[Job]:
         pass
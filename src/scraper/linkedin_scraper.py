@@ -1,8 +1,11 @@
+import re
 import time
 import random
-from typing import List, Optional
+from itertools import islice
+from typing import Iterator, List, Optional
 from bs4 import BeautifulSoup
 from .base import BaseScraper
+from .parsing import parse_html
 from ..database.models import Job
 from datetime import datetime
 from ..utils.logger import setup_logger
@@ -20,6 +23,12 @@ try:
 except ImportError:
     HAS_SELENIUM = False
 
+JOB_ID = re.compile(r"(?:currentJobId=|-|/)(\d{8,})")
+GUEST_POSTING_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
 class LinkedInScraper(BaseScraper):
     """
     Scraper for LinkedIn Jobs. 
@@ -38,6 +47,14 @@ class LinkedInScraper(BaseScraper):
         self.driver = get_driver(self.headless)
 
     def scrape(self, query: str = "software engineer", location: str = "India", limit: int = 10) -> List[Job]:
+        return list(islice(self.iter_jobs(query, location), limit))
+
+    def iter_jobs(self, query: str = "software engineer", location: str = "India", page_size: int = None) -> Iterator[Job]:
+        """
+        Infinite-scroll loop: parse the cards on screen, remove them from the
+        DOM (so the browser's memory stays flat), scroll / click "See more
+        jobs", repeat until no new cards load.
+        """
         if not self.driver:
             self._setup_driver()
 
@@ -45,91 +62,127 @@ class LinkedInScraper(BaseScraper):
         search_url = f"{self.BASE_URL}?keywords={query}&location={location}&f_TPR=r604800" # Last week filter helps relevance
         
         self.logger.info(f"Navigating to: {search_url}")
-        self.driver.get(search_url)
+        self.navigate(self.driver, search_url)
         
         # Human-like delay
         delay = random.uniform(3, 6)
         self.logger.info(f"Waiting for {delay:.2f}s...")
         time.sleep(delay)
-        
-        jobs = []
+
+        empty_rounds = 0
+        for step in range(self.MAX_PAGES):
+            try:
+                job_cards = self._find_cards()
+                if not job_cards:
+                    if step == 0:
+                        self.logger.warning("No job cards found using standard selectors. Taking debug screenshot.")
+                        self.driver.save_screenshot("linkedin_debug.png")
+                    empty_rounds += 1
+                    if empty_rounds >= 2:
+                        return
+                else:
+                    empty_rounds = 0
+                    page_jobs = [job for job in (self._parse_card(card) for card in job_cards) if job]
+                    self.driver.execute_script("arguments[0].forEach(e => e.remove());", job_cards)
+                    yield from page_jobs
+
+                # Scroll to trigger lazy loading, then try the "See more jobs" button
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(2)
+                for button in self.driver.find_elements(By.CSS_SELECTOR, "button.infinite-scroller__show-more-button"):
+                    if button.is_displayed():
+                        button.click()
+                        time.sleep(2)
+                        break
+            except Exception as e:
+                self.logger.error(f"Error scraping LinkedIn list: {e}")
+                self.driver.save_screenshot("linkedin_error.png")
+                return
+
+    def _find_cards(self):
+        # This selector is subject to change by LinkedIn
+        # Try multiple selector strategies
+        selectors = ["div.base-card", "li.jobs-search-results__list-item", "div.job-search-card"]
+        for sel in selectors:
+            job_cards = self.driver.find_elements(By.CSS_SELECTOR, sel)
+            if job_cards:
+                self.logger.info(f"Found {len(job_cards)} job cards using selector: {sel}")
+                return job_cards
+        return []
+
+    def _parse_card(self, card) -> Optional[Job]:
         try:
-            # Scroll a bit to trigger lazy loading
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-            time.sleep(2)
-            
-            # This selector is subject to change by LinkedIn
-            # Try multiple selector strategies
-            selectors = ["div.base-card", "li.jobs-search-results__list-item", "div.job-search-card"]
-            job_cards = []
-            for sel in selectors:
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, sel)
-                if job_cards:
-                    self.logger.info(f"Found {len(job_cards)} job cards using selector: {sel}")
-                    break
+            # Extract basic info from card
+            # Note: Selectors might need adjustment based on the card type found
+            try:
+                title_elem = card.find_element(By.CSS_SELECTOR, "h3.base-search-card__title")
+                company_elem = card.find_element(By.CSS_SELECTOR, "h4.base-search-card__subtitle")
+                loc_elem = card.find_element(By.CSS_SELECTOR, "span.job-search-card__location")
+                link_elem = card.find_element(By.CSS_SELECTOR, "a.base-card__full-link")
+            except:
+                # Fallback for different card layout
+                title_elem = card.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__title") 
+                company_elem = card.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle")
+                loc_elem = card.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__caption")
+                link_elem = card.find_element(By.CSS_SELECTOR, "a")
+
+            title_text = title_elem.text.strip()
+            company_text = company_elem.text.strip()
+            location_text = loc_elem.text.strip()
+            url = link_elem.get_attribute("href")
             
-            if not job_cards:
-                self.logger.warning("No job cards found using standard selectors. Taking debug screenshot.")
-                self.driver.save_screenshot("linkedin_debug.png")
+            # Filter out empty or obfuscated data
+            if not title_text or not company_text:
+                return None
             
-            for card in job_cards[:limit]:
-                try:
-                    # Extract basic info from card
-                    # Note: Selectors might need adjustment based on the card type found
-                    try:
-                        title_elem = card.find_element(By.CSS_SELECTOR, "h3.base-search-card__title")
-                        company_elem = card.find_element(By.CSS_SELECTOR, "h4.base-search-card__subtitle")
-                        loc_elem = card.find_element(By.CSS_SELECTOR, "span.job-search-card__location")
-                        link_elem = card.find_element(By.CSS_SELECTOR, "a.base-card__full-link")
-                    except:
-                        # Fallback for different card layout
-                        title_elem = card.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__title") 
-                        company_elem = card.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle")
-                        loc_elem = card.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__caption")
-                        link_elem = card.find_element(By.CSS_SELECTOR, "a")
-
-                    title = title_elem.text.strip()
-                    company = company_elem.text.strip()
-                    location_text = loc_elem.text.strip()
-                    url = link_elem.get_attribute("href")
-                    
-                    self.logger.info(f"Found Job: {title} at {company}")
-
-                    # Create job object
-                    title_text = title_elem.text.strip()
-                    company_text = company_elem.text.strip()
-                    
-                    # Filter out empty or obfuscated data
-                    if not title_text or not company_text:
-                        continue
-                    
-                    # Skip obfuscated results (common in scraping without login)
-                    if "*" in company_text or "*" in title_text or "LinkedIn Member" in company_text:
-                        self.logger.warning(f"Skipping obfuscated job: {title_text} @ {company_text}")
-                        continue
-                        
-                    job = Job(
-                        title=title_text,
-                        company=company_text,
-                        location=location_text,
-                        url=url,
-                        source="linkedin",
-                        date_posted=datetime.utcnow() 
-                    )
-                    jobs.append(job)
-                except Exception as e:
-                    # Skip incomplete cards
-                    continue
-                    
+            # Skip obfuscated results (common in scraping without login)
+            if "*" in company_text or "*" in title_text or "LinkedIn Member" in company_text:
+                self.logger.warning(f"Skipping obfuscated job: {title_text} @ {company_text}")
+                return None
+
+            self.logger.info(f"Found Job: {title_text} at {company_text}")
+            return Job(
+                title=title_text,
+                company=company_text,
+                location=location_text,
+                url=url,
+                source="linkedin",
+                date_posted=datetime.utcnow() 
+            )
         except Exception as e:
-            self.logger.error(f"Error scraping LinkedIn list: {e}")
-            self.driver.save_screenshot("linkedin_error.png")
-            
-        return jobs
+            # Skip incomplete cards
+            return None
 
     def parse_job_page(self, url: str) -> Optional[Job]:
-        # Detailed parsing can be added later
-        pass
+        """
+        Full posting from LinkedIn's public guest endpoint. Plain HTTP, so it
+        needs no browser and is safe to call from any thread.
+        """
+        match = JOB_ID.search(url or "")
+        if not match:
+            return None
+        try:
+            resp = self.fetch(GUEST_POSTING_URL.format(job_id=match.group(1)), headers=HEADERS)
+            if resp.status_code != 200:
+                return None
+            root = parse_html(resp.text)
+            description = root.select_one("div.show-more-less-html__markup") or root.select_one("div.description__text")
+            if not description:
+                return None
+            title = root.select_one("h2.top-card-layout__title")
+            company = root.select_one("a.topcard__org-name-link")
+            location = root.select_one("span.topcard__flavor--bullet")
+            return Job(
+                title=title.text() if title else "",
+                company=company.text() if company else "",
+                location=location.text() if location else None,
+                description=description.text(),
+                url=url,
+                source="linkedin"
+            )
+        except Exception as e:
+            self.logger.warning(f"Detail fetch failed for {url}: {e}")
+            return None
 
     def close(self):
         if self.driver:
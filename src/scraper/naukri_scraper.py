@@ -1,4 +1,5 @@
-from typing import List, Optional
+from itertools import islice
+from typing import Iterator, List, Optional
 import time
 import random
 from datetime import datetime
@@ -34,6 +35,10 @@ class NaukriScraper(BaseScraper):
         self.driver = get_driver(self.headless)
 
     def scrape(self, query: str = "python developer", location: str = "Bangalore", limit: int = 10) -> List[Job]:
+        return list(islice(self.iter_jobs(query, location), limit))
+
+    def iter_jobs(self, query: str = "python developer", location: str = "Bangalore", page_size: int = None) -> Iterator[Job]:
+        """Walks result pages (-2, -3, ...) until one comes back empty."""
         if not self.driver:
             self._setup_driver()
 
@@ -44,89 +49,93 @@ class NaukriScraper(BaseScraper):
         q_clean = query.replace(' ', '-')
         l_clean = location.replace(' ', '-')
         search_url = f"{self.BASE_URL}/{q_clean}-jobs-in-{l_clean}"
-        
-        self.logger.info(f"Navigating to: {search_url}")
-        self.driver.get(search_url)
-        
-        delay = random.uniform(5, 8)
-        self.logger.info(f"Waiting {delay:.2f}s for page load...")
-        time.sleep(delay)
-        
-        jobs = []
+
+        for page in range(1, self.MAX_PAGES + 1):
+            page_url = search_url if page == 1 else f"{search_url}-{page}"
+            self.logger.info(f"Navigating to: {page_url}")
+            self.navigate(self.driver, page_url)
+
+            delay = random.uniform(5, 8)
+            self.logger.info(f"Waiting {delay:.2f}s for page load...")
+            time.sleep(delay)
+
+            try:
+                # Selectors for job tuples
+                # Naukri changes classes often. Using partial class or structure is safer.
+                # .srp-jobtuple-wrapper is a common container
+                job_tuples = self.driver.find_elements(By.CSS_SELECTOR, ".srp-jobtuple-wrapper")
+
+                if not job_tuples:
+                    self.logger.warning("No job tuples found. Checking for 'cust-job-tuple'...")
+                    job_tuples = self.driver.find_elements(By.CSS_SELECTOR, "div.cust-job-tuple")
+
+                if not job_tuples:
+                    if page == 1:
+                        self.logger.warning("Still no jobs. Taking debug screenshot: naukri_debug.png")
+                        self.driver.save_screenshot("naukri_debug.png")
+                    return
+
+                self.logger.info(f"Found {len(job_tuples)} potential job cards on page {page}.")
+                page_jobs = [job for job in (self._parse_tuple(t) for t in job_tuples) if job]
+            except Exception as e:
+                self.logger.error(f"Error scraping Naukri: {e}")
+                self.driver.save_screenshot("naukri_error.png")
+                return
+
+            yield from page_jobs
+
+    def _parse_tuple(self, tuple_node) -> Optional[Job]:
         try:
-            # Selectors for job tuples
-            # Naukri changes classes often. Using partial class or structure is safer.
-            # .srp-jobtuple-wrapper is a common container
-            job_tuples = self.driver.find_elements(By.CSS_SELECTOR, ".srp-jobtuple-wrapper")
-            
-            if not job_tuples:
-                self.logger.warning("No job tuples found. Checking for 'cust-job-tuple'...")
-                job_tuples = self.driver.find_elements(By.CSS_SELECTOR, "div.cust-job-tuple")
-            
-            if not job_tuples:
-                self.logger.warning("Still no jobs. Taking debug screenshot: naukri_debug.png")
-                self.driver.save_screenshot("naukri_debug.png")
-
-            self.logger.info(f"Found {len(job_tuples)} potential job cards.")
-
-            for tuple_node in job_tuples[:limit]:
+            title_elem = tuple_node.find_element(By.CSS_SELECTOR, "a.title")
+            try:
+                company_elem = tuple_node.find_element(By.CSS_SELECTOR, "a.comp-name")
+            except:
+                # Sometimes company name is not a link
+                company_elem = tuple_node.find_element(By.CSS_SELECTOR, "div.comp-name")
+
+            title = title_elem.text.strip()
+            company = company_elem.text.strip()
+            url = title_elem.get_attribute("href")
+
+            # Location structure varies
+            try:
+                loc_elem = tuple_node.find_element(By.CSS_SELECTOR, "span.locWdth")
+                location_text = loc_elem.text.strip()
+            except:
+                location_text = "Unknown"
+
+            # Try to get description snippet
+            desc_text = "No description available."
+            try:
+                # Naukri often has a job-desc or snippet class
+                desc_elem = tuple_node.find_element(By.CSS_SELECTOR, "div.job-desc")
+                desc_text = desc_elem.text.strip()
+            except:
                 try:
-                    title_elem = tuple_node.find_element(By.CSS_SELECTOR, "a.title")
-                    try:
-                        company_elem = tuple_node.find_element(By.CSS_SELECTOR, "a.comp-name")
-                    except:
-                        # Sometimes company name is not a link
-                        company_elem = tuple_node.find_element(By.CSS_SELECTOR, "div.comp-name")
-                    
-                    # Location structure varies
-                    try:
-                        loc_elem = tuple_node.find_element(By.CSS_SELECTOR, "span.locWdth")
-                        location_text = loc_elem.text.strip()
-                    except:
-                        location_text = "Unknown"
-
-                    # Try to get description snippet
-                    desc_text = "No description available."
-                    try:
-                        # Naukri often has a job-desc or snippet class
-                        desc_elem = tuple_node.find_element(By.CSS_SELECTOR, "div.job-desc")
-                        desc_text = desc_elem.text.strip()
-                    except:
-                        try:
-                            # Fallback: keyskills match
-                            keyskills = tuple_node.find_elements(By.CSS_SELECTOR, "li.dot") # tags
-                            if not keyskills: keyskills = tuple_node.find_elements(By.CSS_SELECTOR, ".tags span")
-                            if keyskills:
-                                desc_text = "Skills: " + ", ".join([k.text for k in keyskills])
-                        except: pass
-                    
-                    # If still empty, use Title + Company to ensure at least some match possibility
-                    if desc_text == "No description available.":
-                         desc_text = f"{title} role at {company} in {location_text}"
-
-                    title = title_elem.text.strip()
-                    company = company_elem.text.strip()
-                    url = title_elem.get_attribute("href")
-                    
-                    self.logger.info(f"Found Job: {title} at {company}")
-                    
-                    job = Job(
-                        title=title,
-                        company=company,
-                        location=location_text,
-                        url=url,
-                        source="naukri",
-                        date_posted=datetime.utcnow()
-                    )
-                    jobs.append(job)
-                except Exception as e:
-                    continue
-                    
+                    # Fallback: keyskills match
+                    keyskills = tuple_node.find_elements(By.CSS_SELECTOR, "li.dot") # tags
+                    if not keyskills: keyskills = tuple_node.find_elements(By.CSS_SELECTOR, ".tags span")
+                    if keyskills:
+                        desc_text = "Skills: " + ", ".join([k.text for k in keyskills])
+                except: pass
+
+            # If still empty, use Title + Company to ensure at least some match possibility
+            if desc_text == "No description available.":
+                 desc_text = f"{title} role at {company} in {location_text}"
+
+            self.logger.info(f"Found Job: {title} at {company}")
+
+            return Job(
+                title=title,
+                company=company,
+                location=location_text,
+                description=desc_text,
+                url=url,
+                source="naukri",
+                date_posted=datetime.utcnow()
+            )
         except Exception as e:
-            self.logger.error(f"Error scraping Naukri: {e}")
-            self.driver.save_screenshot("naukri_error.png")
-            
-        return jobs
+            return None
 
     def parse_job_page(self, url: str) -> Optional[Job]:
         pass
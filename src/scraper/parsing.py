@@ -0,0 +1,103 @@
+"""
+Pluggable HTML parsing for scrapers.
+Scrapers call parse_html()/select_regions() and work with HtmlNode
+(CSS select, text, attributes) instead of a specific library, so the
+fastest installed backend is used:
+
+  selectolax  - lexbor engine, no Python tree (fastest)
+  lxml        - BeautifulSoup on the lxml tree builder
+  html.parser - BeautifulSoup on the stdlib parser (always available)
+
+HTML_PARSER=<name> forces a backend. The BeautifulSoup backends build only
+the requested job-list region via SoupStrainer when the selector is simple.
+"""
+import os
+import re
+from typing import List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z][a-zA-Z0-9]*)?(?:\.([\w-]+)|#([\w-]+))?$")
+
+
+def available_backends() -> List[str]:
+    return [b for b, ok in zip(BACKENDS, (HAS_SELECTOLAX, HAS_LXML, True)) if ok]
+
+
+def get_backend(name: str = None) -> str:
+    """Requested backend if installed, else the fastest available one."""
+    name = name or os.getenv("HTML_PARSER")
+    available = available_backends()
+    return name if name in available else available[0]
+
+
+class HtmlNode:
+    """Thin wrapper giving selectolax and BeautifulSoup nodes one API."""
+
+    __slots__ = ("_node", "_lexbor")
+
+    def __init__(self, node, lexbor: bool):
+        self._node = node
+        self._lexbor = lexbor
+
+    def select(self, css: str) -> List["HtmlNode"]:
+        found = self._node.css(css) if self._lexbor else self._node.select(css)
+        return [HtmlNode(n, self._lexbor) for n in found]
+
+    def select_one(self, css: str) -> Optional["HtmlNode"]:
+        found = self._node.css_first(css) if self._lexbor else self._node.select_one(css)
+        return HtmlNode(found, self._lexbor) if found is not None else None
+
+    def text(self) -> str:
+        if self._lexbor:
+            return self._node.text(separator=" ", strip=True)
+        return self._node.get_text(" ", strip=True)
+
+    def attr(self, name: str, default=None):
+        if self._lexbor:
+            value = self._node.attributes.get(name)
+        else:
+            value = self._node.get(name)
+        return default if value is None else value
+
+
+def _strainer(selector: str) -> Optional[SoupStrainer]:
+    match = SIMPLE_SELECTOR.match(selector or "")
+    if not match or not any(match.groups()):
+        return None
+    tag, cls, id_ = match.groups()
+    attrs = {"class": cls} if cls else ({"id": id_} if id_ else {})
+    return SoupStrainer(tag, attrs=attrs) if tag else SoupStrainer(attrs=attrs)
+
+
+def parse_html(markup: str, backend: str = None) -> HtmlNode:
+    """Parses a whole document and returns its root node."""
+    backend = get_backend(backend)
+    if backend == "selectolax":
+        return HtmlNode(LexborHTMLParser(markup).root, True)
+    return HtmlNode(BeautifulSoup(markup, backend), False)
+
+
+def select_regions(markup: str, selector: str, backend: str = None) -> List[HtmlNode]:
+    """
+    Nodes matching selector. BeautifulSoup backends only build those
+    elements (SoupStrainer) when the selector is a plain tag/.class/#id.
+    """
+    backend = get_backend(backend)
+    if backend == "selectolax":
+        return parse_html(markup, backend).select(selector)
+    strainer = _strainer(selector)
+    soup = BeautifulSoup(markup, backend, parse_only=strainer) if strainer else BeautifulSoup(markup, backend)
+    return [HtmlNode(n, False) for n in soup.select(selector)]
@@ -0,0 +1,2 @@
+from .pipeline import SearchPipeline, SearchEvent, expand_queries, SOURCES
+from .enrichment import enrich_and_rescore, needs_description
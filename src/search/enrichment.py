@@ -0,0 +1,183 @@
+"""
+Lazy detail-page enrichment.
+Search result cards often carry no description, so matchers score on the
+title alone. Instead of fetching every detail page, only jobs whose
+title-level score clears ENRICH_SCORE (or that the user opens on demand)
+get their description fetched, through one bounded pool shared by the
+process. Descriptions are cached in the shared catalog, so each posting
+is fetched at most once across users.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from ..database import catalog
+from ..database.models import Job, Profile
+from ..matcher.base import BaseMatcher
+from ..scraper import load_scraper
+from ..utils.logger import setup_logger
+
+logger = setup_logger("Enrichment")
+
+MIN_DESCRIPTION_CHARS = 200  # anything shorter is treated as missing
+ENRICH_SCORE = 40  # title-level score that makes a detail fetch worth it
+ENRICH_WORKERS = 4
+MISS_RETRY_SECONDS = 3600  # don't retry a failed detail page sooner than this
+MAX_MISSES = 5000  # failed URLs remembered at once (oldest dropped first)
+
+# host suffix -> scraper ("module:Class") whose parse_job_page handles it
+DETAIL_SCRAPERS = {
+    "linkedin.com": "linkedin_scraper:LinkedInScraper",
+    "greenhouse.io": "generic_scraper:GenericScraper",
+    "lever.co": "generic_scraper:GenericScraper",
+}
+
+
+def detail_scraper_for(url: str):
+    host = (urlsplit(url or "").hostname or "").lower()
+    for suffix, scraper_path in DETAIL_SCRAPERS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return scraper_path
+    return None
+
+
+def needs_description(job: Job) -> bool:
+    return bool(job.url) and len(job.description or "") < MIN_DESCRIPTION_CHARS
+
+
+def worth_enriching(job: Job, min_score: float = ENRICH_SCORE) -> bool:
+    """
+    Cheap pre-filter: a detail page exists and the title alone already
+    looks relevant (scores min_score, or mentions one of the profile skills).
+    """
+    if not needs_description(job) or detail_scraper_for(job.url) is None:
+        return False
+    return (job.match_score or 0) >= min_score or bool(job.keywords_matched)
+
+
+class DetailFetcher:
+    """
+    Bounded concurrent detail-page fetcher. submit() returns a Future of the
+    description (None if unavailable); concurrent requests for the same URL
+    share one fetch, and fetched descriptions are written to the catalog.
+    """
+
+    def __init__(self, max_workers: int = ENRICH_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrich")
+        self._scrapers = {}
+        self._inflight: Dict[str, Future] = {}
+        self._misses: "OrderedDict[str, float]" = OrderedDict()  # url -> monotonic time of the failure, oldest first
+        self._lock = threading.Lock()
+
+    def submit(self, job: Job) -> Future:
+        with self._lock:
+            future = self._inflight.get(job.url)
+            if future is None:
+                future = self._pool.submit(self._fetch, _copy(job))
+                self._inflight[job.url] = future
+                future.add_done_callback(lambda _, url=job.url: self._forget(url))
+            return future
+
+    def enrich(self, jobs: List[Job], timeout: Optional[float] = None) -> List[Job]:
+        """
+        Fills in missing descriptions in place, from the catalog where it
+        already has them and from detail pages otherwise. Returns the jobs
+        that got a description.
+        """
+        todo = [j for j in jobs if needs_description(j)]
+        if not todo:
+            return []
+        cached = catalog.get_descriptions(j.url for j in todo)
+        enriched = []
+        pending = []  # (job, future)
+        for job in todo:
+            description = cached.get(job.url)
+            if description and len(description) > len(job.description or ""):
+                job.description = description
+                enriched.append(job)
+            elif detail_scraper_for(job.url) is not None:
+                pending.append((job, self.submit(job)))
+        if pending:
+            wait([f for _, f in pending], timeout=timeout)
+            enriched.extend(apply_descriptions(pending))
+        return enriched
+
+    def _fetch(self, job: Job) -> Optional[str]:
+        with self._lock:
+            missed = self._misses.get(job.url)
+        if missed and time.monotonic() - missed < MISS_RETRY_SECONDS:
+            return None
+        scraper_cls = load_scraper(detail_scraper_for(job.url))
+        with self._lock:
+            scraper = self._scrapers.get(scraper_cls)
+            if scraper is None:
+                scraper = self._scrapers[scraper_cls] = scraper_cls()
+        detail = None
+        try:
+            detail = scraper.parse_job_page(job.url)
+        except Exception as e:
+            logger.warning(f"Detail page failed for {job.url}: {e}")
+        if not detail or not detail.description:
+            self._record_miss(job.url)
+            return None
+        job.description = detail.description
+        catalog.upsert_jobs([job])
+        return detail.description
+
+    def _record_miss(self, url: str):
+        now = time.monotonic()
+        with self._lock:
+            self._misses.pop(url, None)
+            self._misses[url] = now
+            # Entries are in failure order: expired ones and any over the cap sit at the front
+            while self._misses and (len(self._misses) > MAX_MISSES
+                                    or now - next(iter(self._misses.values())) >= MISS_RETRY_SECONDS):
+                self._misses.popitem(last=False)
+
+    def _forget(self, url: str):
+        with self._lock:
+            self._inflight.pop(url, None)
+
+
+def apply_descriptions(pending: List[tuple]) -> List[Job]:
+    """Copies finished (job, future) fetches onto their jobs; returns the jobs that got a description."""
+    enriched = []
+    for job, future in pending:
+        if future.done() and not future.exception():
+            description = future.result()
+            if description and len(description) > len(job.description or ""):
+                job.description = description
+                enriched.append(job)
+    return enriched
+
+
+def enrich_and_rescore(jobs: List[Job], matcher: BaseMatcher, profile: Profile,
+                       timeout: Optional[float] = None) -> List[Job]:
+    """Enriches jobs and re-scores the ones whose description changed."""
+    enriched = get_fetcher().enrich(jobs, timeout=timeout)
+    if enriched and (profile.skills or profile.resume_text):
+        for job, (score, details) in zip(enriched, matcher.match_batch(enriched, profile)):
+            job.match_score = score
+            job.keywords_matched = details.get('matched_keywords')
+    return enriched
+
+
+def _copy(job: Job) -> Job:
+    return Job(
+        title=job.title, company=job.company, location=job.location, description=job.description,
+        url=job.url, date_posted=job.date_posted, source=job.source
+    )
+
+
+_FETCHER = None
+_FETCHER_LOCK = threading.Lock()
+
+
+def get_fetcher() -> DetailFetcher:
+    global _FETCHER
+    with _FETCHER_LOCK:
+        if _FETCHER is None:
+            _FETCHER = DetailFetcher()
+        return _FETCHER
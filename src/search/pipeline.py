@@ -0,0 +1,259 @@
+"""
+Streaming search pipeline: scrape -> dedup -> score, one batch at a time.
+Each source runs in its own worker thread and results are yielded as soon
+as a (source, query) pair finishes, so callers can render and save partial
+results instead of waiting for the slowest source.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from ..database.models import Job, Profile
+from ..matcher.base import BaseMatcher
+from ..scraper import SCRAPERS, get_scraper_class
+from ..scraper.governor import get_governor
+from ..utils.dedup import Deduplicator
+from .enrichment import get_fetcher, worth_enriching, apply_descriptions
+from ..utils.logger import setup_logger
+
+logger = setup_logger("SearchPipeline")
+
+# source key -> (display name, "module:Class"); scrapers are imported when a search first uses them
+SOURCES = SCRAPERS
+
+
+def expand_queries(query: str, skills: List[str], use_smart_search: bool = True) -> List[str]:
+    """Smart Search: expands the role into related titles and skill queries."""
+    queries = [query] if query else []
+
+    if use_smart_search:
+        # 1. Expand based on common roles
+        if query:
+            q_lower = query.lower()
+            if "data engineer" in q_lower:
+                queries.extend(["Spark Developer", "Big Data Engineer", "ETL Developer"])
+            elif "data scientist" in q_lower:
+                queries.extend(["Machine Learning Engineer", "AI Engineer"])
+            elif "frontend" in q_lower or "react" in q_lower:
+                queries.extend(["React Developer", "UI Engineer"])
+            elif "backend" in q_lower or "python" in q_lower:
+                queries.extend(["Backend Engineer", "Django Developer"])
+            elif "full stack" in q_lower:
+                queries.extend(["Full Stack Developer", "Software Engineer"])
+            elif "java" in q_lower or "software" in q_lower:
+                queries.extend(["Java Developer", "Software Engineer", "Systems Engineer"])
+            elif "devops" in q_lower or "sre" in q_lower:
+                queries.extend(["Site Reliability Engineer", "Platform Engineer", "Cloud Engineer"])
+
+        # 2. Integrate top user skills into search
+        if skills:
+            # Add top 2 skills to queries to broaden search
+            for skill in skills[:2]:
+                if query:
+                    queries.append(f"{query} {skill}")
+                else:
+                    queries.append(f"{skill} Developer")
+
+    # Ensure we have at least something to search
+    if not queries and skills:
+        queries = [f"{skills[0]} Developer"]
+    elif not queries:
+        queries = ["Software Developer"] # Generic fallback
+    return queries
+
+
+@dataclass
+class SearchEvent:
+    """One step of a streaming search."""
+    kind: str  # 'jobs' (new scored jobs), 'progress' (a source finished a query), 'error' (it failed on one),
+               # 'enriched' (jobs re-scored with fetched descriptions) or 'done'
+    source: str = ""
+    query: str = ""
+    jobs: List[Job] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0  # seconds since the search started
+
+
+class SearchPipeline:
+    """
+    Runs the selected sources concurrently and yields SearchEvents as
+    results arrive. Each source gets one worker (and one scraper instance,
+    so Selenium drivers are reused across queries and closed at the end).
+    Sources page lazily and hand over one batch at a time; with `enough`
+    set, a source stops paging a query once it has produced that many
+    matches scoring STRONG_MATCH or more.
+    With enrich on, jobs whose title-level score clears ENRICH_SCORE get
+    their detail page fetched in the background while scraping continues;
+    they are re-scored and reported in one "enriched" event before "done".
+    """
+
+    STRONG_MATCH = 75
+    QUEUE_BATCHES_PER_SOURCE = 2
+    ENRICH_LIMIT = 20  # detail fetches per search
+    ENRICH_WAIT_SECONDS = 60  # how long "done" waits for outstanding fetches
+    PUT_POLL_SECONDS = 0.5  # how often a worker blocked on a full queue checks for cancellation
+    MAX_HOST_WAIT_SECONDS = 20  # longer governor waits fail the source with "retry in Ns"
+
+    def __init__(self, sources: List[str], matcher: BaseMatcher, profile: Profile, limit: int = 10,
+                 enough: Optional[int] = None, enrich: bool = True):
+        unknown = [s for s in sources if s not in SOURCES]
+        if unknown:
+            raise ValueError(f"Unknown sources: {unknown}")
+        self.sources = sources
+        self.matcher = matcher
+        self.profile = profile
+        self.limit = limit
+        self.enough = enough
+        self.enrich = enrich
+        self.metrics: Dict = {}
+        self._strong: Dict[tuple, int] = {}
+        self._stop = set()  # (source, query) pairs that have enough strong matches
+
+    def stream(self, queries: List[str], location: str) -> Iterator[SearchEvent]:
+        start = time.perf_counter()
+        self.metrics = {
+            "time_to_first_result": None,
+            "total_time": None,
+            "jobs": 0,
+            "duplicates": 0,
+            "stopped_early": 0,
+            "enriched": 0,
+            "failed": []
+        }
+        self._strong = {}
+        self._stop = set()
+        # Bounded hand-off: a source can run at most QUEUE_BATCHES_PER_SOURCE
+        # batches ahead of scoring, so deep pagination can't pile up in memory
+        results = queue.Queue(maxsize=self.QUEUE_BATCHES_PER_SOURCE * max(len(self.sources), 1))
+        # Set when the consumer stops early (error, or the generator is closed) so workers
+        # blocked on a full queue give up and close their scrapers
+        cancelled = threading.Event()
+        workers = [
+            threading.Thread(
+                target=self._run_source, args=(source, queries, location, results, cancelled),
+                name=f"search-{source}", daemon=True
+            )
+            for source in self.sources
+        ]
+        for w in workers:
+            w.start()
+        try:
+            yield from self._consume(results, len(workers), start)
+        finally:
+            cancelled.set()
+            while True:
+                try:
+                    results.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _consume(self, results: queue.Queue, remaining: int, start: float) -> Iterator[SearchEvent]:
+        dedup = Deduplicator()
+        enriching = []  # (job, future of its description)
+        while remaining:
+            source, q, jobs, error, finished = results.get()
+            if q is None:
+                # Sentinel: this source has finished all its queries
+                remaining -= 1
+                continue
+
+            elapsed = time.perf_counter() - start
+            if error:
+                self.metrics["failed"].append(f"{source}:{q}")
+                yield SearchEvent("error", source, q, error=error, elapsed=elapsed)
+                continue
+            if finished:
+                yield SearchEvent("progress", source, q, elapsed=elapsed)
+                continue
+
+            # Canonical-URL and near-duplicate check against everything already
+            # yielded; duplicates are merged into the earlier record, not re-scored
+            fresh = [job for job in jobs if dedup.add(job) is not None]
+            self.metrics["duplicates"] = dedup.merged
+            if not fresh:
+                continue
+
+            self._score(fresh)
+            if self.enrich:
+                budget = self.ENRICH_LIMIT - len(enriching)
+                candidates = sorted((j for j in fresh if worth_enriching(j)), key=lambda j: j.match_score or 0, reverse=True)
+                enriching.extend((j, get_fetcher().submit(j)) for j in candidates[:max(budget, 0)])
+            if self.enough:
+                key = (source, q)
+                self._strong[key] = self._strong.get(key, 0) + sum(
+                    1 for j in fresh if (j.match_score or 0) >= self.STRONG_MATCH
+                )
+                if self._strong[key] >= self.enough and key not in self._stop:
+                    self._stop.add(key)
+                    self.metrics["stopped_early"] += 1
+            elapsed = time.perf_counter() - start
+            if self.metrics["time_to_first_result"] is None:
+                self.metrics["time_to_first_result"] = elapsed
+                logger.info(f"First results after {elapsed:.2f}s from {source}")
+            self.metrics["jobs"] += len(fresh)
+            yield SearchEvent("jobs", source, q, jobs=fresh, elapsed=elapsed)
+
+        if enriching:
+            wait([f for _, f in enriching], timeout=self.ENRICH_WAIT_SECONDS)
+            enriched = apply_descriptions(enriching)
+            if enriched:
+                self._score(enriched)
+                self.metrics["enriched"] = len(enriched)
+                yield SearchEvent("enriched", jobs=enriched, elapsed=time.perf_counter() - start)
+
+        self.metrics["total_time"] = time.perf_counter() - start
+        self.metrics["outbound"] = get_governor().metrics()
+        logger.info(
+            f"Search finished in {self.metrics['total_time']:.2f}s: {self.metrics['jobs']} jobs, "
+            f"time to first result {self.metrics['time_to_first_result']}"
+        )
+        yield SearchEvent("done", elapsed=self.metrics["total_time"])
+
+    def _run_source(self, source: str, queries: List[str], location: str, results: queue.Queue,
+                    cancelled: threading.Event):
+        def put(item) -> bool:
+            # A full queue is waited on only while the consumer is still there
+            while not cancelled.is_set():
+                try:
+                    results.put(item, timeout=self.PUT_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        scraper = None
+        try:
+            scraper = get_scraper_class(source)()
+            scraper.max_wait = self.MAX_HOST_WAIT_SECONDS
+            for q in queries:
+                if cancelled.is_set():
+                    break
+                def on_batch(batch, q=q):
+                    if not put((source, q, batch, None, False)):
+                        return True
+                    return (source, q) in self._stop
+                try:
+                    scraper.cached_scrape(query=q, location=location, limit=self.limit, on_batch=on_batch)
+                    put((source, q, [], None, True))
+                except Exception as e:
+                    put((source, q, [], str(e), True))
+        except Exception as e:
+            put((source, queries[0] if queries else "", [], str(e), True))
+        finally:
+            if scraper is not None and hasattr(scraper, "close"):
+                try:
+                    scraper.close()
+                except Exception:
+                    pass
+            put((source, None, None, None, True))
+
+    def _score(self, jobs: List[Job]):
+        try:
+            for job, (score, details) in zip(jobs, self.matcher.match_batch(jobs, self.profile)):
+                job.match_score = score
+                job.keywords_matched = details.get('matched_keywords')
+        except Exception as e:
+            # Unscored jobs are still worth showing
+            logger.error(f"Matching Error: {e}")
@@ -0,0 +1,18 @@
+import threading
+from .runner import TaskRunner, TaskContext, get_task, get_latest_task, ACTIVE_STATUSES
+
+_RUNNER = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def get_runner() -> TaskRunner:
+    """Process-wide runner with the built-in task kinds registered."""
+    global _RUNNER
+    with _RUNNER_LOCK:
+        if _RUNNER is None:
+            from .handlers import run_search_task, run_apply_task, run_cleanup_task
+            _RUNNER = TaskRunner()
+            _RUNNER.register("search", run_search_task)
+            _RUNNER.register("apply", run_apply_task)
+            _RUNNER.register("cleanup", run_cleanup_task)
+        return _RUNNER
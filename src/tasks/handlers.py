@@ -0,0 +1,153 @@
+"""
+Task handlers for the background runner: search, batch apply and cleanup.
+Handlers never touch Streamlit; they report through TaskContext and return
+JSON-serializable results.
+"""
+from datetime import datetime
+from typing import List
+from .runner import TaskContext
+from ..database.models import Job, Profile
+from ..database.db import save_jobs, mark_job_applied, clean_old_jobs, update_job_enrichment, get_profile
+from ..matcher.registry import get_matcher
+from ..search import SearchPipeline
+
+
+PREVIEW_SIZE = 50  # jobs kept in persisted search snapshots
+
+
+def job_to_dict(job: Job, description: bool = True) -> dict:
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "description": job.description if description else None,
+        "url": job.url,
+        "date_posted": job.date_posted.isoformat() if job.date_posted else None,
+        "source": job.source,
+        "match_score": job.match_score,
+        "keywords_matched": job.keywords_matched
+    }
+
+
+def job_from_dict(data: dict) -> Job:
+    data = dict(data)
+    if data.get("date_posted"):
+        data["date_posted"] = datetime.fromisoformat(data["date_posted"])
+    return Job(**data)
+
+
+def _load_profile(ctx: TaskContext, payload: dict) -> Profile:
+    """
+    The profile a task runs with. Resume and phone are never persisted in
+    the task payload: they come from the submitter's in-memory ctx.private
+    (unsaved sidebar edits, guest sessions) or else the user's stored profile.
+    """
+    stored = get_profile(ctx.user_id) if payload.get("stored_profile", True) else None
+    private = ctx.private
+
+    def field(name):
+        if private.get(name) is not None:
+            return private[name]
+        return getattr(stored, name, None) if stored else None
+
+    return Profile(
+        name=payload.get("name") or (stored.name if stored else None) or "User",
+        skills=payload.get("skills") or (stored.skills if stored else None) or [],
+        resume_text=field("resume_text"),
+        resume_path=field("resume_path"),
+        phone=field("phone")
+    )
+
+
+def run_search_task(ctx: TaskContext, payload: dict) -> dict:
+    """
+    payload: queries, location, sources, limit, enough, use_semantic, save (bool),
+    plus name and skills (see _load_profile). The persisted result only ever
+    holds the top PREVIEW_SIZE jobs without descriptions (none at all, once
+    finished, for unsaved guest searches); the full list is kept in memory
+    for TaskRunner.collect().
+    """
+    profile = _load_profile(ctx, payload)
+    sources = payload.get("sources") or []
+    queries = payload.get("queries") or []
+    pipeline = SearchPipeline(sources, get_matcher(payload.get("use_semantic", True)), profile,
+                              payload.get("limit", 10), enough=payload.get("enough"))
+
+    jobs: List[Job] = []
+    log: List[str] = []
+    saved_count = 0
+    expected = max(len(sources) * len(queries), 1)
+    finished = 0
+
+    def snapshot(metrics=None, top=PREVIEW_SIZE, full=False):
+        ranked = sorted(jobs, key=lambda x: x.match_score or 0, reverse=True)[:top]
+        return {
+            "jobs": [job_to_dict(j, description=full) for j in ranked],
+            "log": log,
+            "saved": saved_count,
+            "metrics": metrics or {}
+        }
+
+    for event in pipeline.stream(queries, payload.get("location", "")):
+        if event.kind == "done":
+            break
+        if event.kind in ("error", "progress"):
+            finished += 1
+        if event.kind == "error":
+            log.append(f"{event.source} Error on '{event.query}': {event.error}")
+        elif event.kind == "jobs":
+            jobs.extend(event.jobs)
+            log.append(f"{event.source}: {len(event.jobs)} new jobs for '{event.query}' ({event.elapsed:.1f}s)")
+            if payload.get("save", True):
+                saved_count += save_jobs(event.jobs, ctx.user_id)
+        elif event.kind == "enriched":
+            # Same Job objects as in `jobs`, now with descriptions and fresh scores
+            message = f"📄 Fetched full descriptions for {len(event.jobs)} promising jobs and re-scored them"
+            if payload.get("save", True):
+                message += f" ({update_job_enrichment(ctx.user_id, event.jobs)} saved jobs updated)"
+            log.append(message + ".")
+        # Partial snapshots carry only the top of the ranking; deep searches stay cheap to poll
+        ctx.progress(finished / expected, f"{len(jobs)} jobs so far", snapshot(pipeline.metrics))
+
+    metrics = dict(pipeline.metrics)
+    if metrics.get("time_to_first_result") is not None:
+        log.append(f"⏱️ First results after {metrics['time_to_first_result']:.1f}s, search finished in {metrics['total_time']:.1f}s.")
+    if metrics.get("duplicates"):
+        log.append(f"🔗 Merged {metrics['duplicates']} duplicate postings.")
+    if metrics.get("stopped_early"):
+        log.append(f"🎯 Stopped paging {metrics['stopped_early']} source queries early after {payload.get('enough')} strong matches.")
+    ctx.keep(snapshot(metrics, top=None, full=True))
+    # Saved jobs are in the user DB already; guest results live only in memory
+    return snapshot(metrics, top=PREVIEW_SIZE if payload.get("save", True) else 0)
+
+
+def run_apply_task(ctx: TaskContext, payload: dict) -> dict:
+    """payload: jobs (list of job dicts), headless, plus name and skills (see _load_profile)."""
+    from ..application_bot import ApplicationBot
+
+    profile = _load_profile(ctx, payload)
+    jobs = [job_from_dict(j) for j in payload.get("jobs", [])]
+    applied, failed = [], []
+
+    bot = ApplicationBot(headless=payload.get("headless", False))
+    try:
+        for i, job in enumerate(jobs):
+            ctx.progress(i / max(len(jobs), 1), f"Applying to {i+1}/{len(jobs)}: {job.title} @ {job.company}...")
+            try:
+                bot.fill_application(job.url, profile)
+                # TRACKING
+                if job.id:
+                    mark_job_applied(job.id, ctx.user_id, status="applied")
+                applied.append(job.company)
+            except Exception as e:
+                failed.append(f"{job.company}: {e}")
+    finally:
+        bot.close()
+
+    return {"applied": applied, "failed": failed}
+
+
+def run_cleanup_task(ctx: TaskContext, payload: dict) -> dict:
+    deleted = clean_old_jobs(ctx.user_id, days=payload.get("days", 30))
+    return {"deleted": deleted}
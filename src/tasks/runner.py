@@ -0,0 +1,246 @@
+"""
+Local background task runner.
+Heavy work (searches, batch applies, maintenance) is submitted here instead
+of running inside the Streamlit script thread. Tasks are persisted in the
+'tasks' table of users.db, executed on a bounded thread pool, and report
+progress and partial results back to the table so the dashboard can poll
+them across reruns, tab switches and new sessions.
+Several processes can share users.db (Streamlit workers, the scheduler):
+each runner leases the tasks it starts and heartbeats the lease, and only
+tasks whose owner stopped heartbeating are marked interrupted.
+Inputs and results that must not be persisted (resumes, guest results)
+stay in the runner's memory: submit(private=...) and ctx.keep().
+"""
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from ..database.db import SessionLocal, engine
+from ..database.models import Base, Task, TaskLease
+from ..utils.logger import setup_logger
+
+logger = setup_logger("TaskRunner")
+
+ACTIVE_STATUSES = ("queued", "running")
+HEARTBEAT_SECONDS = int(os.getenv("TASK_HEARTBEAT_SECONDS", "30"))
+LEASE_SECONDS = HEARTBEAT_SECONDS * 4  # a lease not renewed for this long belongs to a dead process
+TASK_RETENTION_DAYS = int(os.getenv("TASK_RETENTION_DAYS", "7"))  # finished tasks (and their results) are kept this long
+KEPT_RESULTS = 32  # in-memory results (ctx.keep) held for collect(), oldest dropped first
+
+
+class TaskContext:
+    """Handed to task handlers so they can report progress while running."""
+
+    def __init__(self, task_id: int, user_id: int, private: dict = None):
+        self.task_id = task_id
+        self.user_id = user_id
+        self.private = private or {}  # submit(private=...): in memory only, never persisted
+        self.kept = None
+
+    def keep(self, result: dict):
+        """Holds a full result in this process for TaskRunner.collect(), never persisted."""
+        self.kept = result
+
+    def progress(self, fraction: float = None, message: str = None, result: dict = None):
+        """Persists progress, a status message and/or partial results."""
+        fields = {}
+        if fraction is not None:
+            fields["progress"] = max(0.0, min(1.0, fraction))
+        if message is not None:
+            fields["message"] = message[:500]
+        if result is not None:
+            fields["result"] = result
+        _update_task(self.task_id, **fields)
+
+
+class TaskRunner:
+    """
+    Runs registered task kinds on a thread pool.
+    TASK_WORKERS caps concurrent heavy work on this node; each user may have
+    at most one active task per kind.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or int(os.getenv("TASK_WORKERS", "2"))
+        self.runner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task")
+        self._handlers: Dict[str, Callable] = {}
+        self._private: Dict[int, dict] = {}
+        self._kept: "OrderedDict[int, dict]" = OrderedDict()
+        self._kept_lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        Base.metadata.create_all(bind=engine, tables=[Task.__table__, TaskLease.__table__])
+        self._recover()
+        threading.Thread(target=self._heartbeat_loop, name="task-heartbeat", daemon=True).start()
+
+    def register(self, kind: str, handler: Callable[[TaskContext, dict], Optional[dict]]):
+        """handler(ctx, payload) -> result dict. Raise to fail the task."""
+        self._handlers[kind] = handler
+
+    def submit(self, user_id: int, kind: str, payload: dict = None, private: dict = None) -> int:
+        """
+        Queues a task and returns its id. If the user already has an active
+        task of this kind, returns that task's id instead of starting another.
+        payload is stored with the task; private (resume text, phone, ...)
+        is only held in memory and handed to the handler as ctx.private.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for task kind '{kind}'")
+
+        with self._submit_lock:
+            session = SessionLocal()
+            try:
+                active = session.query(Task).filter(
+                    Task.user_id == user_id, Task.kind == kind, Task.status.in_(ACTIVE_STATUSES)
+                ).first()
+                if active:
+                    return active.id
+                task = Task(user_id=user_id, kind=kind, status="queued", payload=payload or {})
+                session.add(task)
+                session.flush()
+                session.add(TaskLease(task_id=task.id, runner_id=self.runner_id, heartbeat_at=datetime.utcnow()))
+                session.commit()
+                task_id = task.id
+            finally:
+                session.close()
+
+        if private:
+            self._private[task_id] = private
+        self._executor.submit(self._run, task_id)
+        return task_id
+
+    def _run(self, task_id: int):
+        task = get_task(task_id)
+        if not task:
+            return
+        _update_task(task_id, status="running", started_at=datetime.utcnow())
+        ctx = TaskContext(task_id, task["user_id"], self._private.pop(task_id, None))
+        try:
+            result = self._handlers[task["kind"]](ctx, task["payload"] or {})
+            fields = {"status": "done", "progress": 1.0, "finished_at": datetime.utcnow()}
+            if result is not None:
+                fields["result"] = result
+            if ctx.kept is not None:
+                with self._kept_lock:
+                    self._kept[task_id] = ctx.kept
+                    while len(self._kept) > KEPT_RESULTS:
+                        self._kept.popitem(last=False)
+            _update_task(task_id, **fields)
+        except Exception as e:
+            logger.error(f"Task {task_id} ({task['kind']}) failed: {e}\n{traceback.format_exc()}")
+            _update_task(task_id, status="failed", error=str(e), finished_at=datetime.utcnow())
+        finally:
+            _release_lease(task_id)
+
+    def collect(self, task_id: int) -> Optional[dict]:
+        """The result a finished task kept in memory (ctx.keep), once; None if there is none."""
+        with self._kept_lock:
+            return self._kept.pop(task_id, None)
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            session = SessionLocal()
+            try:
+                session.query(TaskLease).filter(TaskLease.runner_id == self.runner_id).update(
+                    {"heartbeat_at": datetime.utcnow()}, synchronize_session=False
+                )
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.warning(f"Task heartbeat failed: {e}")
+            finally:
+                session.close()
+            self._recover()
+
+    def _recover(self):
+        """
+        Marks active tasks whose owning runner stopped heartbeating (a
+        crashed or restarted process) as interrupted; they will never finish.
+        Tasks of live runners, in this process or others, are left alone.
+        Also drops finished tasks older than TASK_RETENTION_DAYS.
+        """
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=LEASE_SECONDS)
+        session = SessionLocal()
+        try:
+            live = session.query(TaskLease.task_id).filter(TaskLease.heartbeat_at >= stale)
+            session.query(Task).filter(
+                Task.status.in_(ACTIVE_STATUSES), Task.created_at < stale, Task.id.not_in(live)
+            ).update({"status": "interrupted", "finished_at": now}, synchronize_session=False)
+            session.query(TaskLease).filter(TaskLease.heartbeat_at < stale).delete(synchronize_session=False)
+            session.query(Task).filter(
+                Task.status.not_in(ACTIVE_STATUSES), Task.finished_at < now - timedelta(days=TASK_RETENTION_DAYS)
+            ).delete(synchronize_session=False)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Task recovery skipped: {e}")
+        finally:
+            session.close()
+
+
+def get_task(task_id: int) -> Optional[dict]:
+    """Returns a plain-dict snapshot of a task, or None."""
+    session = SessionLocal()
+    try:
+        task = session.get(Task, task_id)
+        return _to_dict(task) if task else None
+    finally:
+        session.close()
+
+
+def get_latest_task(user_id: int, kind: str) -> Optional[dict]:
+    session = SessionLocal()
+    try:
+        task = session.query(Task).filter_by(user_id=user_id, kind=kind).order_by(Task.id.desc()).first()
+        return _to_dict(task) if task else None
+    finally:
+        session.close()
+
+
+def _update_task(task_id: int, **fields):
+    session = SessionLocal()
+    try:
+        session.query(Task).filter_by(id=task_id).update(fields, synchronize_session=False)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Task {task_id} update failed: {e}")
+    finally:
+        session.close()
+
+
+def _release_lease(task_id: int):
+    session = SessionLocal()
+    try:
+        session.query(TaskLease).filter_by(task_id=task_id).delete(synchronize_session=False)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Task {task_id} lease release failed: {e}")
+    finally:
+        session.close()
+
+
+def _to_dict(task: Task) -> dict:
+    return {
+        "id": task.id,
+        "user_id": task.user_id,
+        "kind": task.kind,
+        "status": task.status,
+        "progress": task.progress or 0.0,
+        "message": task.message,
+        "payload": task.payload,
+        "result": task.result,
+        "error": task.error,
+        "created_at": task.created_at,
+        "started_at": task.started_at,
+        "finished_at": task.finished_at
+    }
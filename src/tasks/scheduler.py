@@ -0,0 +1,245 @@
+"""
+Headless scheduler for saved searches.
+Runs every due saved search for every user with the same scraper and
+matcher stack as the dashboard, without anyone having the dashboard open.
+
+Per pass:
+  1. Load due saved searches and expand each into (source, query, location) keys.
+  2. Deduplicate keys across users, so overlapping queries are scraped once.
+  3. Reserve per-source budget for each search's new keys; searches that
+     don't fit stay due and run on a later pass.
+  4. Scrape the reserved keys, one worker pool per source, each up to the
+     largest limit among the searches that need it.
+  5. Score and save results per user, then reschedule the searches.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple
+from ..database.models import Job, Profile
+from ..database.db import (
+    get_due_saved_searches, mark_saved_searches_run, save_jobs, get_profile,
+    get_user_by_id, get_existing_urls
+)
+from ..matcher.registry import get_matcher
+from ..notification.email_service import EmailService
+from ..scraper import get_scraper_class
+from ..scraper.governor import get_governor
+from ..search import SOURCES, expand_queries
+from ..search.enrichment import enrich_and_rescore, worth_enriching
+from ..utils.dedup import Deduplicator
+from ..utils.logger import setup_logger
+
+logger = setup_logger("SearchScheduler")
+
+# Max scrapes per source per rolling hour
+SOURCE_BUDGETS = {
+    "linkedin": 30,
+    "naukri": 30,
+    "instahyre": 300,
+    "arbeitnow": 120,
+    "hn": 120,
+    "ats": 120,
+    "mock": 100000,
+}
+DEFAULT_BUDGET = 60
+# Workers per source; Selenium sources get one browser each
+SOURCE_CONCURRENCY = {
+    "linkedin": 1,
+    "naukri": 1,
+    "ats": 1,  # each watchlist crawl is already concurrent
+}
+DEFAULT_CONCURRENCY = 4
+# Scoring/saving is per user DB, so deliveries can run side by side
+DELIVERY_WORKERS = 4
+ALERT_THRESHOLD = 75
+# Detail pages fetched per saved search run, for jobs whose title already looks promising
+ENRICH_LIMIT = 10
+ENRICH_TIMEOUT_SECONDS = 60
+
+ScrapeKey = Tuple[str, str, str]  # (source, query, location)
+
+
+class SourceBudget:
+    """Sliding one-hour window of scrapes per source."""
+
+    WINDOW_SECONDS = 3600
+
+    def __init__(self, budgets: Dict[str, int]):
+        self.budgets = budgets
+        self._events = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def try_reserve(self, needed: Dict[str, int]) -> bool:
+        """Atomically reserves needed[source] scrapes for every source, or none."""
+        now = time.monotonic()
+        with self._lock:
+            for source, count in needed.items():
+                events = self._events[source]
+                while events and now - events[0] > self.WINDOW_SECONDS:
+                    events.popleft()
+                if len(events) + count > self.budgets.get(source, DEFAULT_BUDGET):
+                    return False
+            for source, count in needed.items():
+                self._events[source].extend([now] * count)
+            return True
+
+
+class SearchScheduler:
+    def __init__(self, budgets: Dict[str, int] = None, notifier: EmailService = None):
+        self.budget = SourceBudget(budgets or SOURCE_BUDGETS)
+        self.notifier = notifier or EmailService()
+
+    def run_due(self, now: datetime = None) -> dict:
+        """Runs one scheduler pass. Returns stats for logging."""
+        start = time.perf_counter()
+        now = now or datetime.utcnow()
+        due = get_due_saved_searches(now)
+        if not due:
+            return {"due": 0, "ran": 0, "deferred": 0, "scrapes": 0, "saved": 0}
+
+        profiles = {}
+        plans = []  # (search, keys)
+        reserved: Dict[ScrapeKey, int] = {}  # key -> largest limit among the plans sharing it
+        deferred = 0
+        for search in due:
+            if search.user_id not in profiles:
+                profiles[search.user_id] = get_profile(search.user_id)
+            profile = profiles[search.user_id]
+            skills = (profile.skills or []) if profile else []
+            queries = expand_queries(search.query, skills, search.use_smart_search)
+            keys = [(src, q, search.location or "") for src in (search.sources or []) if src in SOURCES for q in queries]
+
+            # Only keys nobody else in this pass already needs cost budget
+            needed = defaultdict(int)
+            for key in set(keys) - reserved.keys():
+                needed[key[0]] += 1
+            if not self.budget.try_reserve(needed):
+                deferred += 1
+                continue
+            for key in keys:
+                reserved[key] = max(reserved.get(key, 0), search.limit or 10)
+            plans.append((search, keys))
+
+        results = self._scrape_all(reserved)
+
+        # One user's searches run in sequence (they write to the same DB);
+        # different users run side by side
+        by_user = defaultdict(list)
+        for plan in plans:
+            by_user[plan[0].user_id].append(plan)
+
+        def deliver(user_plans):
+            saved = 0
+            for search, keys in user_plans:
+                try:
+                    saved += self._deliver(search, keys, results, profiles.get(search.user_id))
+                except Exception as e:
+                    logger.error(f"Saved search {search.id} (user {search.user_id}) failed: {e}")
+            return saved
+
+        with ThreadPoolExecutor(max_workers=DELIVERY_WORKERS, thread_name_prefix="deliver") as pool:
+            saved_total = sum(pool.map(deliver, by_user.values()))
+
+        mark_saved_searches_run([s for s, _ in plans], now)
+        stats = {
+            "due": len(due),
+            "ran": len(plans),
+            "deferred": deferred,
+            "scrapes": len(reserved),
+            "saved": saved_total,
+            "seconds": round(time.perf_counter() - start, 2)
+        }
+        logger.info(f"Scheduler pass: {stats}")
+        logger.info(f"Outbound: {get_governor().metrics()}")
+        return stats
+
+    def run_forever(self, tick_seconds: int = 60):
+        logger.info(f"Scheduler started (tick={tick_seconds}s)")
+        while True:
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.error(f"Scheduler pass crashed: {e}")
+            time.sleep(tick_seconds)
+
+    def _scrape_all(self, limits: Dict[ScrapeKey, int]) -> Dict[ScrapeKey, list]:
+        """Scrapes each unique key once, up to its limit. Each worker reuses one scraper instance."""
+        by_source = defaultdict(list)
+        for key in limits:
+            by_source[key[0]].append(key)
+
+        results: Dict[ScrapeKey, list] = {}
+        lock = threading.Lock()
+
+        def worker(source, chunk):
+            scraper = get_scraper_class(source)()
+            try:
+                for key in chunk:
+                    try:
+                        jobs = scraper.cached_scrape(query=key[1], location=key[2], limit=limits[key])
+                    except Exception as e:
+                        logger.error(f"{source} failed on '{key[1]}': {e}")
+                        jobs = []
+                    with lock:
+                        results[key] = jobs
+            finally:
+                if hasattr(scraper, "close"):
+                    try:
+                        scraper.close()
+                    except Exception:
+                        pass
+
+        tasks = []
+        for source, source_keys in by_source.items():
+            n = min(SOURCE_CONCURRENCY.get(source, DEFAULT_CONCURRENCY), len(source_keys))
+            for i in range(n):
+                tasks.append((source, source_keys[i::n]))
+
+        if tasks:
+            with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="sched") as pool:
+                list(pool.map(lambda t: worker(*t), tasks))
+        return results
+
+    def _deliver(self, search, keys: List[ScrapeKey], results, profile) -> int:
+        """Scores one saved search's results for its user and saves them."""
+        # De-duplicate across sources. Copies, because several users may share a key.
+        dedup = Deduplicator()
+        for key in keys:
+            for job in results.get(key, []):
+                dedup.add(_copy_job(job))
+        jobs = list(dedup.by_url.values())[: (search.limit or 10) * max(len(search.sources or []), 1)]
+        # Only postings this user doesn't have yet need scoring and saving
+        existing = get_existing_urls(search.user_id, [j.url for j in jobs])
+        jobs = [j for j in jobs if j.url not in existing]
+        if not jobs:
+            return 0
+
+        if profile and (profile.skills or profile.resume_text):
+            scoring_profile = Profile(skills=profile.skills or [], resume_text=profile.resume_text)
+            matcher = get_matcher(search.use_semantic)
+            for job, (score, details) in zip(jobs, matcher.match_batch(jobs, scoring_profile)):
+                job.match_score = score
+                job.keywords_matched = details.get('matched_keywords')
+            candidates = sorted((j for j in jobs if worth_enriching(j)), key=lambda j: j.match_score or 0, reverse=True)
+            enrich_and_rescore(candidates[:ENRICH_LIMIT], matcher, scoring_profile, timeout=ENRICH_TIMEOUT_SECONDS)
+
+        saved = save_jobs(jobs, search.user_id)
+
+        if search.notify:
+            high = [j for j in jobs if (j.match_score or 0) >= ALERT_THRESHOLD]
+            user = get_user_by_id(search.user_id)
+            if high and user:
+                high.sort(key=lambda x: x.match_score or 0, reverse=True)
+                self.notifier.send_matches_alert(user.email, high[:5])
+        return saved
+
+
+def _copy_job(job: Job) -> Job:
+    return Job(
+        title=job.title, company=job.company, location=job.location,
+        description=job.description, url=job.url, date_posted=job.date_posted,
+        source=job.source
+    )
@@ -54,20 +54,9 @@ def fix_ssl_paths():
 fix_ssl_paths()
 
 import streamlit as st
-import pandas as pd
 from datetime import datetime
-from src.scraper.mock_scraper import MockScraper
-from src.scraper.hn_scraper import HNScraper
-from src.scraper.instahyre_scraper import InstahyreScraper
-from src.scraper.generic_scraper import GenericScraper
-from src.scraper.arbeitnow_scraper import ArbeitnowScraper
-from src.matcher.simple_matcher import KeywordMatcher
 from src.utils.notifier import Notifier
-from src.matcher.semantic_matcher import SemanticMatcher
-from src.utils.resume_parser import ResumeParser
 # ApplicationBot import moved inside function to prevent early import errors if selenium issues exist
-from src.scraper.naukri_scraper import NaukriScraper
-from src.scraper.linkedin_scraper import LinkedInScraper
 from src.database.models import Job, Profile
 
 # BUILD INFORMATION (for troubleshooting updates)
@@ -173,15 +162,56 @@ st.markdown("""
 from src.auth import OAuthHandler
 from src.ui.login_page import show_login_page  
 from src.utils.rate_limiter import RateLimiter, init_rate_limiter_table
-from src.database.db import save_jobs, get_saved_jobs, mark_job_applied, init_db, delete_job, reset_db, get_or_create_user
-
-def main():
-    # Ensure DB tables exist on startup
+from src.database.db import mark_job_applied, init_db, delete_job, reset_db, get_or_create_user, get_profile, save_profile, create_saved_search, get_saved_searches, delete_saved_search, update_job_enrichment, get_analytics, get_trends, count_saved_jobs, get_job_locations, get_saved_jobs_page, get_saved_job_rows, data_version
+from src.search import expand_queries
+from src.search.enrichment import enrich_and_rescore, worth_enriching
+from src.matcher.registry import get_matcher, matcher_name
+from src.matcher.rescorer import is_profile_stale, profile_fingerprint, start_background_rescore, get_rescore_progress
+from src.tasks import get_runner, get_task, get_latest_task, ACTIVE_STATUSES
+from src.tasks.handlers import job_to_dict, job_from_dict
+
+# ===== RERUN CACHING =====
+# Streamlit reruns main() on every interaction; per-user reads are memoized
+# on db.data_version(), which changes on every write to the user's DB, so
+# warm reruns hit the cache and any save/apply/delete/cleanup invalidates it.
+
+USER_QUERIES = {
+    "count": count_saved_jobs,
+    "locations": get_job_locations,
+    "page": get_saved_jobs_page,
+    "rows": get_saved_job_rows,
+    "analytics": get_analytics,
+    "trends": get_trends,
+}
+
+@st.cache_resource(show_spinner=False)
+def init_storage():
+    """Creates DB tables once per server process, not on every rerun."""
     try:
         init_db()
         init_rate_limiter_table()
     except Exception as e:
         print(f"DB Init Warning: {e}")
+
+@st.cache_data(max_entries=512, ttl=3600, show_spinner=False)
+def _cached_user_query(name, user_id, version, args):
+    return USER_QUERIES[name](user_id, *args)
+
+def user_query(name, user_id, *args):
+    """USER_QUERIES[name](user_id, *args), cached until the user's data next changes."""
+    return _cached_user_query(name, user_id, data_version(user_id), args)
+
+def session_memo(key, token, compute):
+    """compute(), reused across reruns while token is unchanged (for session-only data such as guest results)."""
+    memo = st.session_state.get(f"memo_{key}")
+    if memo is None or memo[0] != token:
+        memo = (token, compute())
+        st.session_state[f"memo_{key}"] = memo
+    return memo[1]
+
+def main():
+    # Ensure DB tables exist on startup
+    init_storage()
     
     # === AUTHENTICATION GATE ===
     # Set dev mode in session state if ENV is dev
@@ -235,30 +265,49 @@ def main():
         
         st.divider()
         
+        # Stored profile pre-fills the form once per session
+        if 'stored_profile' not in st.session_state:
+            st.session_state.stored_profile = None if st.session_state.get('is_guest', False) else get_profile(user_id)
+        stored_profile = st.session_state.stored_profile
+
         with st.expander("👤 Profile & Resume", expanded=False):
-            name = st.text_input("Name", "Devesh Singh")
-            phone = st.text_input("Mobile Number", "9876543210")
+            name = st.text_input("Name", stored_profile.name if stored_profile else "Devesh Singh")
+            phone = st.text_input("Mobile Number", (stored_profile.phone if stored_profile else None) or "9876543210")
             
             uploaded_file = st.file_uploader("Upload Resume (PDF)", type="pdf")
-            resume_text = ""
-            resume_path = None
+            # Without a new upload, the resume stored on the profile is used
+            resume_text = (stored_profile.resume_text if stored_profile else None) or ""
+            resume_path = stored_profile.resume_path if stored_profile else None
+            if resume_path and not os.path.exists(resume_path):
+                resume_path = None
+            if resume_text and not uploaded_file:
+                st.caption("📄 Using the resume saved on your profile.")
             
             if uploaded_file:
                 try:
-                    os.makedirs("temp", exist_ok=True)
-                    resume_path = os.path.abspath(os.path.join("temp", uploaded_file.name))
-                    with open(resume_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-                    
-                    parser = ResumeParser()
-                    data = parser.parse_file(uploaded_file)
-                    resume_text = data.get("text", "")
+                    # Parsed once per file content (cached by SHA-256); reruns are a lookup
+                    from src.utils.resume_parser import parse_resume_bytes, store_resume
+                    pdf_bytes = uploaded_file.getvalue()
+                    digest, data = parse_resume_bytes(pdf_bytes)
+                    if data.get("error"):
+                        st.error(f"Resume Error: {data['error']}")
+                    else:
+                        resume_text = data.get("text", "")
+                        resume_path = store_resume(pdf_bytes, uploaded_file.name, digest)
                     skills_from_resume = data.get("skills", [])
                     st.caption(f"✅ Parsed {len(skills_from_resume)} skills from PDF.")
+
+                    # A new resume is stored on the profile once; its skills fill in an empty skill list
+                    if resume_text and not st.session_state.get('is_guest', False) and (
+                            stored_profile is None or stored_profile.resume_text != resume_text
+                            or stored_profile.resume_path != resume_path):
+                        profile_skills = (stored_profile.skills if stored_profile else None) or skills_from_resume
+                        save_profile(user_id, name, profile_skills, resume_text, resume_path, phone, user_info['email'])
+                        st.session_state.stored_profile = stored_profile = get_profile(user_id)
                 except Exception as e:
                     st.error(f"Resume Error: {e}")
 
-            default_skills = ""
+            default_skills = ", ".join(stored_profile.skills or []) if stored_profile else ""
             skills_input = st.text_area("Skills (comma separated)", default_skills, placeholder="e.g. Java, Spring Boot, SQL")
             skills = [s.strip() for s in skills_input.split(",") if s.strip()]
 
@@ -270,7 +319,9 @@ def main():
         if not location:
             st.warning("⚠️ Please enter a location (e.g., 'Remote', 'India')")
             
-        search_limit = st.slider("Jobs per Source", 5, 30, 10)
+        search_limit = st.slider("Jobs per Source", 5, 300, 10, step=5)
+        enough = st.number_input("Stop paging after N strong matches (0 = off)", 0, 100, 0,
+                                 help="Sources stop loading further pages of a query once this many 75%+ matches are found.")
         use_smart_search = st.checkbox("Smart Search (AI Query Expansion)", value=True)
         
         st.subheader("Sources")
@@ -278,12 +329,32 @@ def main():
         use_arbeitnow = st.checkbox("Arbeitnow (Remote)", value=True)
         use_naukri = st.checkbox("Naukri (Beta)", value=True)
         use_linkedin = st.checkbox("LinkedIn (Beta - Limited)", value=True)
+        use_ats = st.checkbox("Company Boards (ATS Watchlist)", value=False,
+                              help="Greenhouse/Lever boards listed in the ATS watchlist file.")
         use_mock = st.checkbox("Mock Data (Testing)", value=False)
         use_hn = False 
         
         st.divider()
         st.subheader("🧠 Intelligence")
         use_semantic = st.toggle("Semantic Matching (AI)", value=True)
+
+        # Keep stored match scores in sync with the current profile
+        if not st.session_state.get('is_guest', False):
+            current_profile = Profile(name=name, skills=skills, resume_text=resume_text or None, phone=phone)
+            progress = get_rescore_progress(user_id)
+            # Only re-check the stored fingerprint when the profile or the user's data changed
+            checked = (profile_fingerprint(current_profile, matcher_name(use_semantic)), data_version(user_id))
+            try:
+                if not (progress and progress['running']) and st.session_state.get('rescore_checked') != checked:
+                    if is_profile_stale(user_id, current_profile, matcher_name(use_semantic)):
+                        save_profile(user_id, name, skills, current_profile.resume_text, resume_path, phone, user_info['email'])
+                        start_background_rescore(user_id, current_profile, get_matcher(use_semantic))
+                        progress = get_rescore_progress(user_id)
+                    st.session_state['rescore_checked'] = checked
+            except Exception as e:
+                print(f"Rescore Warning: {e}")
+            if progress and progress['running']:
+                st.caption(f"♻️ Re-scoring saved jobs for your updated profile... ({progress['done']} done)")
         
         st.divider()
         with st.expander("🔔 Email Alerts", expanded=False):
@@ -300,16 +371,36 @@ def main():
 
         st.divider()
         if st.button("🚀 Find Jobs", type="primary"):
-            # Rate limit check
-            can_search, msg = limiter.can_search()
+            # Rate limit check (checks and records in one step)
+            can_search, msg = limiter.try_search()
             if not can_search:
                 st.error(msg)
             else:
-                limiter.record_search()
-                run_search(query, location, skills, resume_text, resume_path, phone, use_mock, 
-                           use_instahyre, use_hn, use_semantic, use_naukri, 
-                           use_linkedin, use_smart_search, use_arbeitnow,
-                           email_enabled, email_user, email_pass, user_id, search_limit)
+                run_search(query, location, skills, resume_text, resume_path, phone, use_mock,
+                           use_instahyre, use_hn, use_semantic, use_naukri,
+                           use_linkedin, use_smart_search, use_arbeitnow, user_id, search_limit, enough, use_ats)
+
+        if not st.session_state.get('is_guest', False):
+            with st.expander("⏰ Scheduled Searches", expanded=False):
+                st.caption("Saved searches run in the background (main_workflow.py --schedule) and land in your History.")
+                interval_hours = st.selectbox("Run every", [1, 3, 6, 12, 24], index=2, format_func=lambda h: f"{h}h")
+                if st.button("💾 Save Current Search"):
+                    sources = [key for key, enabled in [
+                        ("mock", use_mock), ("instahyre", use_instahyre), ("arbeitnow", use_arbeitnow),
+                        ("naukri", use_naukri), ("linkedin", use_linkedin), ("hn", use_hn), ("ats", use_ats)
+                    ] if enabled]
+                    create_saved_search(user_id, query or "Software Developer", query or "Software Developer", location,
+                                        sources, search_limit, interval_hours * 60, use_smart_search, use_semantic,
+                                        notify=email_enabled)
+                    st.toast("✅ Search scheduled!")
+                for saved_search in get_saved_searches(user_id):
+                    col_s, col_d = st.columns([4, 1])
+                    with col_s:
+                        st.caption(f"**{saved_search.query}** @ {saved_search.location} · every {saved_search.interval_minutes // 60}h")
+                    with col_d:
+                        if st.button("🗑️", key=f"del_search_{saved_search.id}"):
+                            delete_saved_search(saved_search.id, user_id)
+                            st.rerun()
 
         st.divider()
         
@@ -336,6 +427,16 @@ def main():
     # --- TAB 1: SEARCH ---
     with tab_search:
         st.info("Configure your profile on the left and click 'Find Relevant Jobs'.")
+
+        # Re-attach to a search still running from an earlier session (checked once per session)
+        if 'search_task_id' not in st.session_state and not st.session_state.get('search_task_checked'):
+            st.session_state['search_task_checked'] = True
+            latest = get_latest_task(user_id, "search")
+            if latest and latest['status'] in ACTIVE_STATUSES:
+                st.session_state['search_task_id'] = latest['id']
+
+        if st.session_state.get('search_task_id'):
+            search_task_panel(email_enabled, email_user, email_pass)
         
         # DEBUG LOG DISPLAY
         if 'search_log' in st.session_state:
@@ -353,8 +454,18 @@ def main():
             # Batch Actions
             if st.button(f"⚡ Auto-Apply to Top 5 Matches"):
                 run_batch_apply(results[:5], name, skills, resume_text, resume_path, phone, user_id)
-
-            for job in results:
+            if st.session_state.get('apply_task_id'):
+                task_status_panel('apply_task_id', "Batch Application")
+
+            view = st.radio("View", ["Cards", "Table"], horizontal=True, key="results_view")
+            page_sizes = TABLE_PAGE_SIZES if view == "Table" else CARD_PAGE_SIZES
+            offset, limit = pager(f"results_{view}", len(results), page_sizes, reset_on=id(results))
+            page = results[offset:offset + limit]
+            if view == "Table":
+                render_job_table([job_row(j) for j in page])
+                page = []
+
+            for job in page:
                 # Card UI
                 with st.container():
                     col1, col2 = st.columns([3, 1])
@@ -364,6 +475,10 @@ def main():
                         if job.date_posted: tags += f" | {job.date_posted.strftime('%Y-%m-%d')}"
                         st.caption(tags)
                         st.write(job.description[:300] + "..." if job.description else "No description available.")
+                        if worth_enriching(job, min_score=0):
+                            if st.button("📄 Load Full Description", key=f"desc_{job.url}"):
+                                load_full_description(job, skills, resume_text, use_semantic, user_id)
+                                st.rerun()
                         
                     with col2:
                         # Show Match Score if available
@@ -391,34 +506,27 @@ def main():
                 st.info("⚡ **Guest Mode:** Search for jobs to see them here. Data won't persist after browser close.")
                 return
             st.caption("⚡ Showing session data only (not saved to database)")
+            stored = len(saved)
+            unique_locs = sorted(set(j.location for j in saved if j.location))
         else:
-            # Logged in: query database
-            saved = get_saved_jobs(user_id)
+            # Logged in: only the current page is loaded; counts and filters run in SQL
+            saved = None
+            stored = user_query("count", user_id)
+            unique_locs = user_query("locations", user_id)
         
         # Controls Row (after we have data)
         col_sort, col_filter, col_refresh = st.columns([2, 2, 1])
         
-        # Extract unique locations for filter
-        unique_locs = sorted(list(set([j.location for j in saved if j.location])))
-        
         with col_filter:
             filter_loc = st.multiselect("Filter by Location:", unique_locs, default=[])
+            view = st.radio("View", ["Cards", "Table"], horizontal=True, key="history_view")
             
         with col_sort:
-            sort_option = st.selectbox(
-                "Sort Applications By:",
-                ["Date Posted (Newest First)", "Date Posted (Oldest First)", "Match Score (Highest First)", "Match Score (Lowest First)"]
-            )
+            sort_option = st.selectbox("Sort Applications By:", list(HISTORY_SORTS))
             
-            # Export
-            if saved:
-                export_df = pd.DataFrame([{
-                    "Title": j.title, "Company": j.company, "Location": j.location, 
-                    "Date Posted": j.date_posted, "Source": j.source, "URL": j.url, 
-                    "Match Score": j.match_score, "Applied": "Yes" if j.applications else "No"
-                } for j in saved])
-                csv = export_df.to_csv(index=False).encode('utf-8')
-                st.download_button("📥 Export CSV", csv, "job_history.csv", "text/csv")
+            # Export: the file is only generated on click, streamed from the DB in chunks
+            if stored:
+                export_panel(saved if is_guest else None, user_id)
             
         with col_refresh:
             st.write("") 
@@ -430,13 +538,9 @@ def main():
         with st.expander("🧹 Maintenance & Retention", expanded=False):
             st.markdown("Remove jobs older than 30 days (keeping those you applied to).")
             if st.button("Run Cleanup Task"):
-                try:
-                    from src.database.db import clean_old_jobs
-                    deleted = clean_old_jobs(user_id, days=30)
-                    st.success(f"Cleanup Complete! Removed {deleted} old jobs.")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Cleanup Failed: {e}")
+                st.session_state['cleanup_task_id'] = get_runner().submit(user_id, "cleanup", {"days": 30})
+            if st.session_state.get('cleanup_task_id'):
+                task_status_panel('cleanup_task_id', "Cleanup")
             
             st.divider()
             st.markdown("**Danger Zone**")
@@ -447,24 +551,34 @@ def main():
                 else:
                     st.error("Failed to reset database.")
 
-        # Apply Filters
-        if filter_loc:
-            saved = [j for j in saved if j.location in filter_loc]
-            
-        # Apply Sorting
-        if "Date Posted (Newest" in sort_option:
-            saved.sort(key=lambda x: x.date_posted or datetime.min, reverse=True)
-        elif "Date Posted (Oldest" in sort_option:
-            saved.sort(key=lambda x: x.date_posted or datetime.min, reverse=False)
-        elif "Match Score (Highest" in sort_option:
-            saved.sort(key=lambda x: x.match_score or 0, reverse=True)
-        elif "Match Score (Lowest" in sort_option:
-            saved.sort(key=lambda x: x.match_score or 0, reverse=False)
-
-        st.write(f"Showing {len(saved)} Jobs")
+        # Filter, sort and page: in SQL when logged in, over the session list for guests
+        sort_key = HISTORY_SORTS[sort_option]
+        page_sizes = TABLE_PAGE_SIZES if view == "Table" else CARD_PAGE_SIZES
+        if is_guest:
+            if filter_loc:
+                saved = [j for j in saved if j.location in filter_loc]
+            saved = sort_jobs(saved, sort_key)
+            total = len(saved)
+        else:
+            total = user_query("count", user_id, filter_loc) if filter_loc else stored
+
+        st.write(f"Showing {total} Jobs")
+        offset, limit = pager(f"history_{view}", total, page_sizes, reset_on=(tuple(filter_loc), sort_key))
+
+        if view == "Table":
+            if is_guest:
+                rows = [job_row(j) for j in saved[offset:offset + limit]]
+            else:
+                rows = user_query("rows", user_id, offset, limit, sort_key, filter_loc)
+            render_job_table(rows)
+            page = []
+        elif is_guest:
+            page = saved[offset:offset + limit]
+        else:
+            page = user_query("page", user_id, offset, limit, sort_key, filter_loc)
         
-        # Display as cards
-        for job in saved:
+        # Display as cards (widget keys come from job ids, so they are stable across pages)
+        for job in page:
             is_applied = len(job.applications) > 0
             
             with st.container():
@@ -513,7 +627,7 @@ def main():
                         c1, c2, c3 = st.columns([1, 1, 0.5])
                         with c1:
                             if st.button("🤖 Auto Apply", key=f"auto_{job_key}"):
-                                run_single_apply(job, name, skills, resume_text)
+                                run_single_apply(job, name, skills, resume_text, resume_path, phone, user_id)
                                 st.rerun()
                         with c2:
                             if st.button("✅ Mark Done", key=f"manual_{job_key}", help="Mark as applied manually"):
@@ -534,6 +648,8 @@ def main():
     # --- TAB 3: ACTIONABLE INSIGHTS ---
     with tab_analytics:
         st.markdown("### 🧠 Smart Insights & Gaps")
+        import pandas as pd
+        from src.utils.analytics import aggregate_jobs, aggregate_trends, skill_gaps, RISING_WINDOW
         
         # For guest users, use session data
         is_guest = st.session_state.get('is_guest', False)
@@ -543,18 +659,21 @@ def main():
                 st.info("⚡ **Guest Mode:** Run a search to see analytics. Data won't persist.")
                 return
             st.caption("⚡ Analyzing current session data only")
+            token = (id(saved), len(saved))
+            analytics = session_memo("analytics", token, lambda: aggregate_jobs(saved))
+            load_trends = lambda weeks, terms: session_memo("trends", (token, weeks, terms), lambda: aggregate_trends(saved, weeks, terms))
         else:
-            saved = get_saved_jobs(user_id)
+            # Precomputed per-user counters, maintained as jobs are saved and deleted
+            analytics = user_query("analytics", user_id)
+            load_trends = lambda weeks, terms: user_query("trends", user_id, weeks, terms)
         
-        if not saved:
+        if not analytics["jobs"]:
             st.info("No data yet. Run some searches to generate insights!")
         else:
-            from src.utils.analytics import analyze_skill_gaps, get_top_companies, get_market_skills
-            
             # 1. MARKET DEMAND
             st.subheader("🔥 Market Demand: Top Skills")
             st.caption("What are companies asking for right now based on your search?")
-            market_skills = get_market_skills(saved)
+            market_skills = analytics["keywords"][:10]
             if market_skills:
                 skill_df = pd.DataFrame(market_skills, columns=["Skill", "Mentions"])
                 skill_df.set_index("Skill", inplace=True)
@@ -562,10 +681,42 @@ def main():
             
             st.divider()
 
-            # 2. GAP ANALYSIS
+            # 2. TRENDS (weekly rollups, bucketed by posting date)
+            st.subheader("📈 Market Trends")
+            t1, t2 = st.columns([1, 3])
+            with t1:
+                weeks = st.select_slider("Window (weeks)", options=[4, 8, 12, 26, 52], value=12)
+            with t2:
+                tracked = st.multiselect(
+                    "Track skills", options=[w for w, _ in analytics["keywords"]],
+                    help="Defaults to the most mentioned skills in the window"
+                )
+            trends = load_trends(weeks, tracked or None)
+            if not sum(trends["jobs"]):
+                st.caption(f"No jobs posted in the last {weeks} weeks.")
+            else:
+                if trends["keywords"]:
+                    st.caption("Postings per week mentioning each skill")
+                    st.line_chart(trend_frame(trends["weeks"], trends["keywords"]))
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.caption("Jobs per week by source")
+                    st.line_chart(trend_frame(trends["weeks"], trends["sources"]))
+                with c2:
+                    st.caption("Jobs per week by location")
+                    st.line_chart(trend_frame(trends["weeks"], trends["locations"]))
+                if trends["rising"]:
+                    st.caption(f"🚀 Rising keywords: share of postings, last {RISING_WINDOW} weeks vs. before")
+                    st.dataframe(pd.DataFrame(
+                        trends["rising"], columns=["Keyword", "Recent Jobs", "Earlier Jobs", "Lift (pts)"]
+                    ), hide_index=True)
+
+            st.divider()
+
+            # 3. GAP ANALYSIS
             st.subheader("⚠️ Missing Skills")
             st.caption("Keywords in matched jobs that you might be missing:")
-            gaps = analyze_skill_gaps(saved, skills)
+            gaps = skill_gaps(analytics["keywords"], skills)
             if gaps:
                 gap_cols = st.columns(5)
                 for i, (word, count) in enumerate(gaps[:5]):
@@ -576,67 +727,146 @@ def main():
 
             st.divider()
 
-            # 3. PERFORMANCE STATS
+            # 4. PERFORMANCE STATS
             st.subheader("📊 Performance Analytics")
             
-            # Data Preparation
-            df = pd.DataFrame([{
-                "source": j.source.upper(),
-                "score": j.match_score if j.match_score else 0,
-                "company": j.company
-            } for j in saved])
-            
             c1, c2 = st.columns(2)
             
             with c1:
                 st.subheader("Source Breakdown")
-                if not df.empty:
-                    st.bar_chart(df['source'].value_counts())
+                source_counts = pd.Series(analytics["sources"], dtype=int)
+                if not source_counts.empty:
+                    source_counts.index = source_counts.index.str.upper()
+                    st.bar_chart(source_counts.groupby(level=0).sum().sort_values(ascending=False))
                 else: st.write("No data.")
                 
             with c2:
                 st.subheader("Match Score Dist.")
-                if not df.empty:
-                    bins = [0, 20, 40, 60, 80, 100]
-                    labels = ['0-20%', '20-40%', '40-60%', '60-80%', '80-100%']
-                    df['score_bin'] = pd.cut(df['score'], bins=bins, labels=labels)
-                    bin_counts = df['score_bin'].value_counts().sort_index()
+                bin_counts = pd.Series(analytics["score_bins"], dtype=int)
+                if bin_counts.sum():
                     st.bar_chart(bin_counts, color="#00aa00")
                 else: st.write("No data.")
 
             st.divider()
             st.subheader("🏢 Top Hiring Companies")
-            top_cos = get_top_companies(saved)
+            top_cos = analytics["companies"]
             if top_cos:
                 st.dataframe(pd.DataFrame(top_cos, columns=["Company", "Jobs Found"]), hide_index=True)
 
 
+# History sort labels -> db.HISTORY_SORTS keys
+HISTORY_SORTS = {
+    "Date Posted (Newest First)": "date_desc",
+    "Date Posted (Oldest First)": "date_asc",
+    "Match Score (Highest First)": "score_desc",
+    "Match Score (Lowest First)": "score_asc",
+}
+CARD_PAGE_SIZES = [10, 25, 50]
+TABLE_PAGE_SIZES = [100, 500, 1000]
+TABLE_COLUMNS = ["Title", "Company", "Location", "Date Posted", "Source", "URL", "Match Score", "Applied"]
+
+def pager(list_key, total, page_sizes, reset_on=None):
+    """
+    Page size picker and prev/next cursor for a list of `total` items; the
+    cursor lives in session_state and goes back to page 1 when reset_on
+    (filters, sort, a new result set) changes. Returns (offset, limit).
+    """
+    state_key = f"pager_{list_key}"
+    state = st.session_state.setdefault(state_key, {"page": 0, "reset_on": reset_on})
+    p1, p2, p3, p4 = st.columns([1, 1, 3, 1])
+    with p4:
+        size = st.selectbox("Per page", page_sizes, key=f"{state_key}_size", label_visibility="collapsed")
+    if state["reset_on"] != (reset_on, size):
+        state.update(page=0, reset_on=(reset_on, size))
+    pages = max(1, -(-total // size))
+    state["page"] = min(state["page"], pages - 1)
+    page = state["page"]
+
+    def turn(delta):
+        st.session_state[state_key]["page"] += delta
+
+    with p1:
+        st.button("◀ Prev", key=f"{state_key}_prev", disabled=page == 0, on_click=turn, args=(-1,))
+    with p2:
+        st.button("Next ▶", key=f"{state_key}_next", disabled=page >= pages - 1, on_click=turn, args=(1,))
+    with p3:
+        if total:
+            st.caption(f"Page {page + 1} of {pages} · {page * size + 1}–{min((page + 1) * size, total)} of {total}")
+    return page * size, size
+
+def sort_jobs(jobs, sort_key):
+    """In-memory equivalent of db.HISTORY_SORTS, for guest sessions."""
+    if sort_key.startswith("date"):
+        key = lambda j: j.date_posted or datetime.min
+    else:
+        key = lambda j: j.match_score or 0
+    return sorted(jobs, key=key, reverse=sort_key.endswith("desc"))
+
+def job_row(job):
+    """A Job as a TABLE_COLUMNS row (what db.get_saved_job_rows returns)."""
+    return (job.title, job.company, job.location, job.date_posted, job.source, job.url, job.match_score,
+            "Yes" if job.applications else "No")
+
+def render_job_table(rows):
+    """Compact view: one st.dataframe instead of a card (and its widgets) per job."""
+    import pandas as pd
+    st.dataframe(
+        pd.DataFrame(rows, columns=TABLE_COLUMNS), hide_index=True, use_container_width=True,
+        column_config={
+            "URL": st.column_config.LinkColumn("URL", display_text="View"),
+            "Match Score": st.column_config.NumberColumn("Match Score", format="%d%%"),
+            "Date Posted": st.column_config.DatetimeColumn("Date Posted", format="YYYY-MM-DD"),
+        }
+    )
+
+def export_panel(session_jobs, user_id):
+    """
+    Format picker + export button. The download button is rendered only on
+    the rerun that made the export, so the file isn't re-read and re-sent on
+    every later rerun.
+    """
+    from src.database.export import export_jobs, available_formats, FORMATS
+    e1, e2 = st.columns([1, 1])
+    with e1:
+        fmt = st.selectbox("Export format", available_formats(), format_func=str.upper, label_visibility="collapsed")
+    with e2:
+        if st.button("📥 Export"):
+            with st.spinner("Exporting..."):
+                try:
+                    path, rows = export_jobs(None if session_jobs is not None else user_id, fmt, jobs=session_jobs)
+                except Exception as e:
+                    st.error(f"Export failed: {e}")
+                    return
+            with open(path, "rb") as f:
+                st.download_button(f"⬇️ Download {fmt.upper()} ({rows} jobs)", f, os.path.basename(path), FORMATS[fmt][0])
+
+def trend_frame(weeks, series):
+    """Week-indexed DataFrame (one column per key) for st.line_chart."""
+    import pandas as pd
+    return pd.DataFrame(series, index=pd.to_datetime(weeks))
+
 def run_batch_apply(jobs, name, skills, resume_text, resume_path, phone, user_id):
-    temp_profile = Profile(name=name, skills=skills, resume_text=resume_text, resume_path=resume_path, phone=phone)
-    progress = st.progress(0)
-    status = st.empty()
-    
-    try:
-        from src.application_bot import ApplicationBot
+    """Queues the batch on the background runner; progress is polled by task_status_panel."""
+    payload = {
+        "jobs": [job_to_dict(j, description=False) for j in jobs],
         # Use simple visual bot for demo/safety
-        bot = ApplicationBot(headless=False)
-        
-        for i, job in enumerate(jobs):
-            status.text(f"Applying to {i+1}/{len(jobs)}: {job.title} @ {job.company}...")
-            try:
-                bot.fill_application(job.url, temp_profile)
-                # TRACKING
-                mark_job_applied(job.id, user_id, status="applied")
-                st.toast(f"✅ Applied & Tracked: {job.company}")
-            except Exception as e:
-                st.toast(f"❌ Failed {job.company}: {e}")
-            progress.progress((i + 1) / len(jobs))
-            
-        bot.close()
-        status.success("Batch Application Complete!")
-        
-    except Exception as e:
-        st.error(f"Batch Error: {e}")
+        "headless": False,
+        "name": name, "skills": skills,
+        "stored_profile": not st.session_state.get('is_guest', False)
+    }
+    # Resume and phone stay in memory; they're not written to the tasks table
+    private = {"resume_text": resume_text, "resume_path": resume_path, "phone": phone}
+    st.session_state['apply_task_id'] = get_runner().submit(user_id, "apply", payload, private)
+    st.toast(f"🚀 Queued Auto-Apply for {len(jobs)} jobs")
+
+def load_full_description(job, skills, resume_text, use_semantic, user_id):
+    """On-demand enrichment for one card: fetch the detail page, re-score, store."""
+    with st.spinner("Fetching full description..."):
+        enriched = enrich_and_rescore([job], get_matcher(use_semantic), Profile(skills=skills, resume_text=resume_text), timeout=30)
+    if not enriched:
+        st.toast("Couldn't load the full description for this job.")
+    elif not st.session_state.get('is_guest', False):
+        update_job_enrichment(user_id, enriched)
 
 def run_single_apply(job, name, skills, resume_text, resume_path, phone, user_id):
     temp_profile = Profile(name=name, skills=skills, resume_text=resume_text, resume_path=resume_path, phone=phone)
@@ -654,138 +884,62 @@ def run_single_apply(job, name, skills, resume_text, resume_path, phone, user_id
     except Exception as e:
         st.error(f"Bot failed: {e}")
 
-def run_search(query, location, skills, resume_text, resume_path, phone, use_mock, use_instahyre, use_hn, use_semantic, use_naukri, use_linkedin, use_smart_search, use_arbeitnow, email_enabled, email_user, email_pass, user_id, limit=10):
+def run_search(query, location, skills, resume_text, resume_path, phone, use_mock, use_instahyre, use_hn, use_semantic, use_naukri, use_linkedin, use_smart_search, use_arbeitnow, user_id, limit=10, enough=0, use_ats=False):
+    """Submits the search to the background runner; results are polled by search_task_panel."""
     # SMART SEARCH LOGIC
-    queries = [query] if query else []
-    
-    if use_smart_search:
-        # 1. Expand based on common roles
-        if query:
-            q_lower = query.lower()
-            if "data engineer" in q_lower:
-                queries.extend(["Spark Developer", "Big Data Engineer", "ETL Developer"])
-            elif "data scientist" in q_lower:
-                queries.extend(["Machine Learning Engineer", "AI Engineer"])
-            elif "frontend" in q_lower or "react" in q_lower:
-                queries.extend(["React Developer", "UI Engineer"])
-            elif "backend" in q_lower or "python" in q_lower:
-                queries.extend(["Backend Engineer", "Django Developer"])
-            elif "full stack" in q_lower:
-                queries.extend(["Full Stack Developer", "Software Engineer"])
-            elif "java" in q_lower or "software" in q_lower:
-                queries.extend(["Java Developer", "Software Engineer", "Systems Engineer"])
-            elif "devops" in q_lower or "sre" in q_lower:
-                queries.extend(["Site Reliability Engineer", "Platform Engineer", "Cloud Engineer"])
-
-        # 2. Integrate top user skills into search
-        if skills:
-            # Add top 2 skills to queries to broaden search
-            for skill in skills[:2]:
-                if query:
-                    queries.append(f"{query} {skill}")
-                else:
-                    queries.append(f"{skill} Developer")
-            
-    # Ensure we have at least something to search
-    if not queries and skills:
-        queries = [f"{skills[0]} Developer"]
-    elif not queries:
-        queries = ["Software Developer"] # Generic fallback
-            
-    # Setup
-    profile = Profile(name="User", skills=skills, resume_text=resume_text, resume_path=resume_path, phone=phone)
-    
-    if use_semantic:
-        matcher = SemanticMatcher()
-    else:
-        matcher = KeywordMatcher()
-    
-    search_log = []
-    search_log.append(f"🧠 Smart Search Active. Queries: {queries}")
-    
-    all_jobs = []
-    
-    # Run scrapers
-    with st.status("🔍 Searching across platforms...", expanded=True) as status:
-        for i, q in enumerate(queries):
-            status.update(label=f"Searching for '{q}' ({i+1}/{len(queries)})...")
-            q_jobs = []
-            
-            # --- SCRAPER BLOCK ---
-            if use_mock:
-                try:
-                    status.write(f"Checking Mock Data for {q}...")
-                    s = MockScraper()
-                    q_jobs.extend(s.scrape(query=q, location=location, limit=limit))
-                except: pass
-                
-            if use_instahyre:
-                try:
-                    status.write(f"Scraping Instahyre for {q}...")
-                    s = InstahyreScraper()
-                    q_jobs.extend(s.scrape(query=q, location=location, limit=limit))
-                except Exception as e: 
-                    status.write(f"⚠️ Instahyre error: {e}")
-                    search_log.append(f"Instahyre Error on '{q}': {e}")
-            
-            if use_arbeitnow:
-                try:
-                    status.write(f"Fetching Arbeitnow (Remote) for {q}...")
-                    s = ArbeitnowScraper()
-                    q_jobs.extend(s.scrape(query=q, location=location, limit=limit))
-                except Exception as e:
-                    status.write(f"⚠️ Arbeitnow error: {e}")
-                    search_log.append(f"Arbeitnow Error on '{q}': {e}")
+    queries = expand_queries(query, skills, use_smart_search)
+
+    sources = [key for key, enabled in [
+        ("mock", use_mock), ("instahyre", use_instahyre), ("arbeitnow", use_arbeitnow),
+        ("naukri", use_naukri), ("linkedin", use_linkedin), ("hn", use_hn), ("ats", use_ats)
+    ] if enabled]
+
+    payload = {
+        "queries": queries, "location": location, "sources": sources, "limit": limit,
+        "enough": int(enough) or None, "use_semantic": use_semantic,
+        # Save to DB (skip for guest users)
+        "save": not st.session_state.get('is_guest', False),
+        "name": "User", "skills": skills,
+        "stored_profile": not st.session_state.get('is_guest', False)
+    }
+    private = {"resume_text": resume_text, "resume_path": resume_path, "phone": phone}
+    st.session_state['search_task_id'] = get_runner().submit(user_id, "search", payload, private)
+    st.session_state['search_log'] = [f"🧠 Smart Search Active. Queries: {queries}"]
+
+@st.fragment(run_every=2)
+def search_task_panel(email_enabled, email_user, email_pass):
+    """Polls the running search task and previews its partial results."""
+    task = get_task(st.session_state['search_task_id'])
+    if not task:
+        st.session_state.pop('search_task_id', None)
+        return
 
-            if use_naukri:
-                try:
-                    status.write(f"Scraping Naukri for {q}...")
-                    s = NaukriScraper()
-                    q_jobs.extend(s.scrape(query=q, location=location, limit=limit))
-                except Exception as e: 
-                    status.write(f"⚠️ Naukri error: {e}")
-                    search_log.append(f"Naukri Error on '{q}': {e}")
-                
-            if use_linkedin:
-                try:
-                    status.write(f"Scraping LinkedIn for {q}...")
-                    s = LinkedInScraper()
-                    q_jobs.extend(s.scrape(query=q, location=location, limit=limit))
-                except Exception as e: 
-                    status.write(f"⚠️ LinkedIn error: {e}")
-                    search_log.append(f"LinkedIn Error on '{q}': {e}")
-                
-            search_log.append(f"Query '{q}' returned {len(q_jobs)} raw jobs.")
-            all_jobs.extend(q_jobs)
-            
-        status.update(label="✅ Search Complete!", state="complete", expanded=False)
+    result = task['result'] or {}
+    jobs = [job_from_dict(j) for j in result.get('jobs', [])]
+
+    if task['status'] in ACTIVE_STATUSES:
+        st.progress(task['progress'], text=f"🔍 Searching across platforms... {task['message'] or ''}")
+        if jobs:
+            render_streaming_results(jobs)
+        return
+
+    # Finished: move results into the session and do the one-off follow-ups. The full
+    # list is held in memory by the runner; the persisted result is only a preview.
+    kept = get_runner().collect(task['id'])
+    if kept is not None:
+        result = kept
+        jobs = [job_from_dict(j) for j in result.get('jobs', [])]
+    search_log = st.session_state.get('search_log', [])[:1] + result.get('log', [])
+    if task['status'] == 'failed':
+        search_log.append(f"❌ Search failed: {task['error']}")
+    elif task['status'] == 'interrupted':
+        search_log.append("❌ Search was interrupted by a server restart; showing partial results.")
 
-    # De-duplicate by URL
-    unique_jobs = {j.url: j for j in all_jobs}.values()
-    final_jobs = list(unique_jobs)
-    
-    # Match (Calculate scores BEFORE saving)
-    matched_jobs = []
-    if final_jobs:
-        for job in final_jobs:
-            try:
-                score, details = matcher.match(job, profile)
-                job.match_score = score
-                matched_jobs.append(job)
-            except Exception as e:
-                matched_jobs.append(job)
-                continue
-        
-    # Sort
-    matched_jobs.sort(key=lambda x: x.match_score or 0, reverse=True)
-    
     # NOTIFICATION LOGIC
     if email_enabled and email_user and email_pass:
         # Find high matches that haven't been alerted yet
-        high_matches = [j for j in matched_jobs if (j.match_score or 0) >= 75]
+        high_matches = [j for j in jobs if (j.match_score or 0) >= 75]
         if high_matches:
-            if 'last_alert_count' not in st.session_state: st.session_state['last_alert_count'] = 0
-            
             st.toast(f"📧 Sending email alert for {len(high_matches)} top jobs...")
             notifier = Notifier(email_user, email_pass)
             success = notifier.send_alert(email_user, high_matches[:5]) # Top 5 only
@@ -796,17 +950,54 @@ def run_search(query, location, skills, resume_text, resume_path, phone, use_moc
                 st.toast("❌ Email failed. Check credentials.")
                 search_log.append("❌ Email Notification failed.")
 
-    # Save to DB (skip for guest users)
-    if not st.session_state.get('is_guest', False):
-        saved_count = save_jobs(matched_jobs, user_id)
-        search_log.append(f"💾 Saved {saved_count} new unique jobs to Database.")
+    if task['payload'].get('save', True):
+        search_log.append(f"💾 Saved {result.get('saved', 0)} new unique jobs to Database.")
     else:
-        search_log.append(f"⚡ Guest Mode: Found {len(matched_jobs)} jobs (not saved)")
-    
-    st.session_state['results'] = matched_jobs
+        search_log.append(f"⚡ Guest Mode: Found {len(jobs)} jobs (not saved)")
+
+    for host, m in result.get('metrics', {}).get('outbound', {}).items():
+        if m['backoff_remaining'] > 0:
+            search_log.append(f"🐢 {host} is throttling us; backing off for {m['backoff_remaining']:.0f}s.")
+
+    st.session_state['results'] = jobs
     st.session_state['search_log'] = search_log
+    st.session_state['search_metrics'] = result.get('metrics', {})
+    st.session_state.pop('search_task_id', None)
     st.rerun()
 
+@st.fragment(run_every=2)
+def task_status_panel(state_key, label):
+    """Generic progress/result display for apply and cleanup tasks."""
+    task = get_task(st.session_state[state_key])
+    if not task:
+        st.session_state.pop(state_key, None)
+        return
+    if task['status'] in ACTIVE_STATUSES:
+        st.progress(task['progress'], text=f"{label}: {task['message'] or 'queued...'}")
+        return
+
+    result = task['result'] or {}
+    if task['status'] == 'done':
+        if 'deleted' in result:
+            st.success(f"Cleanup Complete! Removed {result['deleted']} old jobs.")
+        else:
+            st.success(f"Batch Application Complete! Applied to {len(result.get('applied', []))} jobs.")
+            for failure in result.get('failed', []):
+                st.caption(f"❌ Failed {failure}")
+    else:
+        st.error(f"{label} {task['status']}: {task['error'] or ''}")
+    if st.button("Dismiss", key=f"dismiss_{state_key}"):
+        st.session_state.pop(state_key, None)
+        st.rerun()
+
+def render_streaming_results(jobs, top_n=20):
+    """Lightweight, widget-free preview shown while sources are still running."""
+    st.markdown(f"### Found {len(jobs)} Matches so far...")
+    for job in jobs[:top_n]:
+        score = int(job.match_score) if job.match_score else 0
+        st.markdown(f"**{job.title}** @ {job.company} — {score}% · {job.source.upper()} · [View]({job.url})")
+    if len(jobs) > top_n:
+        st.caption(f"+ {len(jobs) - top_n} more")
 
 
 
@@ -1,6 +1,8 @@
 import re
 from collections import Counter
+from datetime import datetime, timedelta
 from ..database.models import Job
+from .skills import get_taxonomy
 
 # Common stopwords to ignore in job descriptions
 STOPWORDS = set([
@@ -15,11 +17,210 @@ STOPWORDS = set([
     "looking", "candidate", "remote", "company", "location", "full", "time"
 ])
 
+# Words that never start or end a bigram ("of data", "and python")
+FUNCTION_WORDS = set([
+    "the", "and", "to", "of", "a", "in", "for", "is", "on", "with", "as", "be", "at",
+    "an", "or", "by", "we", "are", "you", "that", "it", "from", "will", "can", "this",
+    "must", "have", "our", "your", "their", "who", "all", "any", "not", "into"
+])
+
+# Bump when tokenization or the stored rollups change, so they get rebuilt
+TERMS_VERSION = 3
+
+BREAK = "\x00"  # stands in for clause punctuation so bigrams never span it
+NON_ALPHA = re.compile(r'[^a-z\s\x00]')
+# A dot only breaks a clause when followed by space ("node.js" stays one word)
+CLAUSE_BREAK = re.compile(r'[,;:!?()\[\]\n\r|\u2022]|\.(?=\s|$)')
+
+def _bigram_ok(first, second):
+    return (len(first) > 1 and len(second) > 1
+            and first not in FUNCTION_WORDS and second not in FUNCTION_WORDS
+            and not (first in STOPWORDS and second in STOPWORDS))
+
+def _words(text):
+    """Lower-cased words with BREAK tokens at clause boundaries, in one regex pass each."""
+    return NON_ALPHA.sub('', CLAUSE_BREAK.sub(f' {BREAK} ', text.lower())).split()
+
 def extract_keywords(text):
     if not text: return []
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    words = text.lower().split()
-    return [w for w in words if w not in STOPWORDS and len(w) > 2]
+    return [w for w in _words(text) if len(w) > 2 and w not in STOPWORDS]
+
+def keyword_counts(text, bigrams=True):
+    """
+    Keyword term frequencies for one description (stored per job at save
+    time): unigrams (3+ letters, not stopwords) plus adjacent pairs such as
+    "big data" or "machine learning". Tokens and pairs are counted by
+    Counter in C; filtering then runs once per distinct term, not per token.
+    """
+    if not text:
+        return {}
+    words = _words(text)
+    terms = {w: n for w, n in Counter(words).items() if len(w) > 2 and w not in STOPWORDS}
+    if bigrams:
+        for (first, second), n in Counter(zip(words, words[1:])).items():
+            if _bigram_ok(first, second):
+                terms[f"{first} {second}"] = n
+    return terms
+
+def count_terms(texts, bigrams=True):
+    """Corpus term counts, streamed one description at a time (no corpus-wide token list)."""
+    counts = Counter()
+    for text in texts:
+        counts.update(keyword_counts(text, bigrams))
+    return counts
+
+SCORE_BINS = ['0-20%', '20-40%', '40-60%', '60-80%', '80-100%']
+
+def score_bin(score):
+    """Histogram bucket for a match score; unscored (0) jobs aren't counted."""
+    if not score or score <= 0:
+        return None
+    return SCORE_BINS[min(int((score - 1e-9) // 20), len(SCORE_BINS) - 1)]
+
+def is_known_company(company):
+    return bool(company) and "unknown" not in company.lower()
+
+def job_aggregates(job, terms):
+    """
+    This job's contribution to the per-user analytics counters, keyed by
+    (kind, key). Saving adds it, deleting subtracts it.
+    """
+    counts = Counter({("keyword", word): n for word, n in (terms or {}).items()})
+    counts[("meta", "jobs")] += 1
+    if is_known_company(job.company):
+        counts[("company", job.company)] += 1
+    counts[("source", job.source or "unknown")] += 1
+    bucket = score_bin(job.match_score)
+    if bucket:
+        counts[("score_bin", bucket)] += 1
+    return counts
+
+def summarize(counts, top_keywords=50):
+    """Analytics summary (what the Analytics tab renders) from (kind, key) -> count."""
+    by_kind = {}
+    for (kind, key), n in counts.items():
+        if n > 0:
+            by_kind.setdefault(kind, Counter())[key] = n
+    keywords = by_kind.get("keyword", Counter())
+    return {
+        "jobs": by_kind.get("meta", Counter()).get("jobs", 0),
+        "keywords": keywords.most_common(top_keywords),
+        "companies": by_kind.get("company", Counter()).most_common(10),
+        "sources": dict(by_kind.get("source", Counter()).most_common()),
+        "score_bins": {b: by_kind.get("score_bin", Counter()).get(b, 0) for b in SCORE_BINS}
+    }
+
+def aggregate_jobs(jobs):
+    """summarize() computed directly from Job objects (guest sessions have no DB)."""
+    counts = Counter()
+    for job in jobs:
+        counts.update(job_aggregates(job, keyword_counts(job.description)))
+    return summarize(counts)
+
+TREND_WEEKS = 12
+RISING_WINDOW = 4  # recent weeks compared against the weeks before them
+RISING_MIN_COUNT = 3  # postings a term needs in the recent window to count as rising
+
+def week_of(when=None):
+    """Monday of the week a job falls in (the rollup bucket)."""
+    day = when or datetime.utcnow()
+    if isinstance(day, datetime):
+        day = day.date()
+    return day - timedelta(days=day.weekday())
+
+def week_range(weeks=TREND_WEEKS, end=None):
+    """The last `weeks` buckets up to and including end's week, oldest first."""
+    last = week_of(end)
+    return [last - timedelta(weeks=i) for i in range(weeks - 1, -1, -1)]
+
+def location_key(location):
+    """Coarse location bucket: the first part of "City, Region, Country"."""
+    head = (location or "").split(",")[0].strip()
+    return head.title()[:200] if head else "Unknown"
+
+def job_trends(job, terms):
+    """
+    This job's contribution to the weekly rollups, keyed by (week, kind, key).
+    The week comes from date_posted (created_at when unknown); keywords count
+    once per job, so a week's value is the number of postings mentioning them.
+    """
+    week = week_of(job.date_posted or job.created_at)
+    counts = Counter({(week, "keyword", term): 1 for term in (terms or {})})
+    counts[(week, "jobs", "all")] += 1
+    counts[(week, "source", job.source or "unknown")] += 1
+    counts[(week, "location", location_key(job.location))] += 1
+    return counts
+
+def rising_terms(recent, prior, recent_jobs, prior_jobs, min_count=RISING_MIN_COUNT, top=10):
+    """
+    Keywords whose share of postings grew most from the prior window to the
+    recent one, as (term, recent count, prior count, lift in percentage points).
+    """
+    if not recent_jobs or not prior_jobs:
+        return []
+    rising = []
+    for term, n in recent.items():
+        if n < min_count:
+            continue
+        lift = 100.0 * (n / recent_jobs - prior.get(term, 0) / prior_jobs)
+        if lift > 0:
+            rising.append((term, n, prior.get(term, 0), round(lift, 1)))
+    rising.sort(key=lambda r: (-r[3], -r[1], r[0]))
+    return rising[:top]
+
+def summarize_trends(counts, weeks, top=5, terms=None):
+    """
+    Trend chart data from (week, kind, key) -> count over the given weeks:
+    per-week job volume, the top sources/locations and keywords (or `terms`)
+    as zero-filled series, and the rising keywords of the last RISING_WINDOW weeks.
+    """
+    index = {w: i for i, w in enumerate(weeks)}
+    series = {}
+    for (week, kind, key), n in counts.items():
+        if week in index and n > 0:
+            series.setdefault(kind, {}).setdefault(key, [0] * len(weeks))[index[week]] += n
+
+    def leaders(kind, keys=None):
+        rows = series.get(kind, {})
+        if keys is None:
+            keys = sorted(rows, key=lambda k: (-sum(rows[k]), k))[:top]
+        return {k: rows.get(k, [0] * len(weeks)) for k in keys}
+
+    split = max(len(weeks) - RISING_WINDOW, 0)
+    jobs = series.get("jobs", {}).get("all", [0] * len(weeks))
+    keywords = series.get("keyword", {})
+    recent = Counter({k: sum(v[split:]) for k, v in keywords.items()})
+    prior = Counter({k: sum(v[:split]) for k, v in keywords.items()})
+    return {
+        "weeks": weeks,
+        "jobs": jobs,
+        "keywords": leaders("keyword", terms),
+        "sources": leaders("source"),
+        "locations": leaders("location"),
+        "rising": rising_terms(recent, prior, sum(jobs[split:]), sum(jobs[:split]))
+    }
+
+def aggregate_trends(jobs, weeks=TREND_WEEKS, terms=None):
+    """summarize_trends() computed directly from Job objects (guest sessions have no DB)."""
+    counts = Counter()
+    for job in jobs:
+        counts.update(job_trends(job, keyword_counts(job.description)))
+    return summarize_trends(counts, week_range(weeks), terms=terms)
+
+def skill_gaps(top_keywords, user_skills):
+    """
+    Frequent keywords (most common first) that aren't among the user's skills.
+    Known skills are compared by canonical name, so "k8s" in job posts is not
+    a gap for a user listing Kubernetes, and aliases of one skill add up.
+    """
+    taxonomy = get_taxonomy()
+    owned = taxonomy.normalize(user_skills)
+    gaps = Counter()
+    for word, count in top_keywords[:50]:
+        skill = taxonomy.canonical(word) or word
+        if skill not in owned:
+            gaps[skill] += count
+    return gaps.most_common(10)
 
 def analyze_skill_gaps(jobs, user_skills):
     """
@@ -27,26 +228,12 @@ def analyze_skill_gaps(jobs, user_skills):
     Returns: List of (keyword, count) tuples.
     """
     if not jobs: return []
-
-    user_skills_set = set(s.lower().strip() for s in user_skills)
-    corpus = []
-    for job in jobs:
-        corpus.extend(extract_keywords(job.description))
-            
-    counts = Counter(corpus)
-    gaps = []
-    for word, count in counts.most_common(50):
-        if word not in user_skills_set:
-            gaps.append((word, count))
-    return gaps[:10]
+    return skill_gaps(count_terms(job.description for job in jobs).most_common(50), user_skills)
 
 def get_top_companies(jobs):
-    companies = [j.company for j in jobs if j.company and "unknown" not in j.company.lower()]
+    companies = [j.company for j in jobs if is_known_company(j.company)]
     return Counter(companies).most_common(10)
 
 def get_market_skills(jobs):
     """Returns the most frequent keywords across ALL jobs (Market Demand)."""
-    corpus = []
-    for job in jobs:
-        corpus.extend(extract_keywords(job.description))
-    return Counter(corpus).most_common(10)
+    return count_terms(job.description for job in jobs).most_common(10)
@@ -0,0 +1,139 @@
+"""
+Cross-source job de-duplication.
+URLs are canonicalized (tracking params, host aliases, fragments), and
+near-duplicate postings on different boards are found with a 64-bit SimHash
+over normalized title + company + location, then merged into one record
+whose source lists every board it came from ("linkedin+naukri").
+"""
+import hashlib
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from ..database.models import Job
+
+TRACKING_PARAMS = {
+    "ref", "refid", "referer", "referrer", "src", "source", "trk", "trkinfo", "trackingid",
+    "tracking_id", "position", "pagenum", "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "lipi", "sid", "xid", "searchid", "gh_src", "lever-origin", "lever-source"
+}
+HOST_PREFIXES = ("www.", "m.", "in.", "mobile.")
+
+COMPANY_SUFFIXES = re.compile(
+    r"\b(pvt|private|ltd|limited|inc|llc|llp|corp|corporation|co|gmbh|plc|technologies|technology|solutions|services|india)\b"
+)
+LOCATION_ALIASES = {"bengaluru": "bangalore", "gurugram": "gurgaon", "bombay": "mumbai", "nyc": "new york", "sf": "san francisco"}
+TITLE_ALIASES = {"sr": "senior", "jr": "junior", "engg": "engineer", "dev": "developer", "mgr": "manager"}
+TITLE_NOISE = re.compile(r"\b(urgent|hiring|immediate|joiner|joiners|opening|wfh|remote|hybrid)\b")
+
+SIMHASH_BITS = 64
+MAX_DISTANCE = 3  # Hamming distance that still counts as the same posting
+BANDS = MAX_DISTANCE + 1  # pigeonhole: <= 3 differing bits leaves one of 4 bands identical
+BAND_BITS = SIMHASH_BITS // BANDS
+MAX_SOURCE_LEN = 50  # Job.source column width
+
+
+def canonicalize_url(url: str) -> str:
+    """Lower-cases scheme/host, drops www./m. prefixes, tracking params, fragments and trailing slashes."""
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if host.endswith(":443") or host.endswith(":80"):
+        host = host.rsplit(":", 1)[0]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme.lower()
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"[^a-z0-9+#]+", " ", (text or "").lower()).strip()
+
+
+def job_fingerprint_text(job: Job) -> str:
+    title = " ".join(TITLE_ALIASES.get(w, w) for w in TITLE_NOISE.sub(" ", _norm(job.title)).split())
+    company = COMPANY_SUFFIXES.sub(" ", _norm(job.company))
+    location = _norm((job.location or "").split(",")[0])
+    location = LOCATION_ALIASES.get(location, location)
+    return " ".join(f"{title} | {company} | {location}".split())
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word tokens and character trigrams."""
+    words = text.split()
+    features = words + [text[i:i + 3] for i in range(max(len(text) - 2, 0))]
+    if not features:
+        return 0
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def merge_jobs(primary: Job, other: Job) -> Job:
+    """Folds other into primary: union of sources, longest description, earliest date."""
+    sources = primary.source.split("+") if primary.source else []
+    for s in (other.source or "").split("+"):
+        if s and s not in sources:
+            sources.append(s)
+    primary.source = "+".join(sources)[:MAX_SOURCE_LEN]
+    if len(other.description or "") > len(primary.description or ""):
+        primary.description = other.description
+    if other.date_posted and (not primary.date_posted or other.date_posted < primary.date_posted):
+        primary.date_posted = other.date_posted
+    return primary
+
+
+class Deduplicator:
+    """
+    Incremental de-duplicator. add() returns the job if it is new, or None
+    after merging it into the record it duplicates. Jobs are keyed by
+    canonical URL; job.url itself is left as the board gave it. Lookups use one dict for URLs and BANDS dicts for SimHash
+    bands, so each add() compares against a handful of candidates.
+    """
+
+    def __init__(self):
+        self.by_url: Dict[str, Job] = {}
+        self._bands: List[Dict[int, List[tuple]]] = [{} for _ in range(BANDS)]
+        self.merged = 0
+
+    def add(self, job: Job) -> Optional[Job]:
+        if not job.url:
+            return None
+        url = canonicalize_url(job.url)
+        existing = self.by_url.get(url)
+        if existing is None:
+            existing = self._near_duplicate(job)
+        if existing is not None:
+            merge_jobs(existing, job)
+            self.merged += 1
+            return None
+        self.by_url[url] = job
+        return job
+
+    def _near_duplicate(self, job: Job) -> Optional[Job]:
+        h = simhash(job_fingerprint_text(job))
+        mask = (1 << BAND_BITS) - 1
+        keys = [(h >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+        for band, key in zip(self._bands, keys):
+            for other_hash, other in band.get(key, ()):
+                if bin(h ^ other_hash).count("1") <= MAX_DISTANCE:
+                    return other
+        for band, key in zip(self._bands, keys):
+            band.setdefault(key, []).append((h, job))
+        return None
+
+
+def dedup_jobs(jobs: List[Job]) -> List[Job]:
+    """One-shot version of Deduplicator for a finished list."""
+    d = Deduplicator()
+    return [j for j in jobs if d.add(j) is not None]
@@ -0,0 +1,275 @@
+"""
+PDF text extraction for resumes and JD attachments.
+pdfplumber's layout analysis is pure Python and CPU-bound, so pages are
+extracted in a process pool rather than threads: a long document is split
+into page ranges across the workers, and a batch of documents goes one
+document per worker, with only a few documents per worker in flight. Every document is capped at MAX_PAGES pages and
+PDF_TIMEOUT_SECONDS seconds, and its page texts are joined once at the end.
+"""
+import io
+import itertools
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator, List, Tuple, Union
+
+MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_TIMEOUT_SECONDS = float(os.getenv("PDF_TIMEOUT_SECONDS", "30"))
+# 0 extracts in the calling process (no pool, no timeout outside the main thread)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+PAGES_PER_TASK = 8  # pages read before a document is split across workers
+TIMEOUT_GRACE = 5  # extra seconds the caller waits before giving up on a worker
+IN_FLIGHT_PER_WORKER = 2  # documents of a batch submitted per worker at a time
+
+Source = Union[bytes, str]
+
+_POOL = None
+_STARTED = None  # in a worker: queue announcing (task id, pid) as tasks start
+_POOL_LOCK = threading.Lock()
+_TIMED_OUT = threading.Event()  # set in a worker when its alarm fires
+
+
+def _on_alarm(signum, frame):
+    _TIMED_OUT.set()
+    raise TimeoutError("PDF extraction timed out")
+
+
+def _arm(seconds: float) -> bool:
+    # Workers run tasks on their main thread, where SIGALRM can interrupt pdfminer mid-page
+    if not seconds or not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        return False
+    _TIMED_OUT.clear()
+    signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, max(seconds, 0.01))
+    return True
+
+
+def _extract_range(source: Source, start: int, stop: int, timeout: float) -> Tuple[int, List[str]]:
+    """(page count, texts of pages start..stop-1). Runs in a pool worker."""
+    import pdfplumber
+    armed = _arm(timeout)
+    try:
+        with pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source) as pdf:
+            pages = pdf.pages
+            texts = []
+            for page in pages[start:stop]:
+                texts.append(page.extract_text() or "")
+                page.close()  # drop the page's parsed layout before the next one
+            return len(pages), texts
+    except Exception:
+        if armed and _TIMED_OUT.is_set():
+            # pdfplumber re-raises errors from inside pdfminer wrapped in its own type
+            raise TimeoutError("PDF extraction timed out") from None
+        raise
+    finally:
+        if armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _init_worker(started):
+    global _STARTED
+    _STARTED = started
+
+
+def _run_task(task_id: int, fn, *args):
+    # Lets the parent find (and kill) the process if this task hangs
+    _STARTED.put((task_id, os.getpid()))
+    return fn(*args)
+
+
+class ExtractionPool:
+    """
+    A ProcessPoolExecutor that knows which worker process runs each task,
+    so a worker stuck past its timeout can be killed without failing other
+    callers' tasks.
+    """
+
+    def __init__(self, workers: int = PDF_WORKERS):
+        # spawn, not fork: the dashboard and task runner are multi-threaded
+        ctx = multiprocessing.get_context("spawn")
+        self._started = ctx.SimpleQueue()  # (task id, worker pid) as tasks start
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                            initializer=_init_worker, initargs=(self._started,))
+        self._tasks = {}  # outstanding future -> task id
+        self._pids = {}   # started task id -> worker pid
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> Future:
+        task_id = next(self._ids)
+        future = self.executor.submit(_run_task, task_id, fn, *args)
+        with self._lock:
+            self._tasks[future] = task_id
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future):
+        with self._lock:
+            self._pids.pop(self._tasks.pop(future, None), None)
+            self._drain()
+
+    def _drain(self):
+        # Caller holds _lock; keeps pids of outstanding tasks only
+        live = set(self._tasks.values())
+        while not self._started.empty():
+            task_id, pid = self._started.get()
+            if task_id in live:
+                self._pids[task_id] = pid
+
+    def outstanding(self) -> List[Future]:
+        with self._lock:
+            return list(self._tasks)
+
+    def retire(self, stuck: List[Future]):
+        """
+        Kills the workers running the stuck futures, in the background, once
+        the pool's other tasks have finished (killing a worker breaks the
+        whole executor, so they're given up to a timeout's worth of time).
+        """
+        def reap():
+            others = [f for f in self.outstanding() if f not in stuck]
+            wait(others, timeout=PDF_TIMEOUT_SECONDS + TIMEOUT_GRACE)
+            with self._lock:
+                self._drain()
+                pids = [self._pids[self._tasks[f]] for f in stuck if self._tasks.get(f) in self._pids]
+            for pid in pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+            self.executor.shutdown(wait=False)
+
+        threading.Thread(target=reap, name="pdf-reap", daemon=True).start()
+
+
+def get_pool() -> ExtractionPool:
+    """Process-wide extraction pool, started on first use."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ExtractionPool()
+        return _POOL
+
+
+def _drop_pool(pool: ExtractionPool):
+    """Sends new work to a fresh pool; the old one finishes what it has."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+
+
+def _result(pool: ExtractionPool, future: Future, timeout: float):
+    """future.result(), telling a worker that timed out on its own from one that hangs."""
+    try:
+        return future.result(timeout=max(timeout, 0))
+    except TimeoutError:
+        if future.done():
+            raise  # the worker's alarm fired; the pool is healthy
+        _drop_pool(pool)
+        pool.retire([future])
+        raise TimeoutError("PDF extraction timed out")
+    except BrokenProcessPool:
+        _drop_pool(pool)  # a worker died (e.g. out of memory on a hostile PDF)
+        pool.executor.shutdown(wait=False)
+        raise
+
+
+def _join(texts: List[str]) -> str:
+    return "\n".join(texts).replace("\x00", "")
+
+
+def extract_text(source: Source, max_pages: int = MAX_PAGES, timeout: float = PDF_TIMEOUT_SECONDS) -> Tuple[str, int]:
+    """
+    (text, total page count) of a PDF given as bytes or a path. Only the
+    first max_pages pages are read. The first PAGES_PER_TASK pages are read
+    in one task; the rest, if any, are split across the pool. Raises
+    TimeoutError once the document has taken more than timeout seconds.
+    """
+    if PDF_WORKERS <= 0:
+        count, texts = _extract_range(source, 0, max_pages, timeout)
+        return _join(texts), count
+
+    deadline = time.monotonic() + timeout
+    pool = get_pool()
+    future = pool.submit(_extract_range, source, 0, min(PAGES_PER_TASK, max_pages), timeout)
+    count, texts = _result(pool, future, timeout + TIMEOUT_GRACE)
+    last = min(count, max_pages)
+    if last > PAGES_PER_TASK:
+        remaining = last - PAGES_PER_TASK
+        per_task = max(PAGES_PER_TASK, math.ceil(remaining / PDF_WORKERS))
+        futures = [
+            pool.submit(_extract_range, source, start, min(start + per_task, last), deadline - time.monotonic())
+            for start in range(PAGES_PER_TASK, last, per_task)
+        ]
+        try:
+            for future in futures:  # in page order
+                texts.extend(_result(pool, future, deadline - time.monotonic() + TIMEOUT_GRACE)[1])
+        finally:
+            for future in futures:
+                future.cancel()  # the rest of a failed document, if not started yet
+    return _join(texts), count
+
+
+def extract_many(sources: Iterable[Source], max_pages: int = MAX_PAGES,
+                 timeout: float = PDF_TIMEOUT_SECONDS) -> Iterator[Tuple[int, str, int, str]]:
+    """
+    Extracts a batch of PDFs one document per worker, yielding
+    (index in sources, text, page count, error) as each finishes; error is
+    "" on success. sources is consumed lazily, IN_FLIGHT_PER_WORKER
+    documents per worker at a time, so pass paths or a generator to keep
+    a large batch out of memory. The timeout applies to each document from
+    when a worker picks it up.
+    """
+    if PDF_WORKERS <= 0:
+        for i, src in enumerate(sources):
+            try:
+                count, texts = _extract_range(src, 0, max_pages, timeout)
+                yield i, _join(texts), count, ""
+            except Exception as e:
+                yield i, "", 0, str(e) or type(e).__name__
+        return
+
+    todo = enumerate(sources)
+    capacity = PDF_WORKERS * IN_FLIGHT_PER_WORKER
+    in_flight = {}  # future -> (index, source, pool it runs on)
+    pool = get_pool()
+
+    def submit(i, src):
+        in_flight[pool.submit(_extract_range, src, 0, max_pages, timeout)] = (i, src, pool)
+
+    def fill():
+        for i, src in itertools.islice(todo, max(capacity - len(in_flight), 0)):
+            submit(i, src)
+
+    fill()
+    while in_flight:
+        done, pending = wait(in_flight, timeout=timeout + TIMEOUT_GRACE, return_when=FIRST_COMPLETED)
+        if not done:
+            # Every document times itself out, so a whole timeout without one finishing means the running workers hang
+            _drop_pool(pool)
+            queued = [f for f in pending if f.cancel()]
+            stuck = [f for f in pending if f not in queued]
+            pool.retire(stuck)
+            for future in stuck:
+                yield in_flight.pop(future)[0], "", 0, "PDF extraction timed out"
+            pool = get_pool()
+            for future in queued:  # never started: retried on the fresh pool
+                submit(*in_flight.pop(future)[:2])
+        for future in done:
+            i, _, owner = in_flight.pop(future)
+            try:
+                count, texts = future.result()
+                yield i, _join(texts), count, ""
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    _drop_pool(owner)  # a worker died; the rest of the batch goes to a fresh pool
+                    if owner is pool:
+                        pool = get_pool()
+                yield i, "", 0, str(e) or type(e).__name__
+        fill()
@@ -1,11 +1,23 @@
 """
 Rate limiter for JobPulse Agent.
 Implements soft quotas to protect shared compute resources.
+
+Quota state lives in memory per process: a daily counter plus a token
+bucket for the cooldown between searches, so every check is O(1) with no
+SQL. Changes are flushed in batches to a compact daily rollup table
+(one row per user, day and event type) and reloaded from it on first use.
+With several server processes each enforces its own copy, so limits are
+per-process soft limits.
 """
-from datetime import datetime, timedelta
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey
+import atexit
+import threading
+import time
+from datetime import datetime, date
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Date, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, scoped_session
 from src.database.models import Base
+from src.utils.token_bucket import TokenBucket
 
 import os
 DATA_DIR = os.getenv("DATA_DIR", "./data")
@@ -14,86 +26,198 @@ DATABASE_URL = f"sqlite:///{os.path.join(DATA_DIR, 'users.db')}"
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
 
-class UserUsage(Base):
-    __tablename__ = 'user_usage'
-    
-    id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'), index=True)
-    event_type = Column(String(50))  # 'search', 'apply', etc.
-    timestamp = Column(DateTime, default=datetime.utcnow)
+class UsageDaily(Base):
+    __tablename__ = 'user_usage_daily'
+
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    event_type = Column(String(50), primary_key=True)  # 'search', 'apply', etc.
+    count = Column(Integer, default=0)
+    last_at = Column(DateTime)
+
+class _UsageState:
+    __slots__ = ("day", "searches", "last_at", "bucket")
+
+    def __init__(self, day, searches, last_at, bucket):
+        self.day = day
+        self.searches = searches
+        self.last_at = last_at
+        self.bucket = bucket
+
+class RateLimitEngine:
+    """Process-wide quota state with periodic batched persistence."""
+
+    FLUSH_INTERVAL_SECONDS = 5
+
+    def __init__(self, daily_limit: int, cooldown_seconds: int, burst: int = 1, clock=time.time):
+        self.clock = clock  # seconds since the epoch; injectable for tests
+        self.daily_limit = daily_limit
+        self.cooldown_seconds = cooldown_seconds
+        self.burst = burst
+        self._states = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._flusher = None
+        atexit.register(self.flush)
+
+    def check(self, user_id: int, record: bool) -> tuple[bool, str]:
+        """Checks quota and, if allowed and record=True, consumes it atomically."""
+        now = self.clock()
+        with self._lock:
+            state = self._state(user_id, now)
+            if state.searches >= self.daily_limit:
+                return False, f"⏱️ Daily search limit reached ({self.daily_limit} searches/day). Try again tomorrow!"
+
+            wait = state.bucket.wait_time(now)
+            if wait > 0:
+                return False, f"⏳ Please wait {int(wait) + 1}s before your next search (prevents overload)"
+
+            if record:
+                self._consume(user_id, state, now)
+            return True, ""
+
+    def record(self, user_id: int):
+        """Records a search unconditionally."""
+        now = self.clock()
+        with self._lock:
+            self._consume(user_id, self._state(user_id, now), now)
+
+    def usage_today(self, user_id: int) -> int:
+        with self._lock:
+            return self._state(user_id, self.clock()).searches
+
+    def flush(self):
+        """Writes all changed counters to the rollup table in one statement."""
+        with self._lock:
+            rows = [{
+                "user_id": uid,
+                "day": self._states[uid].day,
+                "event_type": "search",
+                "count": self._states[uid].searches,
+                "last_at": datetime.utcfromtimestamp(self._states[uid].last_at) if self._states[uid].last_at else None
+            } for uid in self._dirty]
+            self._dirty.clear()
+        if not rows:
+            return
+
+        stmt = sqlite_insert(UsageDaily)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "day", "event_type"],
+            set_={"count": stmt.excluded.count, "last_at": stmt.excluded.last_at}
+        )
+        try:
+            with engine.begin() as conn:
+                conn.execute(stmt, rows)
+        except Exception as e:
+            print(f"Rate limiter flush failed: {e}")
+            with self._lock:
+                self._dirty.update(r["user_id"] for r in rows)
+
+    def _consume(self, user_id, state, now):
+        state.searches += 1
+        state.last_at = now
+        state.bucket.take(now)
+        self._dirty.add(user_id)
+        self._ensure_flusher()
+
+    def _state(self, user_id: int, now: float) -> _UsageState:
+        today = datetime.utcfromtimestamp(now).date()
+        state = self._states.get(user_id)
+        if state is None:
+            state = self._load(user_id, today, now)
+            self._states[user_id] = state
+        elif state.day != today:
+            # New UTC day: the daily counter resets, the cooldown carries over
+            state.day = today
+            state.searches = 0
+        return state
+
+    def _load(self, user_id: int, today: date, now: float) -> _UsageState:
+        session = SessionLocal()
+        try:
+            row = session.get(UsageDaily, (user_id, today, "search"))
+        finally:
+            session.close()
+
+        searches = row.count if row else 0
+        last_at = (row.last_at - datetime(1970, 1, 1)).total_seconds() if row and row.last_at else None
+        rate = 1.0 / self.cooldown_seconds
+        # Rebuild the bucket as if it had been draining since the last search
+        bucket = TokenBucket(self.burst, rate, tokens=self.burst - 1, now=last_at) if last_at else TokenBucket(self.burst, rate, now=now)
+        return _UsageState(today, searches, last_at, bucket)
+
+    def _ensure_flusher(self):
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, name="rate-limit-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.FLUSH_INTERVAL_SECONDS)
+            self.flush()
+            with self._lock:
+                if not self._dirty:
+                    self._flusher = None
+                    return
 
 class RateLimiter:
     """Manages usage quotas and rate limits per user."""
-    
+
     DAILY_SEARCH_LIMIT = 40
     SEARCH_COOLDOWN_SECONDS = 15
-    
+
     def __init__(self, user_id: int):
         self.user_id = user_id
-        
+
     def can_search(self) -> tuple[bool, str]:
         """
         Check if user can perform a search.
         Returns: (allowed: bool, message: str)
         """
-        session = SessionLocal()
-        try:
-            # Check daily limit
-            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-            count = session.query(UserUsage).filter(
-                UserUsage.user_id == self.user_id,
-                UserUsage.event_type == 'search',
-                UserUsage.timestamp >= today_start
-            ).count()
-            
-            if count >= self.DAILY_SEARCH_LIMIT:
-                return False, f"⏱️ Daily search limit reached ({self.DAILY_SEARCH_LIMIT} searches/day). Try again tomorrow!"
-            
-            # Check cooldown
-            last_search = session.query(UserUsage).filter(
-                UserUsage.user_id == self.user_id,
-                UserUsage.event_type == 'search'
-            ).order_by(UserUsage.timestamp.desc()).first()
-            
-            if last_search:
-                time_since = (datetime.utcnow() - last_search.timestamp).total_seconds()
-                if time_since < self.SEARCH_COOLDOWN_SECONDS:
-                    wait_time = int(self.SEARCH_COOLDOWN_SECONDS - time_since)
-                    return False, f"⏳ Please wait {wait_time}s before your next search (prevents overload)"
-            
-            return True, ""
-            
-        finally:
-            session.close()
-    
+        return _get_engine().check(self.user_id, record=False)
+
+    def try_search(self) -> tuple[bool, str]:
+        """
+        Atomic check-and-record: two rapid clicks can't both pass.
+        Returns: (allowed: bool, message: str)
+        """
+        return _get_engine().check(self.user_id, record=True)
+
     def record_search(self):
         """Record a search event."""
-        session = SessionLocal()
-        try:
-            usage = UserUsage(user_id=self.user_id, event_type='search')
-            session.add(usage)
-            session.commit()
-        finally:
-            session.close()
-    
+        _get_engine().record(self.user_id)
+
     def get_usage_today(self) -> dict:
         """Get user's usage stats for today."""
-        session = SessionLocal()
-        try:
-            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-            searches = session.query(UserUsage).filter(
-                UserUsage.user_id == self.user_id,
-                UserUsage.event_type == 'search',
-                UserUsage.timestamp >= today_start
-            ).count()
-            
-            return {
-                'searches': searches,
-                'searches_remaining': max(0, self.DAILY_SEARCH_LIMIT - searches)
-            }
-        finally:
-            session.close()
+        searches = _get_engine().usage_today(self.user_id)
+        return {
+            'searches': searches,
+            'searches_remaining': max(0, self.DAILY_SEARCH_LIMIT - searches)
+        }
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+
+def _get_engine() -> RateLimitEngine:
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = RateLimitEngine(RateLimiter.DAILY_SEARCH_LIMIT, RateLimiter.SEARCH_COOLDOWN_SECONDS)
+        return _ENGINE
 
 def init_rate_limiter_table():
-    """Create the usage tracking table if it doesn't exist."""
-    Base.metadata.create_all(bind=engine, tables=[UserUsage.__table__])
+    """
+    Create the daily rollup table if it doesn't exist, folding rows from the
+    old one-row-per-event user_usage table into it. The old table is left in
+    place (an older process may still write to it); INSERT OR IGNORE makes
+    the fold idempotent, so rows already rolled up are never double counted.
+    """
+    Base.metadata.create_all(bind=engine, tables=[UsageDaily.__table__])
+    with engine.begin() as conn:
+        legacy = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='user_usage'")).fetchone()
+        if legacy:
+            conn.execute(text("""
+                INSERT OR IGNORE INTO user_usage_daily (user_id, day, event_type, count, last_at)
+                SELECT user_id, date(timestamp), event_type, COUNT(*), MAX(timestamp)
+                FROM user_usage GROUP BY user_id, date(timestamp), event_type
+            """))
@@ -1,6 +1,21 @@
-import pdfplumber
+import glob
+import hashlib
+import json
+import os
 import re
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Iterable, Iterator, Tuple
+from .skills import get_taxonomy
+from .pdf_text import extract_text, extract_many
+
+# Parsed resumes by SHA-256 of the PDF bytes: in memory (LRU) and on disk
+RESUME_CACHE_DIR = os.path.join(os.getenv("DATA_DIR", "./data"), "resume_cache")
+RESUME_UPLOAD_DIR = "temp"
+MEMORY_CACHE_SIZE = 32
+
+_MEMORY = OrderedDict()
+_MEMORY_LOCK = threading.Lock()
 
 class ResumeParser:
     def __init__(self):
@@ -8,23 +23,22 @@ class ResumeParser:
 
     def parse_file(self, file_obj) -> Dict:
         """
-        Parses a file-like object (PDF) and extracts text and basic skills.
+        Parses a PDF (file-like object, path or bytes) and extracts text and basic skills.
         """
-        text = ""
         try:
-            with pdfplumber.open(file_obj) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
+            if hasattr(file_obj, "read"):
+                file_obj = file_obj.read()
+            text, pages = extract_text(file_obj)
         except Exception as e:
             return {"error": f"Failed to read PDF: {e}", "text": ""}
+        return self.parse_text(text, pages)
 
-        # Basic cleanup
-        text = text.replace("\x00", "") 
-        
+    def parse_text(self, text: str, pages: int = 0) -> Dict:
         return {
             "text": text,
             "skills": self._extract_skills(text), # Heuristic
-            "email": self._extract_email(text)
+            "email": self._extract_email(text),
+            "pages": pages
         }
 
     def _extract_email(self, text: str) -> str:
@@ -32,22 +46,107 @@ class ResumeParser:
         return email.group(0) if email else ""
 
     def _extract_skills(self, text: str) -> List[str]:
-        # A simple list of common tech skills to look for. 
-        # In a real app, this would be a large database or NLP model.
-        common_skills = {
-            "DATA": ["python", "sql", "spark", "pyspark", "pandas", "numpy", "aws", "snowflake", "kafka", "airflow", "etl", "big data"],
-            "WEB": ["javascript", "react", "node", "html", "css", "django", "flask", "fastapi"],
-            "TOOLS": ["git", "docker", "kubernetes", "jenkins", "jira", "linux"],
-            "LANGUAGES": ["java", "c++", "scala", "go", "rust"]
-        }
-        
-        found = set()
-        text_lower = text.lower()
-        
-        for category, skills in common_skills.items():
-            for skill in skills:
-                # Regex for whole word match to avoid substring false positives (e.g. 'go' in 'google')
-                if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                    found.add(skill) # Add the base skill name
-                    
-        return list(found)
+        # One pass over the text against the shared skill taxonomy (aliases included)
+        return get_taxonomy().extract(text)
+
+
+def resume_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def _file_digest(path: str) -> str:
+    """resume_digest() of a file, read in chunks rather than all at once."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def _cache_path(digest: str) -> str:
+    return os.path.join(RESUME_CACHE_DIR, f"{digest}.json")
+
+def _cached(digest: str):
+    """Parsed resume from memory or disk, None on a miss."""
+    with _MEMORY_LOCK:
+        if digest in _MEMORY:
+            _MEMORY.move_to_end(digest)
+            return _MEMORY[digest]
+    try:
+        with open(_cache_path(digest), encoding="utf-8") as f:
+            parsed = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Skills are re-derived from the cached text so taxonomy updates apply
+    parsed["skills"] = ResumeParser()._extract_skills(parsed.get("text", ""))
+    _remember(digest, parsed)
+    return parsed
+
+def _remember(digest: str, parsed: Dict, persist: bool = False):
+    if persist:
+        os.makedirs(RESUME_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{_cache_path(digest)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(parsed, f)
+        os.replace(tmp_path, _cache_path(digest))
+    with _MEMORY_LOCK:
+        _MEMORY[digest] = parsed
+        while len(_MEMORY) > MEMORY_CACHE_SIZE:
+            _MEMORY.popitem(last=False)
+
+def parse_resume_bytes(data: bytes) -> Tuple[str, Dict]:
+    """
+    (digest, parse_file() result) for a PDF's bytes. Cached by content hash
+    in memory and under RESUME_CACHE_DIR, so re-uploads and reruns don't
+    re-extract the PDF. Failed parses aren't cached.
+    """
+    digest = resume_digest(data)
+    parsed = _cached(digest)
+    if parsed is None:
+        parsed = ResumeParser().parse_file(data)
+        if not parsed.get("error"):
+            _remember(digest, parsed, persist=True)
+    return digest, parsed
+
+def parse_resumes(paths: Iterable[str]) -> Iterator[Tuple[str, str, Dict]]:
+    """
+    Bulk parse_resume_bytes(): yields (path, digest, parsed) for each PDF,
+    cache hits first, then the rest as the extraction pool finishes them,
+    one document per worker. Files are only hashed here; workers read the
+    misses themselves. Unreadable files yield an error result.
+    """
+    parser = ResumeParser()
+    misses = []  # (path, digest)
+    for path in paths:
+        try:
+            digest = _file_digest(path)
+        except OSError as e:
+            yield path, "", {"error": f"Failed to read PDF: {e}", "text": ""}
+            continue
+        parsed = _cached(digest)
+        if parsed is None:
+            misses.append((path, digest))
+        else:
+            yield path, digest, parsed
+
+    for i, text, pages, error in extract_many(path for path, _ in misses):
+        path, digest = misses[i]
+        if error:
+            yield path, digest, {"error": f"Failed to read PDF: {error}", "text": ""}
+            continue
+        parsed = parser.parse_text(text, pages)
+        _remember(digest, parsed, persist=True)
+        yield path, digest, parsed
+
+def parse_folder(folder: str, pattern: str = "*.pdf") -> Iterator[Tuple[str, str, Dict]]:
+    """parse_resumes() over every PDF in a folder (resumes or JD attachments)."""
+    return parse_resumes(sorted(glob.glob(os.path.join(folder, pattern))))
+
+def store_resume(data: bytes, filename: str, digest: str = None) -> str:
+    """
+    Writes the uploaded PDF for the application bot, once per content hash
+    (temp/<digest>/<filename>), and returns its absolute path.
+    """
+    digest = digest or resume_digest(data)
+    folder = os.path.join(RESUME_UPLOAD_DIR, digest[:16])
+    path = os.path.abspath(os.path.join(folder, os.path.basename(filename) or "resume.pdf"))
+    if not os.path.exists(path):
+        os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return path
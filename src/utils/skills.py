@@ -0,0 +1,153 @@
+"""
+Skill taxonomy: canonical skills with aliases ("k8s" -> kubernetes), loaded
+from skill_taxonomy.json (or SKILL_TAXONOMY=<path>) and compiled once into
+a token trie. extract() tokenizes the text once and walks the trie from
+each token, taking the longest match, so the cost is one linear pass over
+the text however many skills the taxonomy holds.
+Surface forms that are also ordinary words ("go", "excel", "spring") are
+listed under "ambiguous" and only count with the right case and either a
+context word nearby or a list position ("Python, Go, SQL").
+"""
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_TAXONOMY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+
+# Words plus the punctuation skills use: c++, c#, node.js, .net (a leading dot only after a space)
+TOKEN = re.compile(r"(?:(?<![^\s(/,])\.)?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+TOKEN_ANY_CASE = re.compile(TOKEN.pattern, re.I)  # same tokens, with spans in the original text
+_END = ""  # trie key holding the canonical skill a token path ends on
+
+CONTEXT_WINDOW = 3  # tokens either side searched for an ambiguous skill's context words
+LIST_BEFORE = set(",;/|(:•·*")
+LIST_AFTER = set(",;/|)")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall((text or "").lower())
+
+
+class SkillTaxonomy:
+    """
+    Compiled skill matcher. skills maps canonical name -> (category, aliases);
+    ambiguous maps a surface form -> {"case": [accepted spellings], "context": [words]}.
+    """
+
+    def __init__(self, skills: Dict[str, tuple], ambiguous: Dict[str, dict] = None):
+        self.categories = {}
+        self._aliases = {}  # normalized surface form -> canonical
+        self._trie = {}
+        self._depth = 0
+        for skill, (category, aliases) in skills.items():
+            skill = skill.lower()
+            self.categories[skill] = category
+            for surface in [skill, *aliases]:
+                self._add(surface.lower(), skill)
+        # normalized surface -> (accepted spellings or None, context words)
+        self._ambiguous = {
+            " ".join(tokenize(surface)): (set(rule.get("case") or ()) or None, set(rule.get("context") or ()))
+            for surface, rule in (ambiguous or {}).items()
+        }
+        self._guarded = {self._aliases[surface] for surface in self._ambiguous if surface in self._aliases}
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls({
+            skill: (category, aliases)
+            for category, skills in data["categories"].items()
+            for skill, aliases in skills.items()
+        }, data.get("ambiguous"))
+
+    def _add(self, surface: str, skill: str):
+        tokens = tokenize(surface)
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = skill
+        self._aliases[" ".join(tokens)] = skill
+        self._depth = max(self._depth, len(tokens))
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Canonical skill for a skill name or alias ("K8s" -> "kubernetes"), None if unknown."""
+        return self._aliases.get(" ".join(tokenize(term)))
+
+    def count(self, text: str) -> Counter:
+        """Canonical skill -> occurrences in text, longest alias winning ("spring boot" over "spring")."""
+        found = Counter()
+        text = text or ""
+        tokens = tokenize(text)
+        spans = None  # token spans in text, only needed to check ambiguous matches
+        i, n = 0, len(tokens)
+        trie = self._trie
+        while i < n:
+            node = trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            match, length = node.get(_END), 1
+            j = i + 1
+            while j < n and j - i < self._depth:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match, length = node[_END], j - i
+            if match and match in self._guarded:
+                rule = self._ambiguous.get(" ".join(tokens[i:i + length]))
+                if rule:
+                    if spans is None:
+                        spans = [m.span() for m in TOKEN_ANY_CASE.finditer(text)]
+                    if len(spans) != n or not self._plausible(text, tokens, spans, i, length, rule):
+                        match = None
+            if match:
+                found[match] += 1
+                i += length
+            else:
+                i += 1
+        return found
+
+    @staticmethod
+    def _plausible(text: str, tokens: List[str], spans: List[tuple], i: int, length: int, rule: tuple) -> bool:
+        """An ambiguous surface form counts if spelled as listed and next to context words or in a list."""
+        spellings, context = rule
+        start, end = spans[i][0], spans[i + length - 1][1]
+        if spellings and text[start:end] not in spellings:
+            return False
+        nearby = tokens[max(i - CONTEXT_WINDOW, 0):i] + tokens[i + length:i + length + CONTEXT_WINDOW]
+        if not context.isdisjoint(nearby):
+            return True
+        before = text[max(start - 20, 0):start].rstrip(" \t")[-1:]
+        after = text[end:end + 20].lstrip(" \t")[:1]
+        if before in LIST_BEFORE or after in LIST_AFTER:
+            return True
+        return before in ("", "\n", "\r") and after in ("", "\n", "\r")  # alone on its line
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct canonical skills mentioned in text, in order of first mention."""
+        return list(self.count(text))
+
+    def normalize(self, skills: Iterable[str]) -> set:
+        """Canonical forms of user-entered skills; unknown ones are kept lower-cased."""
+        return {self.canonical(s) or s.lower().strip() for s in skills if s and s.strip()}
+
+
+_TAXONOMY = None
+_TAXONOMY_LOCK = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Process-wide taxonomy, compiled on first use."""
+    global _TAXONOMY
+    with _TAXONOMY_LOCK:
+        if _TAXONOMY is None:
+            _TAXONOMY = SkillTaxonomy.from_file(os.getenv("SKILL_TAXONOMY") or DEFAULT_TAXONOMY)
+        return _TAXONOMY
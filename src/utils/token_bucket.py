@@ -0,0 +1,24 @@
+import time
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` tokens, refilled at `rate` tokens/second."""
+
+    def __init__(self, capacity: float, rate: float, tokens: float = None, now: float = None):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity if tokens is None else tokens
+        self.updated = time.time() if now is None else now
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
@@ -0,0 +1,88 @@
+from src.database.models import Job
+from src.utils import dedup
+from src.utils.dedup import Deduplicator, canonicalize_url, dedup_jobs, MAX_DISTANCE
+
+
+def job(title, company="Acme", location="Bangalore", url=None, source="linkedin"):
+    return Job(title=title, company=company, location=location, source=source,
+               url=url or f"https://example.com/{title.replace(' ', '-').lower()}-{source}")
+
+
+def test_canonicalize_url_strips_tracking_params():
+    assert canonicalize_url(
+        "https://www.linkedin.com/jobs/view/123/?trk=public_jobs&refId=abc&utm_source=x&utm_campaign=y#apply"
+    ) == "https://linkedin.com/jobs/view/123"
+    # Meaningful params are kept, in a stable order
+    assert canonicalize_url("https://boards.greenhouse.io/acme/jobs/1?gh_jid=9&gh_src=li&a=2") == \
+        "https://boards.greenhouse.io/acme/jobs/1?a=2&gh_jid=9"
+
+
+def test_canonicalize_url_scheme_and_host():
+    assert canonicalize_url("http://WWW.Naukri.com:443/job-listings-x/") == "https://naukri.com/job-listings-x"
+    assert canonicalize_url("https://m.naukri.com/job-listings-x") == canonicalize_url("http://naukri.com/job-listings-x")
+    assert canonicalize_url("") == ""
+
+
+def test_same_url_with_tracking_params_merges():
+    d = Deduplicator()
+    first = job("Data Engineer", url="https://www.linkedin.com/jobs/view/1?trk=a")
+    assert d.add(first) is first
+    assert d.add(job("Data Engineer", url="http://linkedin.com/jobs/view/1/?trk=b", source="naukri")) is None
+    assert first.source == "linkedin+naukri" and d.merged == 1
+    # The board's URL is kept for the card and the application bot
+    assert first.url == "https://www.linkedin.com/jobs/view/1?trk=a"
+
+
+def test_near_duplicate_across_boards_merges():
+    jobs = [
+        job("Sr. Data Engineer", company="Acme Pvt Ltd", location="Bengaluru, Karnataka", source="naukri"),
+        job("Senior Data Engineer", company="Acme", location="Bangalore", source="linkedin"),
+    ]
+    kept = dedup_jobs(jobs)
+    assert len(kept) == 1 and kept[0].source == "naukri+linkedin"
+
+
+def test_distinct_roles_at_same_company_stay_separate():
+    jobs = [
+        job("Senior Data Engineer"),
+        job("Frontend Developer"),
+        job("Product Manager"),
+        job("Data Analyst"),
+    ]
+    assert len(dedup_jobs(jobs)) == len(jobs)
+
+
+def test_max_distance_boundary(monkeypatch):
+    # One differing bit in each of three bands: the fourth band still matches
+    hashes = {
+        "base": 0,
+        "at_limit": (1 << 0) | (1 << 20) | (1 << 40),
+        "past_limit": (1 << 0) | (1 << 20) | (1 << 40) | (1 << 60),
+    }
+    assert bin(hashes["at_limit"]).count("1") == MAX_DISTANCE
+    monkeypatch.setattr(dedup, "job_fingerprint_text", lambda j: j.title)
+    monkeypatch.setattr(dedup, "simhash", lambda text: hashes[text])
+
+    d = Deduplicator()
+    assert d.add(job("base")) is not None
+    assert d.add(job("at_limit")) is None
+
+    d = Deduplicator()
+    assert d.add(job("base")) is not None
+    assert d.add(job("past_limit")) is not None
+
+
+def test_catalog_serves_the_scraped_url(monkeypatch, tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.database import catalog
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    catalog.CatalogBase.metadata.create_all(bind=engine)
+    monkeypatch.setattr(catalog, "_SESSION", sessionmaker(bind=engine))
+
+    posting = job("Data Engineer", url="https://in.linkedin.com/jobs/view/7?trk=a&refId=b")
+    catalog.upsert_jobs([posting])
+    catalog.record_query("LinkedInScraper", "data", "", 10, [posting])
+    served = catalog.get_last_results("LinkedInScraper", "data", "")
+    assert [j.url for j in served] == [posting.url]
@@ -0,0 +1,70 @@
+import csv
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from src.database import export
+from src.database.models import Job
+
+
+def make_jobs():
+    return [
+        Job(title="Python Developer", company="Acme", location="Remote", date_posted=datetime(2024, 5, 1),
+            source="linkedin", url="https://example.com/1", match_score=80.0),
+        Job(title="Data Engineer", company="Initech", location="Pune", date_posted=datetime(2024, 5, 2),
+            source="naukri", url="https://example.com/2", match_score=55.5),
+    ]
+
+
+def test_csv_export(tmp_path):
+    path, rows = export.export_jobs(None, "csv", jobs=make_jobs(), path=str(tmp_path / "jobs.csv"))
+    with open(path, newline="", encoding="utf-8") as f:
+        records = list(csv.DictReader(f))
+    assert rows == 2
+    assert [r["Title"] for r in records] == ["Python Developer", "Data Engineer"]
+    assert records[0]["Applied"] == "No"
+
+
+def test_jsonl_export(tmp_path):
+    path, rows = export.export_jobs(None, "jsonl", jobs=make_jobs(), path=str(tmp_path / "jobs.jsonl"))
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert rows == 2
+    assert records[1]["Company"] == "Initech"
+    assert records[1]["Match Score"] == 55.5
+    assert records[0]["Date Posted"] == "2024-05-01 00:00:00"
+
+
+@pytest.mark.skipif(not export.HAS_PYARROW, reason="pyarrow not installed")
+def test_parquet_export(tmp_path):
+    import pyarrow.parquet as pq
+    path, rows = export.export_jobs(None, "parquet", jobs=make_jobs(), path=str(tmp_path / "jobs.parquet"))
+    table = pq.read_table(path)
+    assert rows == 2
+    assert table.column_names == export.COLUMNS
+    assert table.column("URL").to_pylist() == ["https://example.com/1", "https://example.com/2"]
+
+
+def test_failed_export_leaves_no_partial_file(tmp_path, monkeypatch):
+    def broken(chunks, path):
+        with open(path, "w") as f:
+            f.write("Title\n")
+        raise RuntimeError("disk full")
+
+    monkeypatch.setitem(export.WRITERS, "csv", broken)
+    target = tmp_path / "jobs.csv"
+    with pytest.raises(RuntimeError):
+        export.export_jobs(None, "csv", jobs=make_jobs(), path=str(target))
+    assert os.listdir(tmp_path) == []
+
+
+def test_guest_exports_share_a_pruned_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "GUEST_EXPORT_DIR", str(tmp_path))
+    stale = tmp_path / "job_history_old.csv"
+    stale.write_text("Title\n")
+    os.utime(stale, (0, 0))
+    path, _ = export.export_jobs(None, "csv", jobs=make_jobs())
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+from src.scraper.governor import HostBackingOff, HostPolicy, OutboundGovernor
+
+URL = "https://jobs.example.com/search"
+
+
+def test_backoff_fails_fast_with_max_wait():
+    governor = OutboundGovernor(policies={}, default=HostPolicy(rate=100.0, burst=10, max_concurrency=2))
+    governor.report(URL, 429)
+    start = time.monotonic()
+    with pytest.raises(HostBackingOff) as err:
+        with governor.slot(URL, max_wait=5):
+            pass
+    assert time.monotonic() - start < 1
+    assert "jobs.example.com is backing off, retry in 30s" == str(err.value)
+
+
+def test_busy_host_waits_up_to_max_wait():
+    governor = OutboundGovernor(policies={}, default=HostPolicy(rate=100.0, burst=10, max_concurrency=1))
+    with governor.slot(URL):
+        start = time.monotonic()
+        with pytest.raises(HostBackingOff, match="is busy"):
+            with governor.slot(URL, max_wait=0.2):
+                pass
+        assert 0.15 < time.monotonic() - start < 1
+    with governor.slot(URL, max_wait=0.2):
+        pass  # free again
@@ -0,0 +1,42 @@
+from src.scraper.hn_scraper import HNScraper
+
+
+def make_scraper(monkeypatch, ids, missing=()):
+    scraper = HNScraper()
+    monkeypatch.setattr(scraper, "_job_ids", lambda: list(ids))
+
+    def fetch_item(item_id):
+        if item_id in missing:
+            return None
+        return {"id": item_id, "title": f"Acme | Engineer {item_id} | Remote", "time": item_id}
+
+    monkeypatch.setattr(scraper, "_fetch_item", fetch_item)
+    return scraper
+
+
+def titles(jobs):
+    return [job.title for job in jobs]
+
+
+def test_cold_search_returns_newest_postings(monkeypatch):
+    scraper = make_scraper(monkeypatch, [101, 105, 103, 104, 102])
+    jobs, cursor = scraper.scrape_new("", "", 2, {})
+    assert titles(jobs) == ["Engineer 105", "Engineer 104"]
+    assert cursor["max_item_id"] == 105
+
+
+def test_incremental_scrape_reads_oldest_first_and_resumes(monkeypatch):
+    scraper = make_scraper(monkeypatch, [108, 107, 106, 105])
+    jobs, cursor = scraper.scrape_new("", "", 2, {"max_item_id": 105})
+    assert titles(jobs) == ["Engineer 106", "Engineer 107"]
+    assert cursor["max_item_id"] == 107
+    jobs, cursor = scraper.scrape_new("", "", 2, cursor)
+    assert titles(jobs) == ["Engineer 108"]
+    assert cursor["max_item_id"] == 108
+
+
+def test_failed_item_holds_the_cursor(monkeypatch):
+    scraper = make_scraper(monkeypatch, [104, 103, 102], missing={103})
+    jobs, cursor = scraper.scrape_new("", "", 10, {"max_item_id": 101})
+    assert titles(jobs) == ["Engineer 102", "Engineer 104"]
+    assert cursor["max_item_id"] == 102
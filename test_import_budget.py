@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+# Modules only needed once a search, apply, resume upload or analytics view runs
+HEAVY_MODULES = ["selenium", "webdriver_manager", "torch", "sentence_transformers", "pdfplumber", "pandas"]
+# Cumulative import time allowed for the dashboard module (login page render)
+DASHBOARD_BUDGET_MS = int(os.getenv("DASHBOARD_IMPORT_BUDGET_MS", "2500"))
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_profile(module):
+    """Imports module in a fresh interpreter with -X importtime; returns ({module: cumulative us}, loaded heavy modules)."""
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative)
+    heavy = [m for m in proc.stdout.strip().splitlines()[-1].split(",") if m] if proc.stdout.strip() else []
+    return times, heavy
+
+
+def test_import_budget():
+    for module in ["src.scraper", "src.search", "src.tasks.handlers", "src.matcher.registry", "src.ui.dashboard"]:
+        times, heavy = import_profile(module)
+        print(f"{module}: {times.get(module, 0) / 1000:.0f} ms, heavy modules: {heavy or 'none'}")
+        assert not heavy, f"{module} imports {heavy} at load time"
+        if module == "src.ui.dashboard":
+            assert times[module] / 1000 < DASHBOARD_BUDGET_MS, \
+                f"dashboard import took {times[module] / 1000:.0f} ms (budget {DASHBOARD_BUDGET_MS} ms)"
+
+
+if __name__ == "__main__":
+    test_import_budget()
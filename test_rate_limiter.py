@@ -0,0 +1,101 @@
+from datetime import datetime, date
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.utils import rate_limiter
+from src.utils.rate_limiter import RateLimitEngine, UsageDaily
+from src.utils.token_bucket import TokenBucket
+
+DAY = datetime(2026, 3, 2, 12, 0).timestamp()  # local noon, some fixed UTC day
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def use_temp_db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    monkeypatch.setattr(rate_limiter, "engine", engine)
+    monkeypatch.setattr(rate_limiter, "SessionLocal", sessionmaker(bind=engine))
+    rate_limiter.init_rate_limiter_table()
+    return engine
+
+
+def test_token_bucket_refill():
+    bucket = TokenBucket(capacity=2, rate=0.5, now=0)
+    bucket.take(0)
+    bucket.take(0)
+    assert bucket.wait_time(0) == 2.0  # one token takes 1 / 0.5 s
+    assert bucket.wait_time(1) == 1.0
+    assert bucket.wait_time(2) == 0.0
+    assert bucket.wait_time(100) == 0.0 and bucket.tokens == 2  # never above capacity
+
+
+def test_try_search_checks_and_records_atomically(monkeypatch, tmp_path):
+    use_temp_db(monkeypatch, tmp_path)
+    clock = Clock(DAY)
+    limiter = RateLimitEngine(daily_limit=2, cooldown_seconds=10, clock=clock)
+
+    assert limiter.check(1, record=True) == (True, "")
+    allowed, msg = limiter.check(1, record=True)  # a second click inside the cooldown
+    assert not allowed and "Please wait" in msg
+    assert limiter.usage_today(1) == 1
+
+    clock.now += 10
+    assert limiter.check(1, record=False)[0]
+    assert limiter.usage_today(1) == 1  # a plain check doesn't consume
+    assert limiter.check(1, record=True)[0]
+    clock.now += 10
+    allowed, msg = limiter.check(1, record=True)
+    assert not allowed and "Daily search limit" in msg
+
+    clock.now += 86400  # next UTC day: the counter resets
+    assert limiter.check(1, record=True)[0]
+    assert limiter.usage_today(1) == 1
+    limiter.flush()  # while the temp DB is patched in (the engine also flushes at exit)
+
+
+def test_flush_upserts_daily_rollup(monkeypatch, tmp_path):
+    engine = use_temp_db(monkeypatch, tmp_path)
+    clock = Clock(DAY)
+    limiter = RateLimitEngine(daily_limit=10, cooldown_seconds=1, clock=clock)
+    today = datetime.utcfromtimestamp(DAY).date()
+
+    limiter.record(1)
+    limiter.record(2)
+    limiter.flush()
+    clock.now += 5
+    limiter.record(1)
+    limiter.flush()
+    limiter.flush()  # nothing dirty: no-op
+
+    session = sessionmaker(bind=engine)()
+    rows = {r.user_id: r for r in session.query(UsageDaily).filter_by(day=today, event_type="search")}
+    session.close()
+    assert {uid: r.count for uid, r in rows.items()} == {1: 2, 2: 1}  # one row per user and day
+    assert rows[1].last_at == datetime.utcfromtimestamp(DAY + 5)
+
+    # A fresh process reloads today's count and the cooldown from the rollup
+    reloaded = RateLimitEngine(daily_limit=10, cooldown_seconds=60, clock=Clock(DAY + 10))
+    assert reloaded.usage_today(1) == 2
+    allowed, msg = reloaded.check(1, record=False)
+    assert not allowed and "Please wait" in msg
+
+
+def test_legacy_usage_is_folded_and_kept(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE user_usage (id INTEGER PRIMARY KEY, user_id INTEGER, event_type VARCHAR, timestamp DATETIME)"))
+        conn.execute(text("INSERT INTO user_usage (user_id, event_type, timestamp) VALUES "
+                          "(1, 'search', '2026-03-02 09:00:00'), (1, 'search', '2026-03-02 10:00:00')"))
+    monkeypatch.setattr(rate_limiter, "engine", engine)
+    monkeypatch.setattr(rate_limiter, "SessionLocal", sessionmaker(bind=engine))
+    rate_limiter.init_rate_limiter_table()
+    rate_limiter.init_rate_limiter_table()  # idempotent
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count FROM user_usage_daily WHERE user_id = 1")).scalar() == 2
+        assert conn.execute(text("SELECT COUNT(*) FROM user_usage")).scalar() == 2
@@ -0,0 +1,23 @@
+from types import SimpleNamespace
+
+from src.tasks import scheduler
+from src.tasks.scheduler import SearchScheduler
+
+
+def saved_search(search_id, user_id, query, limit):
+    return SimpleNamespace(id=search_id, user_id=user_id, query=query, location="Pune", sources=["hn"],
+                           limit=limit, use_smart_search=False, use_semantic=False)
+
+
+def test_each_key_is_scraped_with_its_own_largest_limit(monkeypatch):
+    due = [saved_search(1, 1, "python", 50), saved_search(2, 2, "python", 10), saved_search(3, 2, "golang", 5)]
+    monkeypatch.setattr(scheduler, "get_due_saved_searches", lambda now: due)
+    monkeypatch.setattr(scheduler, "get_profile", lambda user_id: None)
+    monkeypatch.setattr(scheduler, "mark_saved_searches_run", lambda searches, now: None)
+    monkeypatch.setattr(SearchScheduler, "_deliver", lambda self, search, keys, results, profile: 0)
+    scraped = {}
+    monkeypatch.setattr(SearchScheduler, "_scrape_all", lambda self, limits: scraped.update(limits) or {})
+
+    stats = SearchScheduler().run_due()
+    assert stats["scrapes"] == 2
+    assert scraped == {("hn", "python", "Pune"): 50, ("hn", "golang", "Pune"): 5}
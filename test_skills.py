@@ -0,0 +1,31 @@
+from src.utils.skills import get_taxonomy
+
+
+def test_aliases_map_to_canonical_skills():
+    taxonomy = get_taxonomy()
+    assert taxonomy.canonical("K8s") == "kubernetes"
+    assert taxonomy.canonical("not a skill") is None
+    assert taxonomy.normalize(["K8s", " Basket Weaving "]) == {"kubernetes", "basket weaving"}
+    assert taxonomy.extract("Deploys to k8s with Kubernetes operators") == ["kubernetes"]
+
+
+def test_longest_alias_wins():
+    assert get_taxonomy().extract("Spring Boot and React") == ["spring boot", "react"]
+
+
+def test_symbol_skills_tokenize_whole():
+    assert get_taxonomy().extract("C++ and .NET developer") == ["c++", ".net"]
+
+
+def test_ambiguous_words_in_prose_are_ignored():
+    taxonomy = get_taxonomy()
+    assert taxonomy.extract("we go the extra mile") == []
+    assert taxonomy.extract("Excel at problem solving") == []
+
+
+def test_ambiguous_skills_in_context_or_lists_count():
+    taxonomy = get_taxonomy()
+    assert taxonomy.extract("Go developer with k8s") == ["go", "kubernetes"]
+    assert taxonomy.extract("3+ years of Rust experience") == ["rust"]
+    assert taxonomy.extract("Skills: Python, Go, SQL") == ["python", "go", "sql"]
+    assert taxonomy.extract("Go\nPython") == ["go", "python"]
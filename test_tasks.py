@@ -0,0 +1,54 @@
+from src.database.models import Job
+from src.search import SearchEvent
+from src.tasks import handlers
+from src.tasks.runner import TaskContext
+
+
+class FakePipeline:
+    def __init__(self, sources, matcher, profile, limit, enough=None):
+        self.metrics = {}
+
+    def stream(self, queries, location):
+        jobs = [
+            Job(title=f"Engineer {i}", company="Acme", url=f"https://example.com/{i}",
+                description="x" * 1000, match_score=float(i), source="linkedin")
+            for i in range(handlers.PREVIEW_SIZE + 10)
+        ]
+        yield SearchEvent("jobs", "linkedin", "engineer", jobs=jobs, elapsed=1.0)
+        yield SearchEvent("progress", "linkedin", "engineer")
+        yield SearchEvent("done")
+
+
+class Ctx(TaskContext):
+    def __init__(self):
+        super().__init__(task_id=1, user_id=1)
+        self.snapshots = []
+
+    def progress(self, fraction=None, message=None, result=None):
+        self.snapshots.append(result)
+
+
+def run(monkeypatch, save):
+    monkeypatch.setattr(handlers, "SearchPipeline", FakePipeline)
+    monkeypatch.setattr(handlers, "get_matcher", lambda semantic: None)
+    monkeypatch.setattr(handlers, "get_profile", lambda user_id: None)
+    monkeypatch.setattr(handlers, "save_jobs", lambda jobs, user_id: len(jobs))
+    ctx = Ctx()
+    payload = {"queries": ["engineer"], "sources": ["linkedin"], "save": save, "stored_profile": save}
+    return ctx, handlers.run_search_task(ctx, payload)
+
+
+def test_persisted_search_result_is_a_capped_preview(monkeypatch):
+    ctx, result = run(monkeypatch, save=True)
+    for persisted in ctx.snapshots + [result]:
+        assert len(persisted["jobs"]) == handlers.PREVIEW_SIZE
+        assert all(j["description"] is None for j in persisted["jobs"])
+    assert result["jobs"][0]["title"] == f"Engineer {handlers.PREVIEW_SIZE + 9}"
+    assert len(ctx.kept["jobs"]) == handlers.PREVIEW_SIZE + 10
+    assert ctx.kept["jobs"][0]["description"] == "x" * 1000
+
+
+def test_guest_results_are_not_persisted(monkeypatch):
+    ctx, result = run(monkeypatch, save=False)
+    assert result["jobs"] == []
+    assert len(ctx.kept["jobs"]) == handlers.PREVIEW_SIZE + 10